@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+Latency, throughput and peak memory of every handler at a chosen scale.
+
+Seeds a local storage backend (core/storage.py, "memory" by default) with
+synthetic pan listings, the film catalogue, curators with embedded lists and
+the curators registry, then invokes each handler in HANDLER_REGISTRY through
+entrypoint.handler, so response encoding is included. Each handler is warmed
+up first, so the numbers are for warm invocations (JSON cache populated).
+The per-invocation metrics line (core.metrics) is switched off so it does
+not flood the output; pass --metrics to keep it and include its overhead.
+
+Per handler it reports latency (mean / p50 / p95 / max ms), sequential
+throughput, storage calls per invocation, response size and the peak
+memory traced during one extra invocation, plus the time to build the
+search_films index over the seeded catalogue (search_films itself is timed
+warm, index built). Results are written as JSON;
+with --baseline they are compared against an earlier run of the same scale
+and the script exits 1 if a handler got slower or hungrier beyond the
+tolerance. Run from the project root:
+
+    python benchmarks/handler_suite.py --scale small --json bench_small.json
+    python benchmarks/handler_suite.py --scale small --baseline bench_small.json
+    python benchmarks/handler_suite.py --films 20000 --cinemas 60 --lists 300 --handlers get_custom_lists
+"""
+
+import argparse
+import gc
+import json
+import os
+import pathlib
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+PROJECT_DIR = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+
+from benchmarks.synthetic import synthetic_curator_film_lists, synthetic_pan_listings  # noqa: E402
+from config import S3_BUCKET, PAN_CINEMA_LISTINGS_KEY  # noqa: E402
+from core import codec  # noqa: E402
+from core import metrics  # noqa: E402
+from core import s3 as core_s3  # noqa: E402
+from core.curator_shards import write_sharded_film_lists  # noqa: E402
+from core.curator_store import FILM_LISTS_LAYOUT, curator_lists_key  # noqa: E402
+from core.film_catalogue import load_film_catalogue  # noqa: E402
+from core.film_search import FilmSearchIndex  # noqa: E402
+from core.list_films import prepare_film_lists_for_storage  # noqa: E402
+from handlers.custom_lists.entrypoint import HANDLER_REGISTRY, handler  # noqa: E402
+
+
+class Scale(NamedTuple):
+    films: int
+    cinemas: int
+    curators: int
+    lists_per_curator: int
+    films_per_list: int
+
+
+SCALES = {
+    "tiny": Scale(films=200, cinemas=12, curators=3, lists_per_curator=5, films_per_list=5),
+    "small": Scale(films=1000, cinemas=12, curators=5, lists_per_curator=20, films_per_list=10),
+    "medium": Scale(films=10000, cinemas=40, curators=10, lists_per_curator=100, films_per_list=10),
+    "large": Scale(films=50000, cinemas=100, curators=10, lists_per_curator=300, films_per_list=10),
+}
+
+# A handler regresses when p50 latency or peak memory grows by more than the
+# tolerance AND by more than these floors, which keep timer noise on
+# sub-millisecond handlers from being flagged.
+DEFAULT_TOLERANCE = 0.25
+LATENCY_FLOOR_MS = 1.0
+MEMORY_FLOOR_MIB = 0.5
+
+
+class Context(NamedTuple):
+    curators: List[str]
+    db_ids: List[int]
+    film_lists: Dict[str, Any]   # curator -> lists as seeded
+
+
+class Scenario(NamedTuple):
+    payload: Callable[[int, Context], Dict[str, Any]]
+    # Untimed preparation run before each invocation, e.g. creating what it deletes
+    setup: Optional[Callable[[int, Context], None]] = None
+
+
+def _invoke(name: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    return handler({"handler": name, **payload})
+
+
+def _new_list(curator: str, list_name: str) -> Dict[str, Any]:
+    return {
+        "curator": curator, "list_name": list_name, "list_caption": "Benchmark list",
+        "start_date": "2026-01-01", "end_date": "2026-12-31",
+    }
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "get_curators": Scenario(lambda i, ctx: {}),
+    "create_curator": Scenario(lambda i, ctx: {"curator": f"bench_{i}"}),
+    "get_custom_lists": Scenario(lambda i, ctx: {"curator": ctx.curators[0]}),
+    "get_custom_lists_bulk": Scenario(lambda i, ctx: {"curators": "all"}),
+    "create_custom_list": Scenario(lambda i, ctx: _new_list(ctx.curators[0], f"Created {i}")),
+    "assign_films_to_list": Scenario(lambda i, ctx: {
+        "curator": ctx.curators[0], "list_name": "List 1", "db_ids": [ctx.db_ids[i % len(ctx.db_ids)]],
+    }),
+    "remove_film_from_list": Scenario(
+        lambda i, ctx: {"curator": ctx.curators[0], "list_name": "List 2", "db_id": ctx.db_ids[-1 - i]},
+        setup=lambda i, ctx: _invoke("assign_films_to_list", {
+            "curator": ctx.curators[0], "list_name": "List 2", "db_ids": [ctx.db_ids[-1 - i]],
+        }),
+    ),
+    "update_list_film_caption": Scenario(lambda i, ctx: {
+        "curator": ctx.curators[0], "list_name": "List 0",
+        "db_id": ctx.film_lists[ctx.curators[0]][0]["list_films"][0]["db_id"],
+        "new_caption": f"Caption {i}",
+    }),
+    "update_list": Scenario(lambda i, ctx: {
+        "curator": ctx.curators[0], "list_name": "List 3", "updates": {"list_caption": f"Caption {i}"},
+    }),
+    "delete_list": Scenario(
+        lambda i, ctx: {"curator": ctx.curators[0], "list_name": f"Doomed {i}"},
+        setup=lambda i, ctx: _invoke("create_custom_list", _new_list(ctx.curators[0], f"Doomed {i}")),
+    ),
+    "get_available_films": Scenario(lambda i, ctx: {"title": f"film {i % 10}", "limit": 50}),
+    "build_film_catalogue": Scenario(lambda i, ctx: {"force": True}),
+    "batch": Scenario(lambda i, ctx: {
+        "curator": ctx.curators[0],
+        "operations": [
+            {"handler": "create_custom_list", **_new_list(ctx.curators[0], f"Batch {i}")},
+            {"handler": "assign_films_to_list", "list_name": f"Batch {i}", "db_ids": ctx.db_ids[:5]},
+            {"handler": "update_list_film_caption", "list_name": f"Batch {i}", "db_id": ctx.db_ids[0],
+             "new_caption": "Batch caption"},
+        ],
+    }),
+    "migrate_curator_layout": Scenario(lambda i, ctx: {"curator": ctx.curators[-1], "overwrite": True}),
+    "refresh_lists": Scenario(lambda i, ctx: {"curator": ctx.curators[0], "dry_run": True}),
+    "rebuild_curators_registry": Scenario(lambda i, ctx: {}),
+    "compact_curator": Scenario(lambda i, ctx: {"curators": "all"}),
+    "get_lists_for_film": Scenario(lambda i, ctx: {"db_id": ctx.db_ids[i % len(ctx.db_ids)]}),
+    "rebuild_film_index": Scenario(lambda i, ctx: {}),
+    "get_active_lists": Scenario(lambda i, ctx: {}),
+    "refresh_active_lists": Scenario(lambda i, ctx: {"rescan": True}),
+    # Misspelt, with a film number so results vary per invocation
+    "search_films": Scenario(lambda i, ctx: {"query": f"sinthetic flim {i % 97}", "limit": 20}),
+}
+
+
+def seed(storage, scale: Scale, seed_value: int = 0) -> Context:
+    """Write synthetic listings, curators and derived objects to ``storage``."""
+    pan = synthetic_pan_listings(scale.films, seed=seed_value, cinema_count=scale.cinemas)
+    storage.put_bytes(S3_BUCKET, PAN_CINEMA_LISTINGS_KEY, codec.dumps(pan))
+
+    curators = [f"curator_{n}" for n in range(scale.curators)]
+    film_lists: Dict[str, Any] = {}
+    for curator in curators:
+        lists = synthetic_curator_film_lists(
+            curator, pan, scale.lists_per_curator, scale.films_per_list, seed=seed_value
+        )
+        film_lists[curator] = lists
+        # filmLists.json is always written so migrate_curator_layout has a source
+        storage.put_bytes(S3_BUCKET, curator_lists_key(curator), codec.dumps(prepare_film_lists_for_storage(lists)))
+        if FILM_LISTS_LAYOUT == "sharded":
+            write_sharded_film_lists(storage, curator, lists)
+
+    _invoke("build_film_catalogue", {"force": True})
+    _invoke("rebuild_curators_registry", {})
+    return Context(curators=curators, db_ids=[int(db_id) for db_id in pan], film_lists=film_lists)
+
+
+def time_search_index_build(storage) -> float:
+    """Milliseconds to build the search_films index over the seeded catalogue."""
+    catalogue = load_film_catalogue(storage)
+    start = time.perf_counter()
+    FilmSearchIndex(catalogue)
+    return (time.perf_counter() - start) * 1000
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def bench_handler(storage, name: str, ctx: Context, iterations: int, warmup: int) -> Dict[str, Any]:
+    scenario = SCENARIOS[name]
+
+    def run(i: int) -> Dict[str, Any]:
+        if scenario.setup is not None:
+            scenario.setup(i, ctx)
+        return _invoke(name, scenario.payload(i, ctx))
+
+    for i in range(warmup):
+        run(i)
+
+    latencies: List[float] = []
+    calls = 0
+    response_bytes = 0
+    # Recorded for the timed invocations only, one at a time, so the record
+    # stays small and is gone before peak memory is measured
+    storage.record_calls = True
+    try:
+        for i in range(warmup, warmup + iterations):
+            if scenario.setup is not None:
+                scenario.setup(i, ctx)
+            payload = scenario.payload(i, ctx)
+            storage.calls.clear()
+            start = time.perf_counter()
+            response = _invoke(name, payload)
+            latencies.append((time.perf_counter() - start) * 1000)
+            calls += len(storage.calls)
+            response_bytes = len(response["body"])
+    finally:
+        storage.record_calls = False
+        storage.calls.clear()
+
+    i = warmup + iterations
+    if scenario.setup is not None:
+        scenario.setup(i, ctx)
+    payload = scenario.payload(i, ctx)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        _invoke(name, payload)
+        peak_mib = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    finally:
+        tracemalloc.stop()
+
+    ordered = sorted(latencies)
+    return {
+        "iterations": iterations,
+        "latency_ms": {
+            "mean": statistics.fmean(ordered),
+            "p50": _percentile(ordered, 0.5),
+            "p95": _percentile(ordered, 0.95),
+            "max": ordered[-1],
+        },
+        "throughput_per_s": iterations / (sum(ordered) / 1000),
+        "storage_calls_per_invocation": calls / iterations,
+        "response_bytes": response_bytes,
+        "peak_mib": peak_mib,
+    }
+
+
+def run_suite(
+    scale: Scale,
+    handlers: Optional[List[str]] = None,
+    iterations: int = 20,
+    warmup: int = 2,
+    backend: str = "memory",
+    directory: Optional[str] = None,
+    emit_metrics: bool = False,
+) -> Dict[str, Any]:
+    """Seed a fresh local backend and benchmark ``handlers`` (default: all registered)."""
+    names = handlers or list(HANDLER_REGISTRY)
+    missing = [name for name in names if name not in SCENARIOS]
+    if missing:
+        raise ValueError(f"No benchmark scenario for handler(s): {', '.join(missing)}")
+
+    os.environ["KL_STORAGE_BACKEND"] = backend
+    if directory:
+        os.environ["KL_STORAGE_DIRECTORY"] = directory
+    core_s3.reset_s3_client()
+    core_s3.clear_json_cache()
+    storage = core_s3.get_s3_client()
+    metrics.METRICS_ENABLED = emit_metrics
+
+    seed_start = time.perf_counter()
+    ctx = seed(storage, scale)
+    seed_seconds = time.perf_counter() - seed_start
+    search_index_build_ms = time_search_index_build(storage)
+
+    results: Dict[str, Any] = {}
+    for name in names:
+        try:
+            results[name] = bench_handler(storage, name, ctx, iterations, warmup)
+        except Exception as e:
+            results[name] = {"error": f"{type(e).__name__}: {e}"}
+
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "scale": scale._asdict(),
+            "backend": backend,
+            "layout": FILM_LISTS_LAYOUT,
+            "metrics": emit_metrics,
+            "codec": codec.CODEC_NAME,
+            "python": platform.python_version(),
+            "seed_seconds": seed_seconds,
+            "search_index_build_ms": search_index_build_ms,
+            "pan_listings_bytes": len(storage.get_bytes(S3_BUCKET, PAN_CINEMA_LISTINGS_KEY) or b""),
+        },
+        "results": results,
+    }
+
+
+def find_regressions(
+    current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = DEFAULT_TOLERANCE
+) -> List[str]:
+    """Human-readable regressions of ``current`` against ``baseline`` (same scale only)."""
+    if current["meta"]["scale"] != baseline["meta"]["scale"]:
+        raise ValueError(
+            f"Baseline scale {baseline['meta']['scale']} does not match this run's {current['meta']['scale']}"
+        )
+
+    regressions = []
+    build, base_build = current["meta"].get("search_index_build_ms"), baseline["meta"].get("search_index_build_ms")
+    if build is not None and base_build is not None:
+        if build > base_build * (1 + tolerance) and build - base_build > LATENCY_FLOOR_MS:
+            regressions.append(f"search index build: {base_build:.2f} -> {build:.2f} ms")
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None or "error" in base:
+            continue
+        if "error" in result:
+            regressions.append(f"{name}: failed ({result['error']})")
+            continue
+        p50, base_p50 = result["latency_ms"]["p50"], base["latency_ms"]["p50"]
+        if p50 > base_p50 * (1 + tolerance) and p50 - base_p50 > LATENCY_FLOOR_MS:
+            regressions.append(f"{name}: p50 latency {base_p50:.2f} -> {p50:.2f} ms")
+        peak, base_peak = result["peak_mib"], base["peak_mib"]
+        if peak > base_peak * (1 + tolerance) and peak - base_peak > MEMORY_FLOOR_MIB:
+            regressions.append(f"{name}: peak memory {base_peak:.1f} -> {peak:.1f} MiB")
+    return regressions
+
+
+def print_table(report: Dict[str, Any]) -> None:
+    print(f"{'handler':<28} {'p50 ms':>9} {'p95 ms':>9} {'per s':>9} {'calls':>6} {'resp KiB':>9} {'peak MiB':>9}")
+    for name, r in report["results"].items():
+        if "error" in r:
+            print(f"{name:<28} ERROR {r['error']}")
+            continue
+        print(
+            f"{name:<28} {r['latency_ms']['p50']:>9.2f} {r['latency_ms']['p95']:>9.2f} "
+            f"{r['throughput_per_s']:>9.1f} {r['storage_calls_per_invocation']:>6.1f} "
+            f"{r['response_bytes'] / 1024:>9.1f} {r['peak_mib']:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", choices=SCALES, default="small")
+    parser.add_argument("--films", type=int)
+    parser.add_argument("--cinemas", type=int)
+    parser.add_argument("--curators", type=int)
+    parser.add_argument("--lists", type=int, help="Lists per curator")
+    parser.add_argument("--films-per-list", type=int)
+    parser.add_argument("--handlers", nargs="+", help="Only these handlers (default: all registered)")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--backend", choices=["memory", "directory"], default="memory")
+    parser.add_argument("--directory", help="Root for --backend directory (should start empty)")
+    parser.add_argument("--metrics", action="store_true", help="Emit the per-invocation metrics lines")
+    parser.add_argument("--json", help="Write the results to this path")
+    parser.add_argument("--baseline", help="Compare against results previously written with --json")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+
+    scale = SCALES[args.scale]._replace(**{
+        field: value for field, value in (
+            ("films", args.films),
+            ("cinemas", args.cinemas),
+            ("curators", args.curators),
+            ("lists_per_curator", args.lists),
+            ("films_per_list", args.films_per_list),
+        ) if value is not None
+    })
+
+    report = run_suite(
+        scale, args.handlers, args.iterations, args.warmup, args.backend, args.directory, args.metrics
+    )
+    print(f"scale={scale._asdict()} backend={args.backend} layout={FILM_LISTS_LAYOUT}")
+    print(f"search index build {report['meta']['search_index_build_ms']:.1f} ms")
+    print_table(report)
+
+    if args.json:
+        pathlib.Path(args.json).write_text(json.dumps(report, indent=2))
+        print(f"Wrote {args.json}")
+
+    if args.baseline:
+        baseline = json.loads(pathlib.Path(args.baseline).read_text())
+        regressions = find_regressions(report, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against {args.baseline}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\nNo regressions against {args.baseline}")
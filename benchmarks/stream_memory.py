@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Compare peak memory of parsing pan_cinema_listings.json whole versus
+streaming it film by film with core.s3.iter_json_object_items.
+
+For each size a synthetic listings file is written to disk, then read back
+both ways under tracemalloc. "parse" only walks the films; "catalogue" also
+builds the film picker catalogue from them. Run from the project root:
+
+    python benchmarks/stream_memory.py
+    python benchmarks/stream_memory.py --films 1000 10000 50000 --json stream_memory.json
+"""
+
+import argparse
+import gc
+import json
+import pathlib
+import sys
+import tempfile
+import tracemalloc
+from typing import Any, Callable, Dict, Iterator, Tuple
+
+PROJECT_DIR = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+
+from benchmarks.synthetic import synthetic_pan_listings  # noqa: E402
+from config import S3_STREAM_CHUNK_BYTES  # noqa: E402
+from core import codec  # noqa: E402
+from core.film_catalogue import build_film_catalogue  # noqa: E402
+from core.s3 import iter_json_object_items  # noqa: E402
+
+
+def whole_items(path: pathlib.Path) -> Iterator[Tuple[str, Any]]:
+    with path.open("rb") as f:
+        data = codec.loads(f.read())
+    yield from data.items()
+
+
+def streamed_items(path: pathlib.Path) -> Iterator[Tuple[str, Any]]:
+    with path.open("rb") as f:
+        yield from iter_json_object_items(iter(lambda: f.read(S3_STREAM_CHUNK_BYTES), b""))
+
+
+def peak_mib(fn: Callable[[], Any]) -> float:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    finally:
+        tracemalloc.stop()
+
+
+def measure(path: pathlib.Path) -> Dict[str, float]:
+    def walk(items):
+        return lambda: sum(1 for _ in items(path))
+
+    def catalogue(items):
+        return lambda: build_film_catalogue(items(path), None)
+
+    return {
+        "parse_whole_mib": peak_mib(walk(whole_items)),
+        "parse_stream_mib": peak_mib(walk(streamed_items)),
+        "catalogue_whole_mib": peak_mib(catalogue(whole_items)),
+        "catalogue_stream_mib": peak_mib(catalogue(streamed_items)),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--films", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--json", help="Write the results to this path")
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'films':>8} {'file MiB':>9} {'parse whole':>12} {'parse stream':>13} {'cat. whole':>11} {'cat. stream':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for film_count in args.films:
+            path = pathlib.Path(tmp) / f"pan_{film_count}.json"
+            path.write_bytes(codec.dumps(synthetic_pan_listings(film_count)))
+            row = {"file_mib": path.stat().st_size / (1024 * 1024), **measure(path)}
+            results[film_count] = row
+            print(
+                f"{film_count:>8} {row['file_mib']:>9.1f} {row['parse_whole_mib']:>12.1f} "
+                f"{row['parse_stream_mib']:>13.1f} {row['catalogue_whole_mib']:>11.1f} "
+                f"{row['catalogue_stream_mib']:>12.1f}"
+            )
+
+    if args.json:
+        pathlib.Path(args.json).write_text(json.dumps(results, indent=2))
+        print(f"Wrote {args.json}")
@@ -0,0 +1,115 @@
+"""
+Synthetic pan_cinema_listings.json and filmLists.json generators for benchmarks.
+
+Produces the same shapes as the real files — db_id -> cinema -> listing with
+``when`` showings and ``_additional_info``, and CuratorFilmLists whose films
+embed those listings — with repetitive cinema names, dates and URLs, so sizes
+and compression ratios are realistic. Output is deterministic for a seed.
+"""
+
+import random
+from typing import Any, Dict, List
+
+from core.list_films import make_list_film
+from core.types.custom_lists import CuratorFilmLists
+
+CINEMAS = [
+    "prince_charles", "bfi_southbank", "barbican", "ica", "rio", "genesis",
+    "castle", "garden", "close_up", "curzon_soho", "picturehouse_central", "nickel",
+]
+
+_WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+_MONTHS = [
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+]
+
+
+def cinema_names(count: int) -> List[str]:
+    """The real cinema names first, then numbered ones up to ``count``."""
+    return CINEMAS[:count] + [f"cinema_{i}" for i in range(len(CINEMAS), count)]
+
+
+def _day_str(day: int) -> str:
+    suffix = "th" if 11 <= day <= 13 else {1: "st", 2: "nd", 3: "rd"}.get(day % 10, "th")
+    return f"{day}{suffix}"
+
+
+def _when(rng: random.Random) -> Dict[str, Any]:
+    month, day = rng.randint(1, 12), rng.randint(1, 28)
+    return {
+        "date": f"2026-{month:02d}-{day:02d}",
+        "structured_date_strings": {
+            "Weekday": rng.choice(_WEEKDAYS),
+            "Month": _MONTHS[month - 1],
+            "day_str": _day_str(day),
+        },
+        "year": 2026,
+        "month": month,
+        "day": day,
+        "showtimes": sorted(rng.sample(["12:00", "14:30", "17:45", "20:15", "21:00"], 2)),
+    }
+
+
+def synthetic_pan_listings(
+    film_count: int,
+    cinemas_per_film: int = 3,
+    dates_per_cinema: int = 4,
+    seed: int = 0,
+    cinema_count: int = len(CINEMAS),
+) -> Dict[str, Any]:
+    """Build a pan listings dict with ``film_count`` films shown across ``cinema_count`` cinemas."""
+    rng = random.Random(seed)
+    cinemas = cinema_names(cinema_count)
+    pan: Dict[str, Any] = {}
+    for i in range(film_count):
+        db_id = str(100000 + i)
+        listings = {}
+        for cinema in rng.sample(cinemas, min(cinemas_per_film, len(cinemas))):
+            listings[cinema] = {
+                "description": f"Synthetic Film {i} showing at {cinema}. " * 3,
+                "screen": f"Screen {rng.randint(1, 4)}",
+                "screeningType": rng.choice(["DCP", "35mm", "70mm"]),
+                "url": f"https://www.{cinema.replace('_', '')}.co.uk/films/{db_id}",
+                "when": [_when(rng) for _ in range(dates_per_cinema)],
+                "image_to_download": None,
+                "isImageGood": True,
+                "s3ImageURL": f"https://filmfynder.s3.amazonaws.com/images/{db_id}.jpg",
+                "_additional_info": {
+                    "title": f"Synthetic Film {i}",
+                    "directors": [f"Director {i % 97}"],
+                    "year": 1920 + i % 106,
+                    "runtime_mins": 80 + i % 90,
+                    "db_id": int(db_id),
+                },
+            }
+        pan[db_id] = listings
+    return pan
+
+
+def synthetic_curator_film_lists(
+    curator: str,
+    pan: Dict[str, Any],
+    list_count: int,
+    films_per_list: int,
+    mode: str = "embedded",
+    seed: int = 0,
+) -> CuratorFilmLists:
+    """Build ``list_count`` lists of films drawn from ``pan``, stored in ``mode``."""
+    rng = random.Random(f"{curator}:{seed}")
+    db_ids = list(pan)
+    lists: CuratorFilmLists = []
+    for n in range(list_count):
+        month = n % 12 + 1
+        picks = rng.sample(db_ids, min(films_per_list, len(db_ids)))
+        lists.append({
+            "list_curator": curator,
+            "list_name": f"List {n}",
+            "list_caption": f"{curator}'s picks, part {n}",
+            "start_date": f"2026-{month:02d}-01",
+            "end_date": f"2026-{month:02d}-28",
+            "list_films": [
+                make_list_film(int(db_id), pan[db_id], f"Caption for {db_id}", mode=mode) for db_id in picks
+            ],
+        })
+    return lists
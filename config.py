@@ -14,10 +14,131 @@ FILM_LISTS_BASE_PREFIX = "london/filmLists"
 # Filename stored inside each curator folder
 FILM_LISTS_FILENAME = "filmLists.json"
 
+# How films are stored in filmLists.json:
+#   "embedded"   - each ListFilm carries a full copy of its cinema_listings
+#   "normalized" - each ListFilm stores db_id, caption and listing_hash only;
+#                  cinema_listings are hydrated from pan listings at read time
+# Both forms are always readable; the mode only decides what gets written.
+FILM_LISTS_STORAGE_MODE = "embedded"
+
+# How each curator's lists are laid out under {FILM_LISTS_BASE_PREFIX}/{curator}/:
+#   "single"  - every list in one filmLists.json
+#   "sharded" - one object per list under lists/ plus a small manifest.json
+#               (names, dates, film counts); reads and writes only touch the
+#               lists involved. Move curators across with migrate_curator_layout.
+FILM_LISTS_LAYOUT = "single"
+FILM_LISTS_MANIFEST_FILENAME = "manifest.json"
+FILM_LISTS_SHARD_DIRNAME = "lists"
+
+# Journal write path for the "single" layout (see core/curator_journal.py).
+# When on, list edits append a small change record under
+# {curator}/journal/ instead of rewriting filmLists.json, reads fold the
+# journal over filmLists.json, and compact_curator folds it back in.
+# Run compact_curator for every curator before turning this off again.
+FILM_LISTS_JOURNAL_ENABLED = False
+FILM_LISTS_JOURNAL_DIRNAME = "journal"
+# compact_curator without a curator only compacts curators whose journal
+# has at least this many entries
+FILM_LISTS_JOURNAL_COMPACT_MIN_ENTRIES = 20
+# Folded entries are only deleted once older than this, so a write that
+# listed the journal before them cannot reuse their seq. Lambda's maximum
+# timeout bounds how long a write can take.
+FILM_LISTS_JOURNAL_RETAIN_SECONDS = 900
+
+# Objects derived from every curator's lists. Kept outside
+# FILM_LISTS_BASE_PREFIX so they never show up as curator folders.
+FILM_LISTS_DERIVED_PREFIX = "london/filmListsDerived"
+# Curator names plus per-curator stats, served by get_curators
+CURATORS_REGISTRY_KEY = f"{FILM_LISTS_DERIVED_PREFIX}/curators.json"
+# Reverse index: one object per film at {FILM_LISTS_INDEX_PREFIX}/{db_id}.json
+# naming the (curator, list_name) pairs that contain it, served by
+# get_lists_for_film. List updates keep it current; rebuild_film_index
+# regenerates it from a full scan.
+FILM_LISTS_INDEX_PREFIX = f"{FILM_LISTS_DERIVED_PREFIX}/films"
+# Summaries of every curator's lists that have not ended yet, served by
+# get_active_lists. List updates keep it current; refresh_active_lists
+# drops ended lists (schedule it daily) or rebuilds it from a full scan.
+ACTIVE_LISTS_FEED_KEY = f"{FILM_LISTS_DERIVED_PREFIX}/active_lists.json"
+
+# Mutations write filmLists.json with a conditional PUT (IfMatch on the ETag
+# read) and re-apply themselves on conflict, up to this many attempts.
+CURATOR_WRITE_MAX_ATTEMPTS = 5
+
 # Pan-cinema listings (source of truth for film data)
 # s3://filmfynder/london/cinema-listings/all/pan_cinema_listings.json
 PAN_CINEMA_LISTINGS_KEY = "london/cinema-listings/all/pan_cinema_listings.json"
 
+# Film picker catalogue derived from pan_cinema_listings.json by build_film_catalogue
+FILM_CATALOGUE_KEY = "london/cinema-listings/derived/film_catalogue.json"
+
+# search_films: a film matches when its title, an original title or a
+# director contains at least this share of the query's trigrams, so a typo
+# or two still match. Directors rank below titles by this factor.
+FILM_SEARCH_MIN_MATCH = 0.45
+FILM_SEARCH_DIRECTOR_WEIGHT = 0.8
+
+# --- JSON codec ---
+# "auto" uses orjson when installed (pip install .[fast]), "json" forces the
+# stdlib encoder, "orjson" requires orjson.
+JSON_CODEC = "auto"
+
+# --- Response compression ---
+# Bodies at least this large are gzip/brotli compressed when the client's
+# Accept-Encoding allows it; smaller bodies are not worth the CPU.
+RESPONSE_COMPRESSION_MIN_BYTES = 1024
+RESPONSE_GZIP_LEVEL = 5
+RESPONSE_BROTLI_QUALITY = 5
+
+# --- Metrics ---
+# One CloudWatch Embedded Metric Format line per invocation with per-phase
+# timings (S3 calls, JSON decode/encode, validation, mutation, response
+# encoding) and bytes/object counts, see core/metrics.py. When off, the
+# instrumentation points reduce to a single None check.
+METRICS_ENABLED = True
+METRICS_NAMESPACE = "KLCustomListings"
+
 # --- Lambda ---
 LAMBDA_FUNCTION_NAME = "kl_custom_listings"
 LAMBDA_URL = "https://b62gakukdi4hlmmcmhx533az3y0fgpqs.lambda-url.eu-north-1.on.aws/"
+
+# --- Storage backend ---
+# What get_s3_client() returns (see core/storage.py):
+#   "s3"        - the real bucket
+#   "memory"    - an in-process store that starts empty (tests, load tests)
+#   "directory" - files under STORAGE_DIRECTORY/{bucket}/{key}, for running
+#                 handlers and benchmarks offline
+# The KL_STORAGE_BACKEND and KL_STORAGE_DIRECTORY environment variables
+# override these without editing this file.
+STORAGE_BACKEND = "s3"
+STORAGE_DIRECTORY = "local_storage"
+
+# --- S3 client tuning ---
+# One client is created per container and shared by all threads, so the
+# pool must cover the widest concurrent fan-out a handler performs.
+S3_MAX_POOL_CONNECTIONS = 32
+S3_CONNECT_TIMEOUT_SECONDS = 2
+S3_READ_TIMEOUT_SECONDS = 15
+S3_RETRY_MODE = "adaptive"
+S3_RETRY_MAX_ATTEMPTS = 5
+
+# --- S3 JSON cache ---
+# Parsed JSON objects (e.g. pan_cinema_listings.json) are kept between warm
+# invocations and revalidated against their ETag before reuse.
+S3_JSON_CACHE_MAX_ENTRIES = 8
+# Budget for the parsed objects, not their bodies: parsed JSON takes several
+# times its body size in Python objects (benchmarks/stream_memory.py: 66 MiB
+# of listings parse to 378 MiB, about 5.7x), so each entry is counted as its
+# body size x S3_JSON_CACHE_PARSED_SIZE_RATIO. 256 MiB holds bodies up to
+# about 42 MiB.
+S3_JSON_CACHE_MAX_BYTES = 256 * 1024 * 1024
+S3_JSON_CACHE_PARSED_SIZE_RATIO = 6
+
+# Read size when streaming large JSON objects item by item (see
+# core.s3.stream_json_items_from_s3); peak memory is about one chunk plus
+# the largest single item.
+S3_STREAM_CHUNK_BYTES = 64 * 1024
+
+# Worker threads for fanning out S3 reads within one invocation (e.g.
+# get_custom_lists_bulk). They share the one client, so stay below
+# S3_MAX_POOL_CONNECTIONS.
+S3_FANOUT_MAX_WORKERS = 16
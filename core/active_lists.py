@@ -0,0 +1,148 @@
+"""
+Cross-curator feed of lists that have not ended yet, stored at ACTIVE_LISTS_FEED_KEY.
+
+get_active_lists serves the lists whose start_date..end_date window covers
+today from this one (cached) object, as CustomListSummary, instead of
+downloading every curator's lists. Upcoming lists are kept too, so a list
+appears on its start_date without anything being written; dates are UTC.
+
+Once the feed exists, every successful list update replaces its
+curator's entries with compare-and-swap (best effort, like the curators
+registry). refresh_active_lists drops ended lists on a schedule and
+builds, or rebuilds, the whole feed from a scan.
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.film_catalogue import load_film_catalogue
+from core.list_films import needs_hydration
+from core.list_views import summarise_custom_list
+from core.s3 import PreconditionFailedError, download_json_with_etag_from_s3, retry_on_conflict, upload_dict_to_s3
+from core.types.custom_lists import ActiveListsFeed, CuratorFilmLists, CustomListSummary
+from config import S3_BUCKET, ACTIVE_LISTS_FEED_KEY, CURATOR_WRITE_MAX_ATTEMPTS
+
+logger = logging.getLogger(__name__)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def today() -> str:
+    """The current UTC date, YYYY-MM-DD."""
+    return datetime.now(timezone.utc).date().isoformat()
+
+
+def is_active(summary: CustomListSummary, on: str) -> bool:
+    return summary["start_date"] <= on <= summary["end_date"]
+
+
+def empty_feed() -> ActiveListsFeed:
+    return ActiveListsFeed(built_at=_now(), pruned_on=today(), lists=[])
+
+
+def summarise_unended_lists(s3, film_lists: CuratorFilmLists, on: str) -> List[CustomListSummary]:
+    """Summaries of the lists (with films loaded) that have not ended by ``on``.
+
+    Normalized films take their titles from the film catalogue, which is
+    only read when such films are present.
+    """
+    unended = [fl for fl in film_lists if "list_films" in fl and fl["end_date"] >= on]
+    catalogue_films = load_film_catalogue(s3)["films"] if needs_hydration(unended) else {}
+    return [summarise_custom_list(fl, catalogue_films) for fl in unended]
+
+
+def merge_curator_lists(
+    feed_lists: List[CustomListSummary], curator: str, summaries: Iterable[CustomListSummary]
+) -> List[CustomListSummary]:
+    """``feed_lists`` with ``curator``'s entries replaced, keeping curators in name order."""
+    others = [s for s in feed_lists if s["list_curator"] != curator]
+    return sorted(others + list(summaries), key=lambda s: s["list_curator"])
+
+
+def load_active_lists_feed(s3) -> Tuple[ActiveListsFeed, Optional[str]]:
+    """Return the feed and its ETag, via the S3 JSON cache (do not mutate it).
+
+    Raises FileNotFoundError if it has never been built.
+    """
+    return download_json_with_etag_from_s3(s3, S3_BUCKET, ACTIVE_LISTS_FEED_KEY, cached=True)
+
+
+def save_active_lists_feed(s3, feed: ActiveListsFeed, etag: Optional[str]) -> Optional[str]:
+    """Conditional write: only if still at ``etag`` (None: only if absent)."""
+    if etag is None:
+        return upload_dict_to_s3(s3, S3_BUCKET, ACTIVE_LISTS_FEED_KEY, feed, if_none_match="*")
+    return upload_dict_to_s3(s3, S3_BUCKET, ACTIVE_LISTS_FEED_KEY, feed, if_match=etag)
+
+
+def record_curator_active_lists(s3, curator: str, film_lists: CuratorFilmLists) -> None:
+    """Replace the curator's entries after an update, skipping the write if unchanged.
+
+    Lists whose films were not loaded (sharded layout) were not changed by
+    the update, so their current entries are kept. Does nothing if the feed
+    has never been built: one curator's lists would pass for everyone's.
+    The first load_or_rebuild_active_lists_feed builds it from a scan.
+    """
+    on = today()
+    fresh: Optional[Dict[str, CustomListSummary]] = None
+
+    for attempt in range(1, CURATOR_WRITE_MAX_ATTEMPTS + 1):
+        try:
+            feed, etag = load_active_lists_feed(s3)
+        except FileNotFoundError:
+            logger.info("active lists feed not built yet, leaving '%s' to the first rebuild", curator)
+            return
+        if fresh is None:
+            fresh = {s["list_name"]: s for s in summarise_unended_lists(s3, film_lists, on)}
+
+        current = [s for s in feed["lists"] if s["list_curator"] == curator]
+        kept = {s["list_name"]: s for s in current}
+        summaries = []
+        for fl in film_lists:
+            name = fl["list_name"]
+            if name in fresh:
+                summaries.append(fresh[name])
+            elif "list_films" not in fl and name in kept and kept[name]["end_date"] >= on:
+                summaries.append(kept[name])
+        if summaries == current:
+            return
+
+        updated = ActiveListsFeed(
+            built_at=feed["built_at"],
+            pruned_on=feed["pruned_on"],
+            lists=merge_curator_lists(feed["lists"], curator, summaries),
+        )
+        try:
+            save_active_lists_feed(s3, updated, etag)
+            return
+        except PreconditionFailedError:
+            retry_on_conflict(ACTIVE_LISTS_FEED_KEY, attempt)
+
+    raise RuntimeError(
+        f"Gave up updating the active lists feed for '{curator}' after "
+        f"{CURATOR_WRITE_MAX_ATTEMPTS} conflicting writes"
+    )
+
+
+def prune_active_lists_feed(s3) -> Tuple[ActiveListsFeed, int]:
+    """Drop lists that ended before today; returns the feed and how many were dropped.
+
+    Raises FileNotFoundError if the feed has never been built.
+    """
+    for attempt in range(1, CURATOR_WRITE_MAX_ATTEMPTS + 1):
+        feed, etag = load_active_lists_feed(s3)
+        on = today()
+        lists = [s for s in feed["lists"] if s["end_date"] >= on]
+        if feed["pruned_on"] == on and len(lists) == len(feed["lists"]):
+            return feed, 0
+
+        pruned = ActiveListsFeed(built_at=feed["built_at"], pruned_on=on, lists=lists)
+        try:
+            save_active_lists_feed(s3, pruned, etag)
+            return pruned, len(feed["lists"]) - len(lists)
+        except PreconditionFailedError:
+            retry_on_conflict(ACTIVE_LISTS_FEED_KEY, attempt)
+
+    raise RuntimeError(f"Gave up pruning the active lists feed after {CURATOR_WRITE_MAX_ATTEMPTS} conflicting writes")
@@ -0,0 +1,83 @@
+"""
+JSON codec used for all S3 object I/O and Lambda response bodies.
+
+Encodes compactly (no indentation, UTF-8 rather than \\u escapes) and uses
+orjson when it is installed and JSON_CODEC allows it, falling back to the
+stdlib encoder otherwise. Decoding takes the raw bytes from the S3
+streaming body directly, without an intermediate str copy.
+
+Encode/decode time and bytes are accumulated per invocation so the
+entrypoint can report them for each handler, and recorded as the
+json_encode / json_decode phases of core.metrics.
+"""
+
+import json
+import threading
+import time
+from typing import Any, Dict, Union
+
+from core import metrics
+from config import JSON_CODEC
+
+try:
+    import orjson
+except ImportError:  # optional dependency: pip install .[fast]
+    orjson = None
+
+CODECS = ("auto", "orjson", "json")
+
+if JSON_CODEC not in CODECS:
+    raise ValueError(f"Invalid JSON_CODEC '{JSON_CODEC}', expected one of: {', '.join(CODECS)}")
+if JSON_CODEC == "orjson" and orjson is None:
+    raise ImportError("JSON_CODEC is 'orjson' but orjson is not installed")
+
+USE_ORJSON = orjson is not None and JSON_CODEC != "json"
+CODEC_NAME = "orjson" if USE_ORJSON else "json"
+
+_stats_lock = threading.Lock()
+_stats = {"encode_seconds": 0.0, "decode_seconds": 0.0, "encoded_bytes": 0, "decoded_bytes": 0}
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode ``obj`` as compact UTF-8 JSON bytes."""
+    start = time.perf_counter()
+    if USE_ORJSON:
+        data = orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    else:
+        data = json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    _record("encode", time.perf_counter() - start, len(data))
+    return data
+
+
+def loads(data: Union[bytes, bytearray, str]) -> Any:
+    """Decode JSON from bytes (preferred, no str copy) or str."""
+    start = time.perf_counter()
+    obj = orjson.loads(data) if USE_ORJSON else json.loads(data)
+    _record("decode", time.perf_counter() - start, len(data))
+    return obj
+
+
+def _record(kind: str, seconds: float, size: int) -> None:
+    with _stats_lock:
+        _stats[f"{kind}_seconds"] += seconds
+        _stats[f"{kind}d_bytes"] += size
+    metrics.record_phase(f"json_{kind}", seconds)
+    metrics.add(f"json_{kind}d_bytes", size)
+
+
+def get_codec_stats() -> Dict[str, Any]:
+    """Encode/decode totals since the last reset, times in milliseconds."""
+    with _stats_lock:
+        return {
+            "codec": CODEC_NAME,
+            "encode_ms": round(_stats["encode_seconds"] * 1000, 3),
+            "decode_ms": round(_stats["decode_seconds"] * 1000, 3),
+            "encoded_bytes": _stats["encoded_bytes"],
+            "decoded_bytes": _stats["decoded_bytes"],
+        }
+
+
+def reset_codec_stats() -> None:
+    with _stats_lock:
+        for name in _stats:
+            _stats[name] = 0.0 if name.endswith("_seconds") else 0
@@ -0,0 +1,65 @@
+"""
+Response body compression negotiated from the request's Accept-Encoding.
+
+Brotli is used when the client accepts it and the optional ``brotli``
+package is installed (pip install .[fast]); gzip otherwise. Bodies below
+RESPONSE_COMPRESSION_MIN_BYTES are sent as identity.
+"""
+
+import gzip
+from typing import Dict, List, Optional, Tuple
+
+from config import RESPONSE_COMPRESSION_MIN_BYTES, RESPONSE_GZIP_LEVEL, RESPONSE_BROTLI_QUALITY
+
+try:
+    import brotli
+except ImportError:  # optional dependency: pip install .[fast]
+    brotli = None
+
+
+def supported_encodings() -> List[str]:
+    """Encodings this process can produce, in order of preference."""
+    return (["br"] if brotli is not None else []) + ["gzip"]
+
+
+def _parse_accept_encoding(header: str) -> Dict[str, float]:
+    weights: Dict[str, float] = {}
+    for part in header.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[token] = q
+    return weights
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick the best supported encoding the client accepts, or None for identity."""
+    if not accept_encoding:
+        return None
+    weights = _parse_accept_encoding(accept_encoding)
+    best: Optional[Tuple[float, str]] = None
+    for encoding in supported_encodings():
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > 0 and (best is None or q > best[0]):
+            best = (q, encoding)
+    return best[1] if best else None
+
+
+def compress(body: bytes, accept_encoding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+    """Compress ``body`` for the client, returning (bytes, Content-Encoding or None)."""
+    if len(body) < RESPONSE_COMPRESSION_MIN_BYTES:
+        return body, None
+    encoding = choose_encoding(accept_encoding)
+    if encoding == "br":
+        return brotli.compress(body, quality=RESPONSE_BROTLI_QUALITY), "br"
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=RESPONSE_GZIP_LEVEL, mtime=0), "gzip"
+    return body, None
@@ -0,0 +1,102 @@
+"""
+Concurrency helpers for I/O-bound work such as S3 GETs.
+
+run_concurrently fans one function out over many items. One slow or failing
+item never fails the others: each outcome carries either a value or the
+exception it raised, and fanout_status summarises a fan-out for its response.
+
+prefetch and gather overlap a handful of independent reads within one
+handler, e.g. pan_cinema_listings.json while the curator's lists are read
+and validated: prefetch starts a call in the background and returns its
+Future; gather runs several calls at once and returns all their results.
+
+boto3 clients are thread-safe, so workers share the process-wide client
+and its keep-alive connection pool; S3_FANOUT_MAX_WORKERS keeps the number
+of threads below the pool size.
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, TypeVar
+
+from config import S3_FANOUT_MAX_WORKERS
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Long-lived pool behind prefetch/gather, created on first use
+_background: Optional[ThreadPoolExecutor] = None
+_background_lock = threading.Lock()
+
+
+class Outcome(NamedTuple):
+    item: Any
+    value: Any                  # fn(item), None if it raised
+    error: Optional[Exception]
+
+
+def _run(fn: Callable[[T], R], item: T) -> Outcome:
+    try:
+        return Outcome(item, fn(item), None)
+    except Exception as e:
+        return Outcome(item, None, e)
+
+
+def run_concurrently(
+    fn: Callable[[T], R], items: Sequence[T], max_workers: int = S3_FANOUT_MAX_WORKERS
+) -> List[Outcome]:
+    """Call ``fn`` on every item on up to ``max_workers`` threads.
+
+    Returns one Outcome per item, in input order. Total time approaches
+    the slowest call rather than the sum while items <= max_workers.
+    """
+    workers = min(max_workers, len(items))
+    if workers <= 1:
+        return [_run(fn, item) for item in items]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda item: _run(fn, item), items))
+
+
+def fanout_status(results: Sequence[Any], errors: Dict[str, str]) -> str:
+    """Response status of a fan-out: "ok", "partial" if some items failed, "error" if all did."""
+    if not errors:
+        return "ok"
+    return "partial" if results else "error"
+
+
+def _background_pool() -> ThreadPoolExecutor:
+    global _background
+    if _background is None:
+        with _background_lock:
+            if _background is None:
+                _background = ThreadPoolExecutor(max_workers=S3_FANOUT_MAX_WORKERS, thread_name_prefix="prefetch")
+    return _background
+
+
+def prefetch(fn: Callable[..., R], *args: Any, **kwargs: Any) -> "Future[R]":
+    """Start ``fn(*args, **kwargs)`` in the background and return its Future.
+
+    ``future.result()`` waits for it and re-raises anything it raised. The
+    call must not itself wait on other prefetched work.
+    """
+    return _background_pool().submit(fn, *args, **kwargs)
+
+
+def gather(*calls: Callable[[], Any]) -> List[Any]:
+    """Run independent zero-argument calls concurrently, returning their results in order.
+
+    The first call runs on the calling thread and the rest in the
+    background. Once all have finished, the first error in argument order
+    is re-raised.
+    """
+    futures = [prefetch(call) for call in calls[1:]]
+    outcomes = [_run(lambda call: call(), calls[0])] if calls else []
+    for future in futures:
+        try:
+            outcomes.append(Outcome(None, future.result(), None))
+        except Exception as e:
+            outcomes.append(Outcome(None, None, e))
+    for outcome in outcomes:
+        if outcome.error is not None:
+            raise outcome.error
+    return [outcome.value for outcome in outcomes]
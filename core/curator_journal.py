@@ -0,0 +1,400 @@
+"""
+Append-only journal of list edits over filmLists.json (FILM_LISTS_JOURNAL_ENABLED).
+
+    {FILM_LISTS_BASE_PREFIX}/{curator}/filmLists.json          snapshot, S3 metadata journal-seq=N
+    {FILM_LISTS_BASE_PREFIX}/{curator}/journal/{seq}.json      JournalEntry, seq > N pending
+
+An update reads the current state, runs the mutation on a copy and stores
+only what changed (a caption, a removed film, a new list) as the next
+journal entry, created with IfNoneMatch="*". The entry's sequence number
+is the commit point: two writers racing for the same number means one gets
+PreconditionFailedError and retries against the newer state, exactly like
+the compare-and-swap on filmLists.json. An edit therefore writes a few
+hundred bytes whatever the size of the curator.
+
+Reads list the journal, then fold the entries newer than the snapshot's
+journal-seq over it. compact_journal writes the folded state back as a new
+snapshot carrying the last folded seq, in the same PUT, and then deletes
+folded entries older than FILM_LISTS_JOURNAL_RETAIN_SECONDS; an entry that
+disappears between the listing and its GET was compacted, so the read
+starts again. Sequence numbers continue from the snapshot's journal-seq,
+and the retention window keeps a slow writer from re-creating a seq that
+was already folded.
+
+Entries are immutable, so parsed ones are kept in memory by key and ETag
+and a warm read only downloads what is new.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, TypeVar, cast
+
+from core import metrics
+from core.concurrency import run_concurrently
+from core.list_films import prepare_film_lists_for_storage
+from core.s3 import download_json_from_s3, download_json_with_metadata_from_s3, upload_dict_to_s3
+from core.types.custom_lists import CuratorFilmLists, CustomList, JournalEntry, validate_curator_film_lists
+from config import (
+    S3_BUCKET,
+    FILM_LISTS_BASE_PREFIX,
+    FILM_LISTS_JOURNAL_DIRNAME,
+    FILM_LISTS_JOURNAL_RETAIN_SECONDS,
+    CURATOR_WRITE_MAX_ATTEMPTS,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# S3 user metadata on the snapshot: seq of the last entry folded into it
+JOURNAL_SEQ_METADATA = "journal-seq"
+
+# Parsed journal entries kept across warm invocations: (key, etag) -> entry
+_ENTRY_CACHE_MAX_ENTRIES = 512
+_entry_cache: "OrderedDict[Tuple[str, str], JournalEntry]" = OrderedDict()
+_entry_cache_lock = threading.Lock()
+
+Change = Dict[str, Any]
+
+
+class JournalObject(NamedTuple):
+    seq: int
+    key: str
+    etag: str
+
+
+class JournalState(NamedTuple):
+    film_lists: CuratorFilmLists        # snapshot with pending entries applied (a private copy)
+    snapshot_etag: Optional[str]        # None if filmLists.json does not exist
+    seq: int                            # last seq reflected in film_lists
+    pending: int                        # entries applied on top of the snapshot
+    folded: List[JournalObject]         # every listed entry with seq <= seq
+
+
+def journal_prefix(curator: str) -> str:
+    return f"{FILM_LISTS_BASE_PREFIX}/{curator}/{FILM_LISTS_JOURNAL_DIRNAME}/"
+
+
+def journal_entry_key(curator: str, seq: int) -> str:
+    # Zero-padded so S3's lexicographic listing is also numeric order
+    return f"{journal_prefix(curator)}{seq:012d}.json"
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+# ── copying and diffing ───────────────────────────────────────────
+
+def _copy_list(custom_list: CustomList) -> CustomList:
+    return cast(CustomList, {**custom_list, "list_films": [dict(film) for film in custom_list["list_films"]]})
+
+
+def copy_film_lists(film_lists: CuratorFilmLists) -> CuratorFilmLists:
+    """Copy the lists and their film entries; nested values (cinema_listings) are shared."""
+    return [_copy_list(fl) for fl in film_lists]
+
+
+def _same(a: Any, b: Any) -> bool:
+    return a is b or a == b
+
+
+def _unique(values: List[Any]) -> bool:
+    return len(set(values)) == len(values)
+
+
+def _expected_order(before: List[Any], after: List[Any]) -> List[Any]:
+    """Order applying the other changes produces: survivors in place, additions appended."""
+    kept = set(after)
+    existing = set(before)
+    return [v for v in before if v in kept] + [v for v in after if v not in existing]
+
+
+def _list_changes(old: CustomList, new: CustomList) -> List[Change]:
+    name = new["list_name"]
+    old_ids = [film["db_id"] for film in old["list_films"]]
+    new_ids = [film["db_id"] for film in new["list_films"]]
+    if old.keys() != new.keys() or not _unique(old_ids) or not _unique(new_ids):
+        return [] if old == new else [{"op": "put_list", "list": new}]
+
+    changes: List[Change] = []
+    fields = {k: v for k, v in new.items() if k != "list_films" and not _same(old[k], v)}
+    if fields:
+        changes.append({"op": "set_list_fields", "list_name": name, "fields": fields})
+
+    old_films = dict(zip(old_ids, old["list_films"]))
+    kept = set(new_ids)
+    changes.extend({"op": "remove_film", "list_name": name, "db_id": db_id} for db_id in old_ids if db_id not in kept)
+    for film in new["list_films"]:
+        prev = old_films.get(film["db_id"])
+        if prev is None or prev.keys() != film.keys():
+            changes.append({"op": "set_film", "list_name": name, "film": film})
+            continue
+        film_fields = {k: v for k, v in film.items() if not _same(prev[k], v)}
+        if film_fields:
+            changes.append({"op": "set_film_fields", "list_name": name, "db_id": film["db_id"], "fields": film_fields})
+
+    if _expected_order(old_ids, new_ids) != new_ids:
+        changes.append({"op": "order_films", "list_name": name, "db_ids": new_ids})
+    return changes
+
+
+def diff_film_lists(before: CuratorFilmLists, after: CuratorFilmLists) -> List[Change]:
+    """The changes that turn ``before`` into ``after``, as small as the edit allows.
+
+    Lists are matched by name and films by db_id; a curator with duplicate
+    list names falls back to a single replace_all change.
+    """
+    before_names = [fl["list_name"] for fl in before]
+    after_names = [fl["list_name"] for fl in after]
+    if not _unique(before_names) or not _unique(after_names):
+        return [] if before == after else [{"op": "replace_all", "lists": after}]
+
+    old_lists = dict(zip(before_names, before))
+    kept = set(after_names)
+    changes: List[Change] = [{"op": "delete_list", "list_name": n} for n in before_names if n not in kept]
+    for fl in after:
+        old = old_lists.get(fl["list_name"])
+        if old is None:
+            changes.append({"op": "put_list", "list": fl})
+        else:
+            changes.extend(_list_changes(old, fl))
+
+    if _expected_order(before_names, after_names) != after_names:
+        changes.append({"op": "order_lists", "list_names": after_names})
+    return changes
+
+
+# ── applying ──────────────────────────────────────────────────────
+#
+# Each entry was computed against the state its predecessors produce, so
+# its targets exist when folded in order. A change whose list or film is
+# missing anyway (filmLists.json edited outside the journal) is skipped.
+
+def _find(items: List[Dict[str, Any]], field: str, value: Any) -> Optional[int]:
+    for i, item in enumerate(items):
+        if item[field] == value:
+            return i
+    return None
+
+
+def _reorder(items: List[Dict[str, Any]], field: str, order: List[Any]) -> List[Dict[str, Any]]:
+    """Items in ``order``; any not named keep their relative order at the end."""
+    rank = {value: i for i, value in enumerate(order)}
+    return sorted(items, key=lambda item: rank.get(item[field], len(rank)))
+
+
+def _upsert(items: List[Dict[str, Any]], field: str, item: Dict[str, Any]) -> None:
+    i = _find(items, field, item[field])
+    if i is None:
+        items.append(item)
+    else:
+        items[i] = item
+
+
+def _target_list(film_lists: CuratorFilmLists, change: Change) -> Optional[CustomList]:
+    i = _find(film_lists, "list_name", change["list_name"])
+    return None if i is None else film_lists[i]
+
+
+def _apply_change(film_lists: CuratorFilmLists, change: Change) -> None:
+    op = change["op"]
+    if op == "replace_all":
+        film_lists[:] = copy_film_lists(change["lists"])
+    elif op == "put_list":
+        _upsert(film_lists, "list_name", _copy_list(change["list"]))
+    elif op == "delete_list":
+        film_lists[:] = [fl for fl in film_lists if fl["list_name"] != change["list_name"]]
+    elif op == "order_lists":
+        film_lists[:] = _reorder(film_lists, "list_name", change["list_names"])
+    elif op in ("set_list_fields", "set_film", "set_film_fields", "remove_film", "order_films"):
+        target = _target_list(film_lists, change)
+        if target is None:
+            return
+        films = target["list_films"]
+        if op == "set_list_fields":
+            target.update(change["fields"])
+        elif op == "set_film":
+            _upsert(films, "db_id", dict(change["film"]))
+        elif op == "set_film_fields":
+            i = _find(films, "db_id", change["db_id"])
+            if i is not None:
+                films[i] = {**films[i], **change["fields"]}
+        elif op == "remove_film":
+            target["list_films"] = [film for film in films if film["db_id"] != change["db_id"]]
+        else:
+            target["list_films"] = _reorder(films, "db_id", change["db_ids"])
+    else:
+        raise ValueError(f"Unknown journal change '{op}'")
+
+
+def apply_changes(film_lists: CuratorFilmLists, changes: Iterable[Change]) -> CuratorFilmLists:
+    """Apply journal changes to ``film_lists`` in place and return it."""
+    for change in changes:
+        _apply_change(film_lists, change)
+    return film_lists
+
+
+# ── reading ───────────────────────────────────────────────────────
+
+def list_journal(s3, curator: str) -> List[JournalObject]:
+    """The curator's journal entries in seq order."""
+    found = []
+    paginator = s3.get_paginator("list_objects_v2")
+    with metrics.span("s3_list"):
+        for page in paginator.paginate(Bucket=S3_BUCKET, Prefix=journal_prefix(curator)):
+            metrics.add("s3_lists")
+            for obj in page.get("Contents", []):
+                name = obj["Key"].rsplit("/", 1)[-1]
+                if name.endswith(".json") and name[:-5].isdigit():
+                    found.append(JournalObject(int(name[:-5]), obj["Key"], obj.get("ETag", "")))
+    return sorted(found)
+
+
+def _load_entry(s3, obj: JournalObject) -> JournalEntry:
+    cache_key = (obj.key, obj.etag)
+    with _entry_cache_lock:
+        entry = _entry_cache.get(cache_key)
+        if entry is not None:
+            _entry_cache.move_to_end(cache_key)
+            return entry
+    entry = download_json_from_s3(s3, S3_BUCKET, obj.key)
+    if obj.etag:
+        with _entry_cache_lock:
+            _entry_cache[cache_key] = entry
+            while len(_entry_cache) > _ENTRY_CACHE_MAX_ENTRIES:
+                _entry_cache.popitem(last=False)
+    return entry
+
+
+def clear_journal_cache() -> None:
+    with _entry_cache_lock:
+        _entry_cache.clear()
+
+
+def load_journaled_film_lists(s3, curator: str, snapshot_key: str, missing_ok: bool = False) -> JournalState:
+    """Read the snapshot and fold the pending journal entries over it.
+
+    The journal is listed before the snapshot is read, so every entry the
+    snapshot does not contain is either listed or newer than the read. A
+    missing snapshot raises FileNotFoundError, or with ``missing_ok`` is
+    treated as empty.
+    """
+    for attempt in range(1, CURATOR_WRITE_MAX_ATTEMPTS + 1):
+        objects = list_journal(s3, curator)
+        try:
+            raw, etag, metadata = download_json_with_metadata_from_s3(s3, S3_BUCKET, snapshot_key, cached=True)
+        except FileNotFoundError:
+            if not missing_ok:
+                raise
+            raw, etag, metadata = [], None, {}
+        base_seq = int(metadata.get(JOURNAL_SEQ_METADATA, 0))
+        pending = [obj for obj in objects if obj.seq > base_seq]
+
+        outcomes = run_concurrently(lambda obj: _load_entry(s3, obj), pending)
+        if any(isinstance(o.error, FileNotFoundError) for o in outcomes):
+            logger.info("journal for '%s' compacted during read (attempt %d), re-reading", curator, attempt)
+            continue
+        for outcome in outcomes:
+            if outcome.error is not None:
+                raise outcome.error
+        metrics.add("journal_entries_read", len(pending))
+
+        with metrics.span("validate"):
+            snapshot = validate_curator_film_lists(raw, curator)
+        # The snapshot may be a shared cached object: fold into a copy
+        film_lists = copy_film_lists(snapshot)
+        with metrics.span("journal_fold"):
+            for outcome in outcomes:
+                apply_changes(film_lists, outcome.value["changes"])
+        seq = max([base_seq] + [obj.seq for obj in pending])
+        return JournalState(film_lists, etag, seq, len(pending), [obj for obj in objects if obj.seq <= seq])
+
+    raise RuntimeError(f"Journal for curator '{curator}' kept changing while being read")
+
+
+def journal_head(s3, curator: str) -> Optional[str]:
+    """Key of the newest journal entry, or None; changes whenever an entry is appended."""
+    objects = list_journal(s3, curator)
+    return objects[-1].key if objects else None
+
+
+# ── writing ───────────────────────────────────────────────────────
+
+def append_journal_entry(s3, curator: str, seq: int, changes: List[Change]) -> None:
+    """Create entry ``seq``; PreconditionFailedError if another writer took it first."""
+    entry = JournalEntry(curator=curator, seq=seq, written_at=_now(), changes=changes)
+    upload_dict_to_s3(s3, S3_BUCKET, journal_entry_key(curator, seq), entry, if_none_match="*")
+    metrics.add("journal_entries_written")
+
+
+def apply_journaled_update(
+    s3,
+    curator: str,
+    snapshot_key: str,
+    mutate: Callable[[CuratorFilmLists], T],
+    create_if_missing: bool = False,
+) -> Tuple[T, CuratorFilmLists]:
+    """Run ``mutate`` on the current state and append what it changed.
+
+    Returns the mutation's result and the updated lists. No entry is
+    written when nothing changed. A missing snapshot is created empty first
+    (when ``create_if_missing``) so the curator exists as in the plain layout.
+    """
+    state = load_journaled_film_lists(s3, curator, snapshot_key, missing_ok=create_if_missing)
+    if state.snapshot_etag is None:
+        upload_dict_to_s3(s3, S3_BUCKET, snapshot_key, [], if_none_match="*")
+
+    film_lists = state.film_lists
+    before = copy_film_lists(film_lists)
+    with metrics.span("mutate"):
+        result = mutate(film_lists)
+    prepare_film_lists_for_storage(film_lists)
+
+    changes = diff_film_lists(before, film_lists)
+    if changes:
+        append_journal_entry(s3, curator, state.seq + 1, changes)
+    return result, film_lists
+
+
+def compact_journal(s3, curator: str, snapshot_key: str) -> Dict[str, Any]:
+    """Fold the pending entries into a new snapshot, then delete the old ones.
+
+    The snapshot write is conditional on the snapshot that was read, so it
+    raises PreconditionFailedError if another compaction got there first.
+    Entries appended meanwhile have higher seqs and stay pending. Folded
+    entries younger than FILM_LISTS_JOURNAL_RETAIN_SECONDS are kept (and
+    ignored by reads) until a later compaction.
+    """
+    state = load_journaled_film_lists(s3, curator, snapshot_key, missing_ok=True)
+    if state.pending:
+        data = prepare_film_lists_for_storage(state.film_lists)
+        metadata = {JOURNAL_SEQ_METADATA: str(state.seq)}
+        if state.snapshot_etag is None:
+            upload_dict_to_s3(s3, S3_BUCKET, snapshot_key, data, if_none_match="*", metadata=metadata)
+        else:
+            upload_dict_to_s3(s3, S3_BUCKET, snapshot_key, data, if_match=state.snapshot_etag, metadata=metadata)
+
+    # Includes entries earlier compactions folded but kept
+    cutoff = (datetime.now(timezone.utc) - timedelta(seconds=FILM_LISTS_JOURNAL_RETAIN_SECONDS)).isoformat()
+    deleted = retained = 0
+    for obj in state.folded:
+        try:
+            if _load_entry(s3, obj)["written_at"] > cutoff:
+                retained += 1
+                continue
+            s3.delete_object(Bucket=S3_BUCKET, Key=obj.key)
+            deleted += 1
+        except Exception as e:
+            logger.warning("could not delete compacted journal entry %s: %s", obj.key, e)
+
+    return {
+        "curator": curator,
+        "compacted": state.pending,
+        "entries_deleted": deleted,
+        "entries_retained": retained,
+        "journal_seq": state.seq,
+        "lists": len(state.film_lists),
+    }
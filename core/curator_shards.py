@@ -0,0 +1,244 @@
+"""
+Sharded layout for a curator's lists (FILM_LISTS_LAYOUT = "sharded").
+
+    {FILM_LISTS_BASE_PREFIX}/{curator}/manifest.json                    CuratorListsManifest
+    {FILM_LISTS_BASE_PREFIX}/{curator}/lists/{list_id}/{version}.json   CustomList
+
+List objects are immutable: an edit writes the list under a new version,
+then swaps the manifest entry to point at it with a conditional PUT. The
+manifest write is the single commit point, so an update touching several
+lists is still all-or-nothing and losing a race just means retrying;
+superseded versions are deleted once the manifest has moved on.
+
+Only the lists an update names are downloaded and only the ones it changes
+are rewritten, so the cost of an edit follows the size of the list edited
+rather than everything the curator has ever made.
+"""
+
+import logging
+import uuid
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+
+from core import codec, metrics
+from core.concurrency import run_concurrently
+from core.list_films import prepare_film_lists_for_storage
+from core.s3 import PreconditionFailedError, download_json_with_etag_from_s3, upload_dict_to_s3
+from core.types.custom_lists import (
+    CuratorFilmLists,
+    CuratorListsManifest,
+    CustomList,
+    ListManifestEntry,
+    validate_curator_film_lists,
+)
+from config import S3_BUCKET, FILM_LISTS_BASE_PREFIX, FILM_LISTS_MANIFEST_FILENAME, FILM_LISTS_SHARD_DIRNAME
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def curator_manifest_key(curator: str) -> str:
+    return f"{FILM_LISTS_BASE_PREFIX}/{curator}/{FILM_LISTS_MANIFEST_FILENAME}"
+
+
+def list_object_key(curator: str, list_id: str, version: str) -> str:
+    return f"{FILM_LISTS_BASE_PREFIX}/{curator}/{FILM_LISTS_SHARD_DIRNAME}/{list_id}/{version}.json"
+
+
+def empty_manifest(curator: str) -> CuratorListsManifest:
+    return CuratorListsManifest(curator=curator, lists=[])
+
+
+def _new_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+def _manifest_entry(custom_list: CustomList, list_id: str, version: str) -> ListManifestEntry:
+    return ListManifestEntry(
+        list_id=list_id,
+        version=version,
+        list_name=custom_list["list_name"],
+        list_caption=custom_list["list_caption"],
+        start_date=custom_list["start_date"],
+        end_date=custom_list["end_date"],
+        film_count=len(custom_list["list_films"]),
+    )
+
+
+def _stub(entry: ListManifestEntry, curator: str) -> Dict[str, Any]:
+    """Metadata-only stand-in for a list an update did not ask to load (no list_films)."""
+    return {
+        "list_curator": curator,
+        "list_name": entry["list_name"],
+        "list_caption": entry["list_caption"],
+        "start_date": entry["start_date"],
+        "end_date": entry["end_date"],
+    }
+
+
+def load_manifest(s3, curator: str, missing_ok: bool = False) -> Tuple[CuratorListsManifest, Optional[str]]:
+    """Return the curator's manifest and its ETag; ``(empty, None)`` if missing and ``missing_ok``."""
+    try:
+        manifest, etag = download_json_with_etag_from_s3(s3, S3_BUCKET, curator_manifest_key(curator))
+    except FileNotFoundError:
+        if not missing_ok:
+            raise
+        return empty_manifest(curator), None
+    if not isinstance(manifest, dict) or not isinstance(manifest.get("lists"), list):
+        raise ValueError(f"Corrupt manifest.json for curator '{curator}': expected an object with a lists array")
+    return manifest, etag
+
+
+def _load_list(s3, curator: str, entry: ListManifestEntry) -> CustomList:
+    key = list_object_key(curator, entry["list_id"], entry["version"])
+    return download_json_with_etag_from_s3(s3, S3_BUCKET, key)[0]
+
+
+def _load_lists(s3, curator: str, entries: Iterable[ListManifestEntry]) -> CuratorFilmLists:
+    # Fetched concurrently, kept in manifest order; the first failure is raised
+    outcomes = run_concurrently(lambda entry: _load_list(s3, curator, entry), list(entries))
+    for outcome in outcomes:
+        if outcome.error is not None:
+            raise outcome.error
+    lists = [outcome.value for outcome in outcomes]
+    with metrics.span("validate"):
+        return validate_curator_film_lists(lists, curator)
+
+
+def _wanted(entry: ListManifestEntry, list_names: Optional[Iterable[str]]) -> bool:
+    return list_names is None or entry["list_name"] in list_names
+
+
+def load_sharded_film_lists(
+    s3, curator: str, missing_ok: bool = False, list_names: Optional[Iterable[str]] = None
+) -> Tuple[CuratorFilmLists, Optional[str]]:
+    """Return the curator's lists (only ``list_names`` if given) and the manifest ETag.
+
+    A version can be superseded and deleted between reading the manifest and
+    reading the list, in which case the manifest is re-read.
+    """
+    names = set(list_names) if list_names is not None else None
+    for _ in range(3):
+        manifest, etag = load_manifest(s3, curator, missing_ok=missing_ok)
+        try:
+            return _load_lists(s3, curator, (e for e in manifest["lists"] if _wanted(e, names))), etag
+        except FileNotFoundError:
+            logger.info("list version for curator '%s' replaced while reading, re-reading manifest", curator)
+    raise RuntimeError(f"Lists for curator '{curator}' kept changing while being read")
+
+
+def apply_sharded_update(
+    s3,
+    curator: str,
+    mutate: Callable[[CuratorFilmLists], T],
+    create_if_missing: bool = False,
+    list_names: Optional[Iterable[str]] = None,
+) -> Tuple[T, List[ListManifestEntry]]:
+    """One read -> mutate -> commit attempt against the sharded layout.
+
+    Lists not named in ``list_names`` are passed to ``mutate`` as metadata
+    stubs without list_films; they can be reordered or dropped but not
+    edited. Returns the mutation's result and the committed manifest
+    entries. Raises PreconditionFailedError if the manifest moved on, after
+    removing any list versions this attempt wrote.
+    """
+    names = set(list_names) if list_names is not None else None
+    manifest, manifest_etag = load_manifest(s3, curator, missing_ok=create_if_missing)
+    entries: List[ListManifestEntry] = manifest["lists"]
+
+    loaded_entries = [e for e in entries if _wanted(e, names)]
+    try:
+        loaded = dict(zip((e["list_id"] for e in loaded_entries), _load_lists(s3, curator, loaded_entries)))
+    except FileNotFoundError:
+        raise PreconditionFailedError(f"Lists for curator '{curator}' changed while being read")
+    snapshots = {list_id: codec.dumps(custom_list) for list_id, custom_list in loaded.items()}
+
+    film_lists = [loaded.get(e["list_id"]) or _stub(e, curator) for e in entries]
+    # Lists are matched back to their entries by identity; keeping the
+    # originals referenced stops a dropped list's id() being reused.
+    originals = list(film_lists)
+    origin = {id(fl): e for fl, e in zip(originals, entries)}
+
+    with metrics.span("mutate"):
+        result = mutate(film_lists)
+
+    new_entries: List[ListManifestEntry] = []
+    written: List[str] = []
+    try:
+        for fl in film_lists:
+            entry = origin.get(id(fl))
+            if entry is not None and entry["list_id"] not in loaded:
+                if fl != _stub(entry, curator):
+                    raise RuntimeError(f"List '{entry['list_name']}' was changed without being loaded")
+                new_entries.append(entry)
+                continue
+            if entry is not None and codec.dumps(fl) == snapshots[entry["list_id"]]:
+                new_entries.append(entry)
+                continue
+
+            list_id = entry["list_id"] if entry is not None else _new_id()
+            version = _new_id()
+            key = list_object_key(curator, list_id, version)
+            stored = prepare_film_lists_for_storage([fl])[0]
+            upload_dict_to_s3(s3, S3_BUCKET, key, stored, if_none_match="*")
+            written.append(key)
+            new_entries.append(_manifest_entry(stored, list_id, version))
+
+        if new_entries == entries and manifest_etag is not None:
+            return result, entries
+
+        new_manifest = CuratorListsManifest(curator=curator, lists=new_entries)
+        if manifest_etag is None:
+            upload_dict_to_s3(s3, S3_BUCKET, curator_manifest_key(curator), new_manifest, if_none_match="*")
+        else:
+            upload_dict_to_s3(s3, S3_BUCKET, curator_manifest_key(curator), new_manifest, if_match=manifest_etag)
+    except Exception:
+        _delete_quietly(s3, written)
+        raise
+
+    current = {(e["list_id"], e["version"]) for e in new_entries}
+    delete_list_versions(s3, curator, (e for e in entries if (e["list_id"], e["version"]) not in current))
+    return result, new_entries
+
+
+def write_sharded_film_lists(
+    s3, curator: str, film_lists: CuratorFilmLists, manifest_etag: Optional[str] = None
+) -> CuratorListsManifest:
+    """Write every list as a new version and point a fresh manifest at them.
+
+    The manifest is created only if absent, or replaced only if still at
+    ``manifest_etag``; PreconditionFailedError otherwise. Used by migration.
+    """
+    entries: List[ListManifestEntry] = []
+    written: List[str] = []
+    try:
+        for custom_list in prepare_film_lists_for_storage(film_lists):
+            list_id, version = _new_id(), _new_id()
+            key = list_object_key(curator, list_id, version)
+            upload_dict_to_s3(s3, S3_BUCKET, key, custom_list, if_none_match="*")
+            written.append(key)
+            entries.append(_manifest_entry(custom_list, list_id, version))
+
+        manifest = CuratorListsManifest(curator=curator, lists=entries)
+        if manifest_etag is None:
+            upload_dict_to_s3(s3, S3_BUCKET, curator_manifest_key(curator), manifest, if_none_match="*")
+        else:
+            upload_dict_to_s3(s3, S3_BUCKET, curator_manifest_key(curator), manifest, if_match=manifest_etag)
+    except Exception:
+        _delete_quietly(s3, written)
+        raise
+    return manifest
+
+
+def delete_list_versions(s3, curator: str, entries: Iterable[ListManifestEntry]) -> None:
+    """Best-effort delete of the list objects ``entries`` point at."""
+    _delete_quietly(s3, [list_object_key(curator, e["list_id"], e["version"]) for e in entries])
+
+
+def _delete_quietly(s3, keys: List[str]) -> None:
+    """Best-effort cleanup of list versions nothing points at any more."""
+    for key in keys:
+        try:
+            s3.delete_object(Bucket=S3_BUCKET, Key=key)
+        except Exception as e:
+            logger.warning("could not delete orphaned list version %s: %s", key, e)
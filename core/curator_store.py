@@ -0,0 +1,291 @@
+"""
+Read and write a curator's lists with optimistic concurrency.
+
+Every write is a conditional PUT: IfMatch on the ETag that was read, or
+IfNoneMatch="*" when the file is being created. update_curator_film_lists
+wraps a mutation in read -> mutate -> compare-and-swap and re-applies it
+against a fresh copy when another writer got there first, so concurrent
+editors never silently overwrite each other.
+
+FILM_LISTS_LAYOUT picks where the lists live: one filmLists.json per
+curator ("single"), or one object per list plus a manifest ("sharded",
+see core.curator_shards), where the manifest is what gets swapped.
+With FILM_LISTS_JOURNAL_ENABLED the single layout appends each update's
+changes to a per-curator journal instead of rewriting filmLists.json, and
+reads fold the journal over it (see core.curator_journal).
+
+After each successful update the curator's entry in the curators registry
+is refreshed, the films it added to or removed from lists are updated in
+the reverse film index and the curator's entries in the active lists feed
+are replaced; all best effort, repaired by rebuild_curators_registry,
+rebuild_film_index and refresh_active_lists.
+"""
+
+import logging
+from typing import Any, Callable, Iterable, List, NamedTuple, Optional, Tuple, TypeVar
+
+from core.curator_journal import apply_journaled_update, journal_head, load_journaled_film_lists
+from core.curator_shards import (
+    apply_sharded_update,
+    curator_manifest_key,
+    empty_manifest,
+    load_manifest,
+    load_sharded_film_lists,
+)
+from core import metrics
+from core.active_lists import record_curator_active_lists
+from core.concurrency import gather
+from core.curators_registry import curator_stats, record_curator_stats
+from core.film_lists_index import Memberships, list_memberships, record_membership_changes
+from core.list_films import prepare_film_lists_for_storage
+from core.list_views import list_metadata
+from core.s3 import PreconditionFailedError, download_json_with_etag_from_s3, retry_on_conflict, upload_dict_to_s3
+from core.types.custom_lists import (
+    CuratorFilmLists,
+    CuratorStats,
+    CustomList,
+    CustomListMetadata,
+    validate_curator_film_lists,
+)
+from config import (
+    S3_BUCKET,
+    FILM_LISTS_BASE_PREFIX,
+    FILM_LISTS_FILENAME,
+    FILM_LISTS_LAYOUT,
+    FILM_LISTS_JOURNAL_ENABLED,
+    CURATOR_WRITE_MAX_ATTEMPTS,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+LAYOUTS = ("single", "sharded")
+
+if FILM_LISTS_LAYOUT not in LAYOUTS:
+    raise ValueError(f"Invalid FILM_LISTS_LAYOUT '{FILM_LISTS_LAYOUT}', expected one of: {', '.join(LAYOUTS)}")
+if FILM_LISTS_JOURNAL_ENABLED and FILM_LISTS_LAYOUT != "single":
+    raise ValueError("FILM_LISTS_JOURNAL_ENABLED requires FILM_LISTS_LAYOUT 'single'")
+
+
+def curator_lists_key(curator: str) -> str:
+    """Key of the curator's filmLists.json in the single-file layout."""
+    return f"{FILM_LISTS_BASE_PREFIX}/{curator}/{FILM_LISTS_FILENAME}"
+
+
+def curator_root_key(curator: str) -> str:
+    """Key whose existence defines the curator in the configured layout."""
+    if FILM_LISTS_LAYOUT == "sharded":
+        return curator_manifest_key(curator)
+    return curator_lists_key(curator)
+
+
+def empty_curator_root(curator: str) -> Any:
+    """Initial contents of curator_root_key for a new curator."""
+    if FILM_LISTS_LAYOUT == "sharded":
+        return empty_manifest(curator)
+    return []
+
+
+def curator_lists_uri(curator: str) -> str:
+    return f"s3://{S3_BUCKET}/{curator_root_key(curator)}"
+
+
+def curator_journal_head(s3, curator: str) -> Optional[str]:
+    """Newest journal entry key when the journal is on (None otherwise), for response ETags."""
+    if not FILM_LISTS_JOURNAL_ENABLED:
+        return None
+    return journal_head(s3, curator)
+
+
+def load_curator_film_lists(
+    s3, curator: str, missing_ok: bool = False, list_names: Optional[Iterable[str]] = None
+) -> Tuple[CuratorFilmLists, Optional[str]]:
+    """Return the curator's validated lists and the ETag they were read at.
+
+    A missing file raises FileNotFoundError, or with ``missing_ok`` is
+    returned as ``([], None)`` so a later save creates it. ``list_names``
+    restricts the result to those lists; in the sharded layout the others
+    are not downloaded at all.
+    """
+    if FILM_LISTS_LAYOUT == "sharded":
+        return load_sharded_film_lists(s3, curator, missing_ok=missing_ok, list_names=list_names)
+
+    if FILM_LISTS_JOURNAL_ENABLED:
+        state = load_journaled_film_lists(s3, curator, curator_lists_key(curator), missing_ok=missing_ok)
+        film_lists, etag = state.film_lists, state.snapshot_etag
+        if list_names is not None:
+            names = set(list_names)
+            film_lists = [fl for fl in film_lists if fl["list_name"] in names]
+        return film_lists, etag
+
+    try:
+        raw, etag = download_json_with_etag_from_s3(s3, S3_BUCKET, curator_lists_key(curator))
+    except FileNotFoundError:
+        if not missing_ok:
+            raise
+        raw, etag = [], None
+    with metrics.span("validate"):
+        film_lists = validate_curator_film_lists(raw, curator)
+    if list_names is not None:
+        names = set(list_names)
+        film_lists = [fl for fl in film_lists if fl["list_name"] in names]
+    return film_lists, etag
+
+
+def load_curator_list_metadata(
+    s3, curator: str, missing_ok: bool = False, list_names: Optional[Iterable[str]] = None
+) -> List[CustomListMetadata]:
+    """Return each list's metadata and film_count, without its films.
+
+    In the sharded layout this reads the manifest only; the single-file
+    layout has to download filmLists.json regardless.
+    """
+    if FILM_LISTS_LAYOUT == "sharded":
+        manifest, _ = load_manifest(s3, curator, missing_ok=missing_ok)
+        names = set(list_names) if list_names is not None else None
+        return [
+            CustomListMetadata(
+                list_curator=curator,
+                list_name=e["list_name"],
+                list_caption=e["list_caption"],
+                start_date=e["start_date"],
+                end_date=e["end_date"],
+                film_count=e["film_count"],
+            )
+            for e in manifest["lists"]
+            if names is None or e["list_name"] in names
+        ]
+    film_lists, _ = load_curator_film_lists(s3, curator, missing_ok=missing_ok, list_names=list_names)
+    return [list_metadata(fl) for fl in film_lists]
+
+
+def save_curator_film_lists(
+    s3, curator: str, film_lists: CuratorFilmLists, etag: Optional[str]
+) -> Optional[str]:
+    """Write the lists only if the file is still at ``etag`` (None: only if absent).
+
+    Raises PreconditionFailedError when another writer changed it first.
+    Returns the new ETag. Single-file layout only.
+    """
+    key = curator_lists_key(curator)
+    data = prepare_film_lists_for_storage(film_lists)
+    if etag is None:
+        return upload_dict_to_s3(s3, S3_BUCKET, key, data, if_none_match="*")
+    return upload_dict_to_s3(s3, S3_BUCKET, key, data, if_match=etag)
+
+
+def update_curator_film_lists(
+    s3,
+    curator: str,
+    mutate: Callable[[CuratorFilmLists], T],
+    create_if_missing: bool = False,
+    list_names: Optional[Iterable[str]] = None,
+) -> T:
+    """Apply ``mutate`` to the curator's lists and save them with compare-and-swap.
+
+    ``mutate`` edits the lists in place and returns the handler's result; it
+    may run more than once (against fresh data) if a concurrent write wins,
+    so it must not have side effects outside the lists it is given. Errors
+    it raises (e.g. ValueError for a missing list) abort without writing.
+
+    ``list_names`` names the lists ``mutate`` reads or edits. In the sharded
+    layout only those are downloaded; the rest are passed as metadata-only
+    entries that can be dropped or reordered but not edited. None loads all.
+
+    With the journal on, only what ``mutate`` changed is written, as the
+    curator's next journal entry.
+    """
+    runs: List[_MutationRun] = []
+    tracked = _tracking(mutate, runs)
+    for attempt in range(1, CURATOR_WRITE_MAX_ATTEMPTS + 1):
+        try:
+            if FILM_LISTS_LAYOUT == "sharded":
+                result, entries = apply_sharded_update(s3, curator, tracked, create_if_missing, list_names)
+                stats = curator_stats((e["film_count"], e["end_date"]) for e in entries)
+            elif FILM_LISTS_JOURNAL_ENABLED:
+                result, film_lists = apply_journaled_update(
+                    s3, curator, curator_lists_key(curator), tracked, create_if_missing
+                )
+                stats = _stats_from_lists(film_lists)
+            else:
+                film_lists, etag = load_curator_film_lists(s3, curator, missing_ok=create_if_missing)
+                with metrics.span("mutate"):
+                    result = tracked(film_lists)
+                save_curator_film_lists(s3, curator, film_lists, etag)
+                stats = _stats_from_lists(film_lists)
+            # All derived from the write just made, each touching different objects
+            gather(
+                lambda: _record_stats_quietly(s3, curator, stats),
+                lambda: _record_memberships_quietly(s3, curator, runs[-1]),
+                lambda: _record_active_lists_quietly(s3, curator, runs[-1]),
+            )
+            return result
+        except PreconditionFailedError:
+            retry_on_conflict(curator_root_key(curator), attempt)
+
+    raise RuntimeError(
+        f"Gave up updating lists for curator '{curator}' after "
+        f"{CURATOR_WRITE_MAX_ATTEMPTS} conflicting writes"
+    )
+
+
+def _stats_from_lists(film_lists: CuratorFilmLists) -> CuratorStats:
+    return curator_stats((len(fl["list_films"]), fl["end_date"]) for fl in film_lists)
+
+
+def _record_stats_quietly(s3, curator: str, stats: CuratorStats) -> None:
+    try:
+        record_curator_stats(s3, curator, stats)
+    except Exception as e:
+        logger.warning("could not update curators registry for '%s': %s", curator, e)
+
+
+class _MutationRun(NamedTuple):
+    before: Memberships           # each list's films before mutate
+    after: Memberships            # ... and after it
+    film_lists: CuratorFilmLists  # the lists as mutate left them
+
+
+def _tracking(mutate: Callable[[CuratorFilmLists], T], runs: List[_MutationRun]):
+    """Wrap ``mutate`` to append a _MutationRun to ``runs`` each time it returns."""
+    def _tracked(film_lists: CuratorFilmLists) -> T:
+        before = list_memberships(film_lists)
+        result = mutate(film_lists)
+        runs.append(_MutationRun(before, list_memberships(film_lists), film_lists))
+        return result
+    return _tracked
+
+
+def _record_memberships_quietly(s3, curator: str, run: _MutationRun) -> None:
+    try:
+        record_membership_changes(s3, curator, run.before, run.after)
+    except Exception as e:
+        logger.warning("could not update film index for '%s': %s", curator, e)
+
+
+def _record_active_lists_quietly(s3, curator: str, run: _MutationRun) -> None:
+    try:
+        record_curator_active_lists(s3, curator, run.film_lists)
+    except Exception as e:
+        logger.warning("could not update active lists feed for '%s': %s", curator, e)
+
+
+def load_curator_stats(s3, curator: str) -> CuratorStats:
+    """Compute the curator's registry stats from storage (manifest only when sharded)."""
+    if FILM_LISTS_LAYOUT == "sharded":
+        manifest, _ = load_manifest(s3, curator, missing_ok=True)
+        return curator_stats((e["film_count"], e["end_date"]) for e in manifest["lists"])
+    film_lists, _ = load_curator_film_lists(s3, curator, missing_ok=True)
+    return _stats_from_lists(film_lists)
+
+
+def find_custom_list(film_lists: CuratorFilmLists, curator: str, list_name: str) -> CustomList:
+    """Return the named list, raising ValueError if the curator has no such list."""
+    for fl in film_lists:
+        if fl["list_name"] == list_name:
+            if "list_films" not in fl:
+                # Sharded layout: the caller did not name this list in list_names
+                raise RuntimeError(f"List '{list_name}' was not loaded for this update")
+            return fl
+    raise ValueError(f"List '{list_name}' not found for curator '{curator}'")
@@ -0,0 +1,120 @@
+"""
+Registry of curators and their list stats, stored at CURATORS_REGISTRY_KEY.
+
+get_curators serves this one (cached) object instead of LISTing the
+curator folders on every request. Once it exists, create_curator adds
+entries and every successful list update refreshes its curator's stats;
+it is first built, and can be rebuilt, from a paginated scan with
+rebuild_curators_registry.
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from core import metrics
+from core.s3 import PreconditionFailedError, download_json_with_etag_from_s3, retry_on_conflict, upload_dict_to_s3
+from core.types.custom_lists import CuratorsRegistry, CuratorStats
+from config import S3_BUCKET, FILM_LISTS_BASE_PREFIX, CURATORS_REGISTRY_KEY, CURATOR_WRITE_MAX_ATTEMPTS
+
+logger = logging.getLogger(__name__)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def curator_stats(lists: Iterable[Tuple[int, str]]) -> CuratorStats:
+    """Stats from each list's (film_count, end_date)."""
+    list_count = 0
+    film_count = 0
+    latest_end_date: Optional[str] = None
+    for films, end_date in lists:
+        list_count += 1
+        film_count += films
+        if end_date and (latest_end_date is None or end_date > latest_end_date):
+            latest_end_date = end_date
+    return CuratorStats(
+        list_count=list_count,
+        film_count=film_count,
+        latest_end_date=latest_end_date,
+        updated_at=_now(),
+    )
+
+
+def empty_registry() -> CuratorsRegistry:
+    return CuratorsRegistry(built_at=_now(), curators={})
+
+
+def scan_curator_names(s3) -> List[str]:
+    """Every curator folder under FILM_LISTS_BASE_PREFIX, following pagination."""
+    curators = []
+    paginator = s3.get_paginator("list_objects_v2")
+    with metrics.span("s3_list"):
+        for page in paginator.paginate(Bucket=S3_BUCKET, Prefix=f"{FILM_LISTS_BASE_PREFIX}/", Delimiter="/"):
+            metrics.add("s3_lists")
+            for cp in page.get("CommonPrefixes", []):
+                # cp["Prefix"] looks like "london/filmLists/kinologue/"
+                curators.append(cp["Prefix"].rstrip("/").split("/")[-1])
+    return curators
+
+
+def resolve_curators(event: Dict[str, Any], all_curators: Callable[[], List[str]]) -> List[str]:
+    """The curators a fan-out handler's payload names.
+
+    ``curator`` is one name, ``curators`` a list of names (duplicates
+    dropped) or "all" (the default), which calls ``all_curators``.
+    """
+    if event.get("curator"):
+        return [event["curator"]]
+    if isinstance(event.get("curators"), list) and event["curators"]:
+        return list(dict.fromkeys(event["curators"]))
+    if event.get("curators", "all") == "all":
+        return all_curators()
+    raise ValueError("curators must be a list of names or \"all\"")
+
+
+def load_curators_registry(s3) -> Tuple[CuratorsRegistry, Optional[str]]:
+    """Return the registry and its ETag, via the S3 JSON cache (do not mutate it).
+
+    Raises FileNotFoundError if it has never been built.
+    """
+    return download_json_with_etag_from_s3(s3, S3_BUCKET, CURATORS_REGISTRY_KEY, cached=True)
+
+
+def save_curators_registry(s3, registry: CuratorsRegistry, etag: Optional[str]) -> Optional[str]:
+    """Conditional write: only if still at ``etag`` (None: only if absent)."""
+    if etag is None:
+        return upload_dict_to_s3(s3, S3_BUCKET, CURATORS_REGISTRY_KEY, registry, if_none_match="*")
+    return upload_dict_to_s3(s3, S3_BUCKET, CURATORS_REGISTRY_KEY, registry, if_match=etag)
+
+
+def record_curator_stats(s3, curator: str, stats: CuratorStats) -> None:
+    """Set one curator's entry with compare-and-swap, skipping the write if unchanged.
+
+    Does nothing if the registry has never been built: an entry for one
+    curator would pass for the whole registry and hide every other one.
+    The first load_or_rebuild_curators_registry builds it from a scan.
+    """
+    for attempt in range(1, CURATOR_WRITE_MAX_ATTEMPTS + 1):
+        try:
+            registry, etag = load_curators_registry(s3)
+        except FileNotFoundError:
+            logger.info("curators registry not built yet, leaving '%s' to the first rebuild", curator)
+            return
+
+        current = registry["curators"].get(curator)
+        if current is not None and {**current, "updated_at": stats["updated_at"]} == stats:
+            return
+
+        updated = CuratorsRegistry(built_at=registry["built_at"], curators={**registry["curators"], curator: stats})
+        try:
+            save_curators_registry(s3, updated, etag)
+            return
+        except PreconditionFailedError:
+            retry_on_conflict(CURATORS_REGISTRY_KEY, attempt)
+
+    raise RuntimeError(
+        f"Gave up updating the curators registry for '{curator}' after "
+        f"{CURATOR_WRITE_MAX_ATTEMPTS} conflicting writes"
+    )
@@ -0,0 +1,13 @@
+"""
+S3 object ETags computed locally.
+
+Kept apart from core.storage, which imports botocore, so core modules can
+compare against stored ETags without loading it at import time.
+"""
+
+import hashlib
+
+
+def md5_etag(body: bytes) -> str:
+    """ETag S3 gives a single-part upload: the quoted MD5 of the body."""
+    return f'"{hashlib.md5(body).hexdigest()}"'
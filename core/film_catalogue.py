@@ -0,0 +1,160 @@
+"""
+Film picker catalogue: the compact AvailableFilmSummary map derived from
+pan_cinema_listings.json.
+
+The catalogue is identical for every caller until the listings change, so
+build_film_catalogue_handler stores it at FILM_CATALOGUE_KEY tagged with the
+source ETag, and load_film_catalogue serves that artifact while it is fresh.
+
+Both build paths stream the listings one film at a time rather than parsing
+the whole file, so memory is bounded by the catalogue plus one film.
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.s3 import download_json_from_s3, get_s3_object_etag, stream_json_items_from_s3
+from core.types.custom_lists import AvailableFilmSummary, CinemaShowing, FilmCatalogue
+from core.types.film_listings import CleanMatchedFilmsCinemaListings
+from config import S3_BUCKET, PAN_CINEMA_LISTINGS_KEY, FILM_CATALOGUE_KEY
+
+logger = logging.getLogger(__name__)
+
+# Catalogue built on the fly when the artifact is missing or stale, reused
+# while the listings ETag it was built from is still current.
+_fallback_catalogue: Optional[FilmCatalogue] = None
+
+
+def summarise_film(cinema_listings: CleanMatchedFilmsCinemaListings) -> Optional[AvailableFilmSummary]:
+    """Build the picker summary for one film, or None if it has no title."""
+    title: Optional[str] = None
+    directors: Optional[List[str]] = None
+    year: Optional[int] = None
+
+    for listing in cinema_listings.values():
+        info = listing.get("_additional_info", {})
+        if not title and info.get("title"):
+            title = info["title"]
+        if not directors:
+            raw_dirs = info.get("directors")
+            if isinstance(raw_dirs, list):
+                directors = raw_dirs
+            elif isinstance(raw_dirs, str):
+                directors = [raw_dirs]
+        if not year and info.get("year"):
+            year = info["year"]
+
+    # Skip films without a proper title
+    if not title:
+        return None
+
+    # Ensure directors is always a list of strings
+    if directors is None:
+        directors = []
+
+    # Build per-cinema showings (always include cinema even if no dates)
+    cinema_showings: Dict[str, List[CinemaShowing]] = {}
+    for cinema_name, listing in cinema_listings.items():
+        when_list = listing.get("when", [])
+        dates: List[CinemaShowing] = []
+        if isinstance(when_list, list):
+            for entry in when_list:
+                d = entry.get("date", "")
+                if isinstance(d, str) and d:
+                    dates.append(CinemaShowing(
+                        date=d,
+                        showtimes=entry.get("showtimes", []),
+                    ))
+        cinema_showings[cinema_name] = dates
+
+    return AvailableFilmSummary(
+        title=title,
+        directors=directors,
+        year=year,
+        cinema_count=len(cinema_listings),
+        cinemas=list(cinema_listings.keys()),
+        cinema_showings=cinema_showings,
+    )
+
+
+def original_titles(cinema_listings: CleanMatchedFilmsCinemaListings, title: str) -> List[str]:
+    """Titles as each cinema printed them, for search_films; once each, without ``title`` itself."""
+    seen = {title.casefold()}
+    titles: List[str] = []
+    for listing in cinema_listings.values():
+        raw = listing.get("_additional_info", {}).get("original_raw_titles")
+        if isinstance(raw, str):
+            raw = [raw]
+        elif not isinstance(raw, list):
+            continue
+        for raw_title in raw:
+            if isinstance(raw_title, str) and raw_title and raw_title.casefold() not in seen:
+                seen.add(raw_title.casefold())
+                titles.append(raw_title)
+    return titles
+
+
+def build_film_catalogue(
+    films: Iterable[Tuple[str, CleanMatchedFilmsCinemaListings]],
+    source_etag: Optional[str],
+) -> FilmCatalogue:
+    """Summarise every (db_id, cinema_listings) pair into a FilmCatalogue.
+
+    ``films`` is consumed once, so it can be the stream from
+    stream_json_items_from_s3.
+    """
+    summaries: Dict[str, AvailableFilmSummary] = {}
+    search_titles: Dict[str, List[str]] = {}
+    skipped_no_title = 0
+
+    for db_id_str, cinema_listings in films:
+        summary = summarise_film(cinema_listings)
+        if summary is None:
+            skipped_no_title += 1
+            continue
+        summaries[str(db_id_str)] = summary
+        titles = original_titles(cinema_listings, summary["title"])
+        if titles:
+            search_titles[str(db_id_str)] = titles
+
+    return FilmCatalogue(
+        source_key=PAN_CINEMA_LISTINGS_KEY,
+        source_etag=source_etag,
+        built_at=datetime.now(timezone.utc).isoformat(),
+        film_count=len(summaries),
+        skipped_no_title=skipped_no_title,
+        films=summaries,
+        original_titles=search_titles,
+    )
+
+
+def load_film_catalogue(s3) -> FilmCatalogue:
+    """Return a catalogue matching the current pan_cinema_listings.json.
+
+    Serves the stored artifact when its source_etag matches the listings'
+    current ETag, otherwise builds one from the listings. The returned
+    catalogue is shared through the S3 JSON cache and must not be mutated.
+    """
+    global _fallback_catalogue
+
+    source_etag = get_s3_object_etag(s3, S3_BUCKET, PAN_CINEMA_LISTINGS_KEY)
+
+    try:
+        catalogue: FilmCatalogue = download_json_from_s3(s3, S3_BUCKET, FILM_CATALOGUE_KEY, cached=True)
+        if source_etag is not None and catalogue.get("source_etag") == source_etag:
+            return catalogue
+        logger.warning(
+            "film catalogue is stale (built from %s, listings at %s), building on the fly",
+            catalogue.get("source_etag"), source_etag,
+        )
+    except FileNotFoundError:
+        logger.warning("film catalogue %s missing, building on the fly", FILM_CATALOGUE_KEY)
+
+    fallback = _fallback_catalogue
+    if fallback is not None and source_etag is not None and fallback["source_etag"] == source_etag:
+        return fallback
+
+    films, pan_etag = stream_json_items_from_s3(s3, S3_BUCKET, PAN_CINEMA_LISTINGS_KEY)
+    _fallback_catalogue = build_film_catalogue(films, pan_etag)
+    return _fallback_catalogue
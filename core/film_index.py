@@ -0,0 +1,170 @@
+"""
+In-memory indexes over a FilmCatalogue for server-side filtering and
+cursor pagination in get_available_films.
+
+Built once per catalogue version and kept for the life of the container,
+so each request intersects a few precomputed posting sets instead of
+scanning every film.
+"""
+
+import base64
+import binascii
+import json
+import threading
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional, Set, Tuple
+
+from core.types.custom_lists import FilmCatalogue
+
+# Sort key for the stable film order: (casefolded title, numeric db_id)
+SortKey = Tuple[str, int]
+
+
+def trigrams(text: str) -> Set[str]:
+    """Character trigrams of ``text`` (already normalised by the caller)."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _sort_key(db_id: str, title: str) -> SortKey:
+    return (title.casefold(), int(db_id) if db_id.isdigit() else 0)
+
+
+class FilmCatalogueIndex:
+    """Posting sets over catalogue positions, ordered by title then db_id."""
+
+    def __init__(self, catalogue: FilmCatalogue):
+        self.version: Tuple[Optional[str], str] = (catalogue["source_etag"], catalogue["built_at"])
+        films = catalogue["films"]
+
+        self.order: List[str] = sorted(films, key=lambda i: _sort_key(i, films[i]["title"]))
+        self.sort_keys: List[SortKey] = [_sort_key(i, films[i]["title"]) for i in self.order]
+        self.titles: List[str] = [k[0] for k in self.sort_keys]
+
+        self.by_trigram: Dict[str, Set[int]] = {}
+        self.by_director: Dict[str, Set[int]] = {}
+        self.by_cinema: Dict[str, Set[int]] = {}
+        years: List[Tuple[int, int]] = []
+        dates: List[Tuple[str, int]] = []
+
+        for pos, db_id in enumerate(self.order):
+            film = films[db_id]
+            for gram in trigrams(self.titles[pos]):
+                self.by_trigram.setdefault(gram, set()).add(pos)
+            for director in film["directors"]:
+                self.by_director.setdefault(director.casefold(), set()).add(pos)
+            for cinema in film["cinemas"]:
+                self.by_cinema.setdefault(cinema, set()).add(pos)
+            if isinstance(film["year"], int):
+                years.append((film["year"], pos))
+            film_dates = {s["date"] for showings in film["cinema_showings"].values() for s in showings}
+            dates.extend((d, pos) for d in film_dates)
+
+        years.sort()
+        dates.sort()
+        self.years = years
+        self.dates = dates
+
+    def _title_matches(self, query: str) -> Set[int]:
+        query = query.casefold()
+        grams = trigrams(query)
+        if not grams:
+            return {pos for pos, title in enumerate(self.titles) if query in title}
+        candidates = set.intersection(*(self.by_trigram.get(g, set()) for g in grams))
+        return {pos for pos in candidates if query in self.titles[pos]}
+
+    def _director_matches(self, query: str) -> Set[int]:
+        query = query.casefold()
+        matches: Set[int] = set()
+        for director, positions in self.by_director.items():
+            if query in director:
+                matches |= positions
+        return matches
+
+    @staticmethod
+    def _range(pairs: list, low, high) -> Set[int]:
+        start = 0 if low is None else bisect_left(pairs, (low, -1))
+        end = len(pairs) if high is None else bisect_right(pairs, (high, float("inf")))
+        return {pos for _, pos in pairs[start:end]}
+
+    def filter(
+        self,
+        title: Optional[str] = None,
+        director: Optional[str] = None,
+        year_from: Optional[int] = None,
+        year_to: Optional[int] = None,
+        cinema: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+    ) -> List[int]:
+        """Sorted catalogue positions matching every given filter."""
+        selections: List[Set[int]] = []
+        if cinema:
+            selections.append(self.by_cinema.get(cinema, set()))
+        if director:
+            selections.append(self._director_matches(director))
+        if year_from is not None or year_to is not None:
+            selections.append(self._range(self.years, year_from, year_to))
+        if date_from or date_to:
+            selections.append(self._range(self.dates, date_from, date_to))
+        if title:
+            selections.append(self._title_matches(title))
+
+        if not selections:
+            return list(range(len(self.order)))
+
+        selections.sort(key=len)
+        matched = set(selections[0])
+        for selection in selections[1:]:
+            matched &= selection
+        return sorted(matched)
+
+    def page(self, positions: List[int], cursor: Optional[str], limit: Optional[int]) -> Tuple[List[str], Optional[str]]:
+        """Slice sorted positions after ``cursor``; return db_ids and the next cursor.
+
+        The cursor encodes the sort key of the last film returned, so pages
+        stay stable even if the catalogue is rebuilt between requests.
+        """
+        start = 0
+        if cursor:
+            after = bisect_right(self.sort_keys, decode_cursor(cursor))
+            start = bisect_left(positions, after)
+
+        if limit is None:
+            window = positions[start:]
+            next_cursor = None
+        else:
+            window = positions[start:start + limit]
+            has_more = start + limit < len(positions)
+            next_cursor = encode_cursor(self.sort_keys[window[-1]]) if has_more and window else None
+
+        return [self.order[pos] for pos in window], next_cursor
+
+
+def encode_cursor(key: SortKey) -> str:
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> SortKey:
+    try:
+        title, db_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return (str(title), int(db_id))
+    except (ValueError, TypeError, binascii.Error):
+        raise ValueError(f"Invalid cursor '{cursor}'")
+
+
+_index: Optional[FilmCatalogueIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_film_catalogue_index(catalogue: FilmCatalogue) -> FilmCatalogueIndex:
+    """Return the index for ``catalogue``, building it only when the version changes."""
+    global _index
+
+    version = (catalogue["source_etag"], catalogue["built_at"])
+    index = _index
+    if index is not None and index.version == version:
+        return index
+    with _index_lock:
+        if _index is None or _index.version != version:
+            _index = FilmCatalogueIndex(catalogue)
+        return _index
@@ -0,0 +1,193 @@
+"""
+Reverse index from a film's db_id to the curator lists that contain it.
+
+One small object per film at {FILM_LISTS_INDEX_PREFIX}/{db_id}.json, so
+"which lists feature film X?" is a single GET (get_lists_for_film) instead
+of a download of every curator's lists.
+
+update_curator_film_lists records which films each list held before and
+after a mutation and applies the difference here, one compare-and-swap
+per film involved; edits that do not add, remove or rename anything write
+nothing. Like the curators registry this is best effort, and
+rebuild_film_index regenerates the whole index from a scan. A film that
+leaves every list keeps an object with no lists until the next rebuild
+deletes it.
+"""
+
+import logging
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from core import codec, metrics
+from core.concurrency import run_concurrently
+from core.s3 import PreconditionFailedError, download_json_with_etag_from_s3, retry_on_conflict, upload_dict_to_s3
+from core.etag import md5_etag
+from core.types.custom_lists import CuratorFilmLists, FilmListRef, FilmListsIndexEntry
+from config import S3_BUCKET, FILM_LISTS_INDEX_PREFIX, CURATOR_WRITE_MAX_ATTEMPTS
+
+logger = logging.getLogger(__name__)
+
+# list_name -> db_ids in the list, None for a list whose films were not
+# loaded (metadata-only entries in the sharded layout)
+Memberships = Dict[str, Optional[FrozenSet[int]]]
+
+
+def film_index_key(db_id: int) -> str:
+    return f"{FILM_LISTS_INDEX_PREFIX}/{db_id}.json"
+
+
+def _sorted_refs(refs: Iterable[FilmListRef]) -> List[FilmListRef]:
+    return sorted(refs, key=lambda ref: (ref["curator"], ref["list_name"]))
+
+
+def list_memberships(film_lists: CuratorFilmLists) -> Memberships:
+    """Which films each list holds, for comparing a curator's lists across a mutation."""
+    return {
+        fl["list_name"]: frozenset(f["db_id"] for f in fl["list_films"]) if "list_films" in fl else None
+        for fl in film_lists
+    }
+
+
+def membership_changes(curator: str, before: Memberships, after: Memberships) -> Dict[int, Tuple[Set[str], Set[str]]]:
+    """db_id -> (names of lists it joined, names of lists it left).
+
+    A renamed list shows up as every film leaving the old name and joining
+    the new one. Lists whose films were not loaded are unchanged, except
+    that one deleted that way cannot be removed from the index.
+    """
+    changes: Dict[int, Tuple[Set[str], Set[str]]] = {}
+    for name in sorted(before.keys() | after.keys()):
+        old = before.get(name, frozenset())
+        new = after.get(name, frozenset())
+        if old is None or new is None:
+            if name not in after:
+                logger.warning(
+                    "list '%s' of '%s' was deleted without loading its films; "
+                    "run rebuild_film_index to drop it from the film index", name, curator,
+                )
+            continue
+        for db_id in new - old:
+            changes.setdefault(db_id, (set(), set()))[0].add(name)
+        for db_id in old - new:
+            changes.setdefault(db_id, (set(), set()))[1].add(name)
+    return changes
+
+
+def load_film_index_entry(s3, db_id: int) -> Tuple[FilmListsIndexEntry, Optional[str]]:
+    """The film's entry and ETag; a film with no object has no lists (and ETag None)."""
+    try:
+        return download_json_with_etag_from_s3(s3, S3_BUCKET, film_index_key(db_id))
+    except FileNotFoundError:
+        return FilmListsIndexEntry(db_id=db_id, lists=[]), None
+
+
+def update_film_index_entry(s3, curator: str, db_id: int, joined: Set[str], left: Set[str]) -> None:
+    """Move one film's refs for ``curator`` with compare-and-swap, skipping the write if unchanged."""
+    for attempt in range(1, CURATOR_WRITE_MAX_ATTEMPTS + 1):
+        entry, etag = load_film_index_entry(s3, db_id)
+        touched = joined | left
+        refs = [
+            ref for ref in entry["lists"]
+            if ref["curator"] != curator or ref["list_name"] not in touched
+        ]
+        refs.extend(FilmListRef(curator=curator, list_name=name) for name in joined)
+        refs = _sorted_refs(refs)
+        if refs == entry["lists"]:
+            return
+
+        updated = FilmListsIndexEntry(db_id=db_id, lists=refs)
+        try:
+            if etag is None:
+                upload_dict_to_s3(s3, S3_BUCKET, film_index_key(db_id), updated, if_none_match="*")
+            else:
+                upload_dict_to_s3(s3, S3_BUCKET, film_index_key(db_id), updated, if_match=etag)
+            return
+        except PreconditionFailedError:
+            retry_on_conflict(film_index_key(db_id), attempt)
+
+    raise RuntimeError(
+        f"Gave up updating the film index for db_id={db_id} after "
+        f"{CURATOR_WRITE_MAX_ATTEMPTS} conflicting writes"
+    )
+
+
+def record_membership_changes(s3, curator: str, before: Memberships, after: Memberships) -> int:
+    """Apply one update's membership changes to the index; returns the films touched.
+
+    Films are updated concurrently. Raises RuntimeError naming how many
+    failed, after attempting all of them.
+    """
+    changes = membership_changes(curator, before, after)
+    outcomes = run_concurrently(
+        lambda item: update_film_index_entry(s3, curator, item[0], *item[1]), list(changes.items())
+    )
+    failed = [outcome for outcome in outcomes if outcome.error is not None]
+    for outcome in failed:
+        logger.warning("could not update film index for db_id=%s: %s", outcome.item[0], outcome.error)
+    if failed:
+        raise RuntimeError(f"{len(failed)} of {len(changes)} film index updates failed")
+    return len(changes)
+
+
+def film_index_from_lists(curator_lists: Iterable[Tuple[str, CuratorFilmLists]]) -> Dict[int, FilmListsIndexEntry]:
+    """Build every film's entry from each curator's full lists, keyed (and ordered) by db_id."""
+    refs: Dict[int, Dict[Tuple[str, str], FilmListRef]] = {}
+    for curator, film_lists in curator_lists:
+        for fl in film_lists:
+            for film in fl["list_films"]:
+                refs.setdefault(film["db_id"], {})[(curator, fl["list_name"])] = FilmListRef(
+                    curator=curator, list_name=fl["list_name"]
+                )
+    return {
+        db_id: FilmListsIndexEntry(db_id=db_id, lists=_sorted_refs(refs[db_id].values()))
+        for db_id in sorted(refs)
+    }
+
+
+def _list_film_index(s3) -> Dict[int, str]:
+    """db_id -> ETag of every object under FILM_LISTS_INDEX_PREFIX."""
+    found: Dict[int, str] = {}
+    paginator = s3.get_paginator("list_objects_v2")
+    with metrics.span("s3_list"):
+        for page in paginator.paginate(Bucket=S3_BUCKET, Prefix=f"{FILM_LISTS_INDEX_PREFIX}/"):
+            metrics.add("s3_lists")
+            for obj in page.get("Contents", []):
+                name = obj["Key"].rsplit("/", 1)[-1]
+                if name.endswith(".json") and name[:-5].isdigit():
+                    found[int(name[:-5])] = obj.get("ETag", "")
+    return found
+
+
+def write_film_index(s3, index: Dict[int, FilmListsIndexEntry]) -> Dict[str, int]:
+    """Make the stored index match ``index``, writing only entries whose bytes differ.
+
+    Objects for films missing from ``index`` are deleted. Unconditional:
+    an incremental update landing mid-rebuild can be overwritten, which
+    the next rebuild (or the next edit of that film's lists) repairs.
+    """
+    existing = _list_film_index(s3)
+    changed = [
+        entry for db_id, entry in index.items()
+        if existing.get(db_id) != md5_etag(codec.dumps(entry))
+    ]
+    stale = [db_id for db_id in existing if db_id not in index]
+
+    written = run_concurrently(
+        lambda entry: upload_dict_to_s3(s3, S3_BUCKET, film_index_key(entry["db_id"]), entry), changed
+    )
+    deleted = run_concurrently(
+        lambda db_id: s3.delete_object(Bucket=S3_BUCKET, Key=film_index_key(db_id)), stale
+    )
+
+    errors = 0
+    for outcome in written + deleted:
+        if outcome.error is not None:
+            errors += 1
+            logger.warning("film index write failed: %s", outcome.error)
+
+    return {
+        "films_indexed": len(index),
+        "written": sum(1 for o in written if o.error is None),
+        "unchanged": len(index) - len(changed),
+        "deleted": sum(1 for o in deleted if o.error is None),
+        "errors": errors,
+    }
@@ -0,0 +1,156 @@
+"""
+Typo-tolerant, ranked film search over a FilmCatalogue for search_films.
+
+Every film contributes one entry per name it can be found by: its title,
+each original title the cinemas listed it under and each director. Names
+are normalised (case, accents, punctuation) and split into trigrams with
+the words space-padded, so word starts count and two-letter queries work.
+An entry matches when it holds at least FILM_SEARCH_MIN_MATCH of the
+query's trigrams, which a misspelt or partial title still does. Matches
+rank by that share, then by overall similarity so a name close in length
+to the query beats a long one that merely contains it.
+
+Candidates come from the query's rarest trigrams only: an entry holding
+``needed`` of ``n`` query trigrams must hold one of the ``n - needed + 1``
+rarest. Posting lists are read rarest first, and once ``limit`` films are
+scored ``needed`` rises to what could still beat the worst of them (a score
+never exceeds the share of query trigrams held), so even a query every film
+matches reads a few short posting lists instead of scoring every film.
+
+Built once per catalogue version (so once per pan listings version) and
+kept for the life of the container, like core.film_index.
+"""
+
+import heapq
+import math
+import re
+import threading
+import unicodedata
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from core import metrics
+from core.film_index import trigrams
+from core.types.custom_lists import FilmCatalogue, FilmSearchResult
+from config import FILM_SEARCH_MIN_MATCH, FILM_SEARCH_DIRECTOR_WEIGHT
+
+FIELD_WEIGHTS = {"title": 1.0, "original_title": 1.0, "director": FILM_SEARCH_DIRECTOR_WEIGHT}
+
+# Share of the score from how much of the query matched, the rest from
+# how similar the whole name is
+CONTAINMENT_WEIGHT = 0.8
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def normalise(text: str) -> str:
+    """Casefolded, accents removed, punctuation as single spaces: "Yasujirō Ozu" -> "yasujiro ozu"."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(_NON_WORD.sub(" ", stripped).split())
+
+
+def query_trigrams(query: str) -> FrozenSet[str]:
+    """Trigrams of a normalised query; the last word is not closed, so it may be partly typed."""
+    return frozenset(trigrams(f" {query}"))
+
+
+class FilmSearchIndex:
+    """Trigram posting lists over every searchable name in a catalogue."""
+
+    def __init__(self, catalogue: FilmCatalogue):
+        self.version: Tuple[Optional[str], str] = (catalogue["source_etag"], catalogue["built_at"])
+        self.films = catalogue["films"]
+        original_titles = catalogue.get("original_titles", {})
+
+        # One entry per (film, distinct normalised name)
+        self.entry_film: List[str] = []
+        self.entry_field: List[str] = []
+        self.entry_grams: List[FrozenSet[str]] = []
+        self.postings: Dict[str, List[int]] = {}
+
+        for db_id, film in self.films.items():
+            names = [("title", film["title"])]
+            names += [("original_title", t) for t in original_titles.get(db_id, [])]
+            names += [("director", d) for d in film["directors"]]
+            seen = set()
+            for field, name in names:
+                norm = normalise(name)
+                if not norm or norm in seen:
+                    continue
+                seen.add(norm)
+                grams = frozenset(trigrams(f" {norm} "))
+                entry = len(self.entry_film)
+                self.entry_film.append(db_id)
+                self.entry_field.append(field)
+                self.entry_grams.append(grams)
+                for gram in grams:
+                    self.postings.setdefault(gram, []).append(entry)
+
+    def search(self, query: str, limit: int) -> List[FilmSearchResult]:
+        """The ``limit`` best-matching films, best first (ties by title, then db_id)."""
+        grams = query_trigrams(normalise(query))
+        if not grams:
+            return []
+        needed = max(1, math.ceil(FILM_SEARCH_MIN_MATCH * len(grams)))
+
+        by_rarity = sorted(grams, key=lambda g: len(self.postings.get(g, ())))
+        best: Dict[str, Tuple[float, str]] = {}
+        seen = set()
+        read = 0
+        while read < len(grams) - needed + 1:
+            for entry in self.postings.get(by_rarity[read], ()):
+                if entry in seen:
+                    continue
+                seen.add(entry)
+                entry_grams = self.entry_grams[entry]
+                common = len(grams & entry_grams)
+                if common < needed:
+                    continue
+                containment = common / len(grams)
+                similarity = common / (len(grams) + len(entry_grams) - common)
+                field = self.entry_field[entry]
+                score = FIELD_WEIGHTS[field] * (
+                    CONTAINMENT_WEIGHT * containment + (1 - CONTAINMENT_WEIGHT) * similarity
+                )
+                db_id = self.entry_film[entry]
+                if db_id not in best or score > best[db_id][0]:
+                    best[db_id] = (score, field)
+            read += 1
+            if len(best) >= limit:
+                worst_kept = heapq.nlargest(limit, (score for score, _ in best.values()))[-1]
+                # Entries holding fewer trigrams score strictly below it
+                needed = max(needed, math.ceil(worst_kept * len(grams) - 1e-9))
+
+        top = heapq.nsmallest(
+            limit, best.items(), key=lambda item: (-item[1][0], self.films[item[0]]["title"].casefold(), item[0])
+        )
+        return [
+            FilmSearchResult(
+                db_id=db_id,
+                title=self.films[db_id]["title"],
+                year=self.films[db_id]["year"],
+                directors=self.films[db_id]["directors"],
+                matched=field,
+                score=round(score, 3),
+            )
+            for db_id, (score, field) in top
+        ]
+
+
+_index: Optional[FilmSearchIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_film_search_index(catalogue: FilmCatalogue) -> FilmSearchIndex:
+    """Return the search index for ``catalogue``, building it only when the version changes."""
+    global _index
+
+    version = (catalogue["source_etag"], catalogue["built_at"])
+    index = _index
+    if index is not None and index.version == version:
+        return index
+    with _index_lock:
+        if _index is None or _index.version != version:
+            with metrics.span("search_index_build"):
+                _index = FilmSearchIndex(catalogue)
+        return _index
@@ -0,0 +1,96 @@
+"""
+Helpers for ListFilm entries in both storage forms.
+
+Embedded films carry a full copy of their cinema_listings; normalized films
+(ListFilmRef) keep only db_id, caption and a hash of the listing snapshot and
+are hydrated from pan_cinema_listings.json at read time.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, Optional, Union, cast
+
+from core.types.custom_lists import CuratorFilmLists, ListFilm, ListFilmRef
+from core.types.film_listings import CleanMatchedFilmsCinemaListings, PanCinemaCleanedCompactedListings
+from config import FILM_LISTS_STORAGE_MODE
+
+STORAGE_MODES = ("embedded", "normalized")
+
+if FILM_LISTS_STORAGE_MODE not in STORAGE_MODES:
+    raise ValueError(
+        f"Invalid FILM_LISTS_STORAGE_MODE '{FILM_LISTS_STORAGE_MODE}', expected one of: {', '.join(STORAGE_MODES)}"
+    )
+
+
+def listing_hash(cinema_listings: CleanMatchedFilmsCinemaListings) -> str:
+    """Stable content hash of a film's cinema_listings (key order independent)."""
+    canonical = json.dumps(cinema_listings, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def make_list_film(
+    db_id: int,
+    cinema_listings: CleanMatchedFilmsCinemaListings,
+    caption: str = "",
+    mode: str = FILM_LISTS_STORAGE_MODE,
+) -> Union[ListFilm, ListFilmRef]:
+    """Build a new list entry in the configured storage form."""
+    if mode == "normalized":
+        return ListFilmRef(db_id=db_id, list_film_caption=caption, listing_hash=listing_hash(cinema_listings))
+    return cast(ListFilm, {
+        "db_id": db_id,
+        "cinema_listings": cinema_listings,
+        "list_film_caption": caption,
+        # Lets refresh_lists detect a stale snapshot without re-hashing it
+        "listing_hash": listing_hash(cinema_listings),
+    })
+
+
+def is_hydrated(film: Dict[str, Any]) -> bool:
+    return "cinema_listings" in film
+
+
+def prepare_film_lists_for_storage(
+    film_lists: CuratorFilmLists, mode: str = FILM_LISTS_STORAGE_MODE
+) -> CuratorFilmLists:
+    """Convert embedded films to ListFilmRef in place when storing normalized.
+
+    In embedded mode the lists are returned untouched, so files that already
+    contain refs stay as they are.
+    """
+    if mode != "normalized":
+        return film_lists
+    for custom_list in film_lists:
+        custom_list["list_films"] = [
+            _to_ref(film) if is_hydrated(film) else film
+            for film in custom_list["list_films"]
+        ]
+    return film_lists
+
+
+def _to_ref(film: ListFilm) -> ListFilmRef:
+    return ListFilmRef(
+        db_id=film["db_id"],
+        list_film_caption=film.get("list_film_caption", ""),
+        listing_hash=film.get("listing_hash") or listing_hash(film["cinema_listings"]),
+    )
+
+
+def needs_hydration(film_lists: CuratorFilmLists) -> bool:
+    return any(not is_hydrated(film) for fl in film_lists for film in fl["list_films"])
+
+
+def hydrate_film_lists(
+    film_lists: CuratorFilmLists, pan_listings: PanCinemaCleanedCompactedListings
+) -> CuratorFilmLists:
+    """Fill in cinema_listings for normalized films from the current pan listings.
+
+    Films no longer present upstream get an empty cinema_listings map.
+    The pan listings objects are shared, not copied.
+    """
+    for custom_list in film_lists:
+        for film in custom_list["list_films"]:
+            if not is_hydrated(film):
+                current: Optional[CleanMatchedFilmsCinemaListings] = pan_listings.get(str(film["db_id"]))
+                film["cinema_listings"] = current if current is not None else {}
+    return film_lists
@@ -0,0 +1,99 @@
+"""
+Response views for a curator's lists.
+
+get_custom_lists returns one of:
+
+    "full"      every CustomList exactly as stored, films hydrated with
+                their cinema_listings (the default)
+    "summary"   CustomListSummary: list metadata, film_count and each film's
+                db_id, title and caption, without any cinema_listings
+
+``fields`` narrows either view to some of its list-level keys, e.g.
+``["list_name", "film_count"]``. Summaries that leave out "films" can be
+answered from list metadata alone (the manifest in the sharded layout).
+"""
+
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from core.list_films import is_hydrated
+from core.types.custom_lists import (
+    AvailableFilmSummary,
+    CustomList,
+    CustomListMetadata,
+    CustomListSummary,
+    ListFilmSummary,
+)
+from core.types.film_listings import CleanMatchedFilmsCinemaListings
+
+# List-level keys each view can return, in response order
+VIEW_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "full": ("list_curator", "list_name", "list_caption", "start_date", "end_date", "list_films"),
+    "summary": ("list_curator", "list_name", "list_caption", "start_date", "end_date", "film_count", "films"),
+}
+
+# The key holding each view's per-film entries
+FILMS_FIELD = {"full": "list_films", "summary": "films"}
+
+
+def parse_view(event: Dict[str, Any]) -> Tuple[str, List[str]]:
+    """Return the requested (view, fields), defaulting to every field of the "full" view."""
+    view = event.get("view") or "full"
+    if view not in VIEW_FIELDS:
+        raise ValueError(f"Invalid view '{view}', expected one of: {', '.join(VIEW_FIELDS)}")
+
+    fields = event.get("fields")
+    if fields is None:
+        return view, list(VIEW_FIELDS[view])
+    if not isinstance(fields, list) or not fields or not all(isinstance(f, str) for f in fields):
+        raise ValueError("fields must be a non-empty list of field names")
+    unknown = [f for f in fields if f not in VIEW_FIELDS[view]]
+    if unknown:
+        raise ValueError(
+            f"Unknown field(s) for view '{view}': {', '.join(unknown)}; "
+            f"expected any of: {', '.join(VIEW_FIELDS[view])}"
+        )
+    # Response order follows VIEW_FIELDS, not the request
+    return view, [f for f in VIEW_FIELDS[view] if f in fields]
+
+
+def film_title(cinema_listings: CleanMatchedFilmsCinemaListings) -> Optional[str]:
+    """First title found in the film's per-cinema _additional_info."""
+    for listing in cinema_listings.values():
+        title = listing.get("_additional_info", {}).get("title")
+        if title:
+            return title
+    return None
+
+
+def list_metadata(custom_list: CustomList) -> CustomListMetadata:
+    return CustomListMetadata(
+        list_curator=custom_list["list_curator"],
+        list_name=custom_list["list_name"],
+        list_caption=custom_list["list_caption"],
+        start_date=custom_list["start_date"],
+        end_date=custom_list["end_date"],
+        film_count=len(custom_list["list_films"]),
+    )
+
+
+def summarise_custom_list(
+    custom_list: CustomList, catalogue_films: Mapping[str, AvailableFilmSummary]
+) -> CustomListSummary:
+    """Summarise one list; normalized films take their title from ``catalogue_films``."""
+    films: List[ListFilmSummary] = []
+    for film in custom_list["list_films"]:
+        if is_hydrated(film):
+            title = film_title(film["cinema_listings"])
+        else:
+            title = catalogue_films.get(str(film["db_id"]), {}).get("title")
+        films.append(ListFilmSummary(
+            db_id=film["db_id"],
+            title=title,
+            list_film_caption=film.get("list_film_caption", ""),
+        ))
+    return CustomListSummary(**list_metadata(custom_list), films=films)
+
+
+def project_fields(items: Sequence[Mapping[str, Any]], fields: Sequence[str]) -> List[Dict[str, Any]]:
+    """Keep only ``fields`` of each item (skipping any an item lacks)."""
+    return [{f: item[f] for f in fields if f in item} for item in items]
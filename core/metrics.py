@@ -0,0 +1,147 @@
+"""
+Per-invocation phase timings and counters, emitted as one structured log line.
+
+entrypoint.handler opens an invocation, code along the request path records
+into it, and the entrypoint prints a single CloudWatch Embedded Metric Format
+(EMF) JSON line when the invocation ends:
+
+    with metrics.span("s3_get"):        # adds to s3_get_ms
+        ...
+    metrics.add("s3_bytes_read", n)     # adds to a counter
+
+Spans with the same name accumulate, and spans in worker threads (e.g.
+get_custom_lists_bulk) add to the same total, so a phase can exceed the
+invocation's wall time. Outside an invocation, or with METRICS_ENABLED off,
+span() returns a shared no-op context and add() returns immediately.
+
+Lambda runs one invocation per container at a time, so the open invocation
+is process-wide rather than per thread.
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, ContextManager, Dict, Iterator, Optional
+
+from config import METRICS_ENABLED, METRICS_NAMESPACE
+
+_NOOP = nullcontext()
+
+_lock = threading.Lock()
+_current: Optional["Invocation"] = None
+_invocation_count = 0
+
+
+class Invocation:
+    def __init__(self, handler_name: str, cold_start: bool):
+        self.handler_name = handler_name
+        self.cold_start = cold_start
+        self.started = time.perf_counter()
+        self.phase_seconds: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+        self.properties: Dict[str, Any] = {}
+
+
+def start_invocation(handler_name: str) -> None:
+    """Open a fresh invocation; the first one in this process is the cold start."""
+    global _current, _invocation_count
+    if not METRICS_ENABLED:
+        return
+    with _lock:
+        _invocation_count += 1
+        _current = Invocation(handler_name, cold_start=_invocation_count == 1)
+
+
+def set_handler(handler_name: str) -> None:
+    """Name the handler once the payload has been parsed."""
+    invocation = _current
+    if invocation is not None:
+        invocation.handler_name = handler_name
+
+
+def _record_phase(invocation: Invocation, phase: str, seconds: float) -> None:
+    with _lock:
+        invocation.phase_seconds[phase] = invocation.phase_seconds.get(phase, 0.0) + seconds
+
+
+@contextmanager
+def _timed(invocation: Invocation, phase: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record_phase(invocation, phase, time.perf_counter() - start)
+
+
+def span(phase: str) -> ContextManager[None]:
+    """Time the enclosed block into ``<phase>_ms`` of the open invocation."""
+    invocation = _current
+    if invocation is None:
+        return _NOOP
+    return _timed(invocation, phase)
+
+
+def record_phase(phase: str, seconds: float) -> None:
+    """Add an already measured duration to ``<phase>_ms``."""
+    invocation = _current
+    if invocation is not None:
+        _record_phase(invocation, phase, seconds)
+
+
+def add(counter: str, value: int = 1) -> None:
+    invocation = _current
+    if invocation is None:
+        return
+    with _lock:
+        invocation.counters[counter] = invocation.counters.get(counter, 0) + value
+
+
+def set_property(name: str, value: Any) -> None:
+    """Attach a non-metric field (e.g. the error type) to the log line."""
+    invocation = _current
+    if invocation is not None:
+        invocation.properties[name] = value
+
+
+def _unit(name: str) -> str:
+    if name.endswith("_ms"):
+        return "Milliseconds"
+    if name.endswith("_bytes"):
+        return "Bytes"
+    return "Count"
+
+
+def finish_invocation() -> Optional[Dict[str, Any]]:
+    """Close the open invocation and return its EMF record (None when not recording)."""
+    global _current
+    with _lock:
+        invocation, _current = _current, None
+    if invocation is None:
+        return None
+
+    values: Dict[str, Any] = {"duration_ms": round((time.perf_counter() - invocation.started) * 1000, 3)}
+    for phase, seconds in sorted(invocation.phase_seconds.items()):
+        values[f"{phase}_ms"] = round(seconds * 1000, 3)
+    values.update(sorted(invocation.counters.items()))
+
+    return {
+        "_aws": {
+            "Timestamp": int(time.time() * 1000),
+            "CloudWatchMetrics": [{
+                "Namespace": METRICS_NAMESPACE,
+                "Dimensions": [["handler"]],
+                "Metrics": [{"Name": name, "Unit": _unit(name)} for name in values],
+            }],
+        },
+        "handler": invocation.handler_name,
+        "cold_start": invocation.cold_start,
+        **invocation.properties,
+        **values,
+    }
+
+
+def emit(record: Optional[Dict[str, Any]]) -> None:
+    """Print the record as one raw JSON line on stdout, where CloudWatch picks up EMF."""
+    if record is not None:
+        print(json.dumps(record, separators=(",", ":"), default=str), flush=True)
@@ -1,17 +1,56 @@
-from typing import Any
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, Optional, Tuple
+import codecs
 import json
+import logging
 import os
+import random
+import re
 import subprocess
+import threading
+import time
 
-import boto3
-from botocore.exceptions import (
-    UnauthorizedSSOTokenError,
-    TokenRetrievalError,
-    SSOTokenLoadError,
+# boto3/botocore are imported inside the functions that need them so that
+# importing this module (and every handler) stays cheap on cold start.
+if TYPE_CHECKING:
+    import boto3
+    from botocore.config import Config
+
+from core import codec, metrics
+from config import (
+    AWS_REGION,
+    S3_MAX_POOL_CONNECTIONS,
+    S3_CONNECT_TIMEOUT_SECONDS,
+    S3_READ_TIMEOUT_SECONDS,
+    S3_RETRY_MODE,
+    S3_RETRY_MAX_ATTEMPTS,
+    S3_JSON_CACHE_MAX_ENTRIES,
+    S3_JSON_CACHE_MAX_BYTES,
+    S3_JSON_CACHE_PARSED_SIZE_RATIO,
+    S3_STREAM_CHUNK_BYTES,
+    STORAGE_BACKEND,
+    STORAGE_DIRECTORY,
+    CURATOR_WRITE_MAX_ATTEMPTS,
 )
 
+logger = logging.getLogger(__name__)
+
+# Shared S3 client, created once per container by get_s3_client()
+_s3_client = None
+_s3_client_lock = threading.Lock()
+
+# Parsed JSON documents kept across warm invocations, most recently used last.
+# (bucket, key) -> (etag, estimated parsed size in bytes, parsed object, user metadata)
+_json_cache: "OrderedDict[Tuple[str, str], Tuple[str, int, Any, Dict[str, str]]]" = OrderedDict()
+_json_cache_bytes = 0
+_json_cache_lock = threading.Lock()
+_json_cache_stats = {"hits": 0, "misses": 0, "revalidations": 0, "evictions": 0}
+
+
+def get_aws_session(region: str = AWS_REGION) -> "boto3.Session":
+    import boto3
+    from botocore.exceptions import UnauthorizedSSOTokenError, TokenRetrievalError, SSOTokenLoadError
 
-def get_aws_session(region: str = "eu-north-1") -> boto3.Session:
     running_in_github = os.getenv("GITHUB_ACTIONS") == "true"
 
     if running_in_github:
@@ -19,6 +58,9 @@ def get_aws_session(region: str = "eu-north-1") -> boto3.Session:
         return boto3.Session(region_name=region)
     else:
         session = boto3.Session(profile_name="ronantfs", region_name=region)
+        if _has_valid_credentials(session):
+            print("Using local AWS SSO profile: ronantfs")
+            return session
         try:
             session.client("sts").get_caller_identity()
         except (UnauthorizedSSOTokenError, TokenRetrievalError, SSOTokenLoadError, Exception) as e:
@@ -32,7 +74,49 @@ def get_aws_session(region: str = "eu-north-1") -> boto3.Session:
         return session
 
 
-def get_s3_client():
+def _has_valid_credentials(session: "boto3.Session") -> bool:
+    """Resolve credentials locally, without the STS round trip.
+
+    An expired SSO token surfaces here as a token error, in which case the
+    caller falls back to probing STS and triggering ``aws sso login``.
+    """
+    try:
+        credentials = session.get_credentials()
+        return credentials is not None and credentials.get_frozen_credentials().access_key is not None
+    except Exception:
+        return False
+
+
+def get_s3_client_config() -> "Config":
+    """Tuned botocore config shared by every S3 client this process creates."""
+    from botocore.config import Config
+
+    return Config(
+        region_name=AWS_REGION,
+        max_pool_connections=S3_MAX_POOL_CONNECTIONS,
+        connect_timeout=S3_CONNECT_TIMEOUT_SECONDS,
+        read_timeout=S3_READ_TIMEOUT_SECONDS,
+        retries={"mode": S3_RETRY_MODE, "max_attempts": S3_RETRY_MAX_ATTEMPTS},
+        tcp_keepalive=True,
+    )
+
+
+def get_storage_backend() -> str:
+    """The configured backend name; KL_STORAGE_BACKEND overrides config.STORAGE_BACKEND."""
+    return os.getenv("KL_STORAGE_BACKEND") or STORAGE_BACKEND
+
+
+def _create_s3_client():
+    backend = get_storage_backend()
+    if backend != "s3":
+        from core.storage import create_local_storage
+
+        directory = os.getenv("KL_STORAGE_DIRECTORY") or STORAGE_DIRECTORY
+        print(f"Using local storage backend '{backend}'")
+        return create_local_storage(backend, directory)
+
+    import boto3
+
     running_in_aws = os.getenv("AWS_EXECUTION_ENV") is not None  # set in Lambda
     running_in_github = os.getenv("GITHUB_ACTIONS") == "true"
 
@@ -42,23 +126,361 @@ def get_s3_client():
     else:
         session = get_aws_session()
 
-    return session.client("s3")
+    return session.client("s3", config=get_s3_client_config())
 
 
-def upload_dict_to_s3(s3_client, bucket: str, key: str, data: Any) -> None:
-    s3_client.put_object(
-        Bucket=bucket,
-        Key=key,
-        Body=json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8"),
-    )
+def get_s3_client():
+    """Return the process-wide S3 client, creating it on first use.
+
+    boto3 clients are thread-safe, so the one instance (and its pool of
+    keep-alive connections) is shared by every handler and worker thread
+    for the lifetime of the container. With a local storage backend
+    configured this is a core.storage object with the same interface.
+    """
+    global _s3_client
+
+    if _s3_client is None:
+        with _s3_client_lock:
+            if _s3_client is None:
+                _s3_client = _create_s3_client()
+    return _s3_client
 
 
-def download_json_from_s3(s3_client, bucket: str, key: str) -> Any:
+def reset_s3_client() -> None:
+    """Forget the shared client so the next call builds a fresh one."""
+    global _s3_client
+
+    with _s3_client_lock:
+        _s3_client = None
+
+
+class PreconditionFailedError(RuntimeError):
+    """A conditional write lost the race: the object changed (IfMatch) or already exists (IfNoneMatch)."""
+
+
+# Upper bound (seconds) of the first retry's random backoff; doubles per attempt
+RETRY_BACKOFF_SECONDS = 0.05
+
+
+def retry_on_conflict(key: str, attempt: int) -> None:
+    """Log a lost compare-and-swap on ``key`` and back off before the next attempt.
+
+    For read -> compare -> conditional PUT loops of up to
+    CURATOR_WRITE_MAX_ATTEMPTS; no sleep after the last attempt.
+    """
+    logger.warning("concurrent write to %s (attempt %d/%d), retrying", key, attempt, CURATOR_WRITE_MAX_ATTEMPTS)
+    if attempt < CURATOR_WRITE_MAX_ATTEMPTS:
+        time.sleep(random.uniform(0, RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1)))
+
+
+def upload_dict_to_s3(
+    s3_client,
+    bucket: str,
+    key: str,
+    data: Any,
+    if_match: Optional[str] = None,
+    if_none_match: Optional[str] = None,
+    metadata: Optional[Dict[str, str]] = None,
+) -> Optional[str]:
+    """Serialise ``data`` with the core codec and PUT it, returning the new ETag.
+
+    ``if_match`` makes the write a compare-and-swap against the ETag that was
+    read; ``if_none_match="*"`` only creates the object if it does not exist.
+    Either raises PreconditionFailedError when the condition does not hold.
+    ``metadata`` is stored as S3 user metadata (lower-case keys), written
+    atomically with the body.
+    """
+    from botocore.exceptions import ClientError
+
+    conditions = {}
+    if if_match is not None:
+        conditions["IfMatch"] = if_match
+    if if_none_match is not None:
+        conditions["IfNoneMatch"] = if_none_match
+    if metadata:
+        conditions["Metadata"] = metadata
+
+    body = codec.dumps(data)
     try:
-        obj = s3_client.get_object(Bucket=bucket, Key=key)
-        raw = obj["Body"].read().decode("utf-8")
-        return json.loads(raw)
+        with metrics.span("s3_put"):
+            response = s3_client.put_object(
+                Bucket=bucket,
+                Key=key,
+                Body=body,
+                ContentType="application/json",
+                **conditions,
+            )
+    except ClientError as e:
+        status = e.response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+        code = e.response.get("Error", {}).get("Code")
+        # 409 ConditionalRequestConflict: a concurrent conditional write is in flight
+        if status in (409, 412) or code in ("PreconditionFailed", "ConditionalRequestConflict"):
+            raise PreconditionFailedError(f"Conditional write to {key} failed: {code}")
+        raise
+    metrics.add("s3_puts")
+    metrics.add("s3_written_bytes", len(body))
+    return response.get("ETag")
+
+
+def download_json_from_s3(s3_client, bucket: str, key: str, cached: bool = False) -> Any:
+    """Download and parse a JSON object from S3.
+
+    With ``cached=True`` the parsed object is kept in a process-wide LRU
+    cache and later calls revalidate it with a conditional GET, only
+    re-downloading and re-parsing when the object's ETag has changed.
+    Cached objects are shared between callers and must not be mutated.
+    """
+    data, _ = download_json_with_etag_from_s3(s3_client, bucket, key, cached=cached)
+    return data
+
+
+def download_json_with_etag_from_s3(
+    s3_client, bucket: str, key: str, cached: bool = False
+) -> Tuple[Any, Optional[str]]:
+    """Like download_json_from_s3, also returning the ETag of the version read."""
+    data, etag, _ = download_json_with_metadata_from_s3(s3_client, bucket, key, cached=cached)
+    return data, etag
+
+
+def download_json_with_metadata_from_s3(
+    s3_client, bucket: str, key: str, cached: bool = False
+) -> Tuple[Any, Optional[str], Dict[str, str]]:
+    """Like download_json_with_etag_from_s3, also returning the object's user metadata."""
+    try:
+        if cached:
+            return _download_json_cached(s3_client, bucket, key)
+        with metrics.span("s3_get"):
+            obj = s3_client.get_object(Bucket=bucket, Key=key)
+            body = obj["Body"].read()
+        metrics.add("s3_gets")
+        metrics.add("s3_read_bytes", len(body))
+        return codec.loads(body), obj.get("ETag"), obj.get("Metadata") or {}
     except s3_client.exceptions.NoSuchKey:
         raise FileNotFoundError(f"S3 key not found: {key}")
     except Exception as e:
         raise RuntimeError(f"Failed to download {key}: {e}")
+
+
+def stream_json_items_from_s3(
+    s3_client, bucket: str, key: str, chunk_size: int = S3_STREAM_CHUNK_BYTES
+) -> Tuple[Iterator[Tuple[str, Any]], Optional[str]]:
+    """Stream the top-level ``(key, value)`` pairs of a JSON object from S3.
+
+    Unlike download_json_from_s3 the body is never held whole: it is read
+    ``chunk_size`` bytes at a time and each member is parsed as soon as it
+    is complete, so peak memory is one chunk plus the largest single value.
+    The GET is issued immediately (a missing key raises FileNotFoundError
+    here); the returned iterator must be consumed before the body times out.
+    """
+    try:
+        with metrics.span("s3_get"):
+            obj = s3_client.get_object(Bucket=bucket, Key=key)
+    except s3_client.exceptions.NoSuchKey:
+        raise FileNotFoundError(f"S3 key not found: {key}")
+    except Exception as e:
+        raise RuntimeError(f"Failed to download {key}: {e}")
+    metrics.add("s3_gets")
+
+    body = obj["Body"]
+
+    def read_chunk() -> bytes:
+        # Chunk reads interleave with parsing, so they are timed separately
+        with metrics.span("s3_stream_read"):
+            chunk = body.read(chunk_size)
+        metrics.add("s3_read_bytes", len(chunk))
+        return chunk
+
+    def items() -> Iterator[Tuple[str, Any]]:
+        try:
+            yield from iter_json_object_items(iter(read_chunk, b""))
+        except ValueError as e:
+            raise RuntimeError(f"Failed to parse {key}: {e}")
+        finally:
+            body.close()
+
+    return items(), obj.get("ETag")
+
+
+_json_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+_NUMBER_TAIL = re.compile(r"[0-9.eE+-]*")
+
+
+def iter_json_object_items(chunks: Iterable[bytes]) -> Iterator[Tuple[str, Any]]:
+    """Incrementally parse a JSON object from UTF-8 byte chunks.
+
+    Yields each top-level ``(key, value)`` pair as soon as its value is
+    complete, keeping only the unparsed tail of the input buffered. Raises
+    ValueError if the input is not a single well-formed JSON object.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    chunk_iter = iter(chunks)
+    buffer = ""
+    pos = 0
+    consumed = 0  # characters dropped from the front of buffer, for error offsets
+    eof = False
+
+    def fill() -> bool:
+        nonlocal buffer, pos, consumed, eof
+        if eof:
+            return False
+        chunk = next(chunk_iter, None)
+        text = decoder.decode(chunk or b"", final=chunk is None)
+        eof = chunk is None
+        consumed += pos
+        buffer = buffer[pos:] + text
+        pos = 0
+        return True
+
+    def skip_whitespace() -> str:
+        """Advance past whitespace and return the next character ("" at EOF)."""
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buffer):
+                return buffer[pos]
+            if not fill():
+                return ""
+
+    def expect(char: str) -> None:
+        nonlocal pos
+        found = skip_whitespace()
+        if found != char:
+            raise ValueError(f"Expected '{char}' at offset {consumed + pos}, found {found or 'end of input'!r}")
+        pos += 1
+
+    def decode_value() -> Any:
+        nonlocal pos
+        skip_whitespace()
+        while True:
+            try:
+                value, end = _json_decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if not fill():
+                    raise
+                continue
+            # A number may continue in the next chunk ("1" of "1.5", "2e" of
+            # "2e3"), so it is only complete once a non-number character follows
+            if _NUMBER_TAIL.fullmatch(buffer, end) and fill():
+                continue
+            pos = end
+            return value
+
+    expect("{")
+    if skip_whitespace() == "}":
+        pos += 1
+    else:
+        while True:
+            if skip_whitespace() != '"':
+                raise ValueError(f"Expected object key at offset {consumed + pos}")
+            key = decode_value()
+            expect(":")
+            yield key, decode_value()
+            separator = skip_whitespace()
+            if separator not in (",", "}"):
+                raise ValueError(
+                    f"Expected ',' or '}}' at offset {consumed + pos}, found {separator or 'end of input'!r}"
+                )
+            pos += 1
+            if separator == "}":
+                break
+
+    if skip_whitespace():
+        raise ValueError(f"Unexpected data after JSON object at offset {consumed + pos}")
+
+
+def _is_not_modified(error: Exception) -> bool:
+    status = error.response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+    code = error.response.get("Error", {}).get("Code")
+    return status == 304 or code in ("304", "NotModified")
+
+
+def _download_json_cached(s3_client, bucket: str, key: str) -> Tuple[Any, Optional[str], Dict[str, str]]:
+    global _json_cache_bytes
+
+    from botocore.exceptions import ClientError
+
+    cache_key = (bucket, key)
+    with _json_cache_lock:
+        entry = _json_cache.get(cache_key)
+        if entry is not None:
+            _json_cache_stats["revalidations"] += 1
+
+    if entry is not None:
+        try:
+            with metrics.span("s3_get"):
+                obj = s3_client.get_object(Bucket=bucket, Key=key, IfNoneMatch=entry[0])
+        except ClientError as e:
+            if not _is_not_modified(e):
+                raise
+            metrics.add("s3_not_modified")
+            with _json_cache_lock:
+                _json_cache_stats["hits"] += 1
+                if cache_key in _json_cache:
+                    _json_cache.move_to_end(cache_key)
+            return entry[2], entry[0], entry[3]
+        with metrics.span("s3_get"):
+            body = obj["Body"].read()
+    else:
+        with metrics.span("s3_get"):
+            obj = s3_client.get_object(Bucket=bucket, Key=key)
+            body = obj["Body"].read()
+
+    metrics.add("s3_gets")
+    metrics.add("s3_read_bytes", len(body))
+    data = codec.loads(body)
+    etag = obj.get("ETag")
+    metadata = obj.get("Metadata") or {}
+
+    with _json_cache_lock:
+        _json_cache_stats["misses"] += 1
+        old = _json_cache.pop(cache_key, None)
+        if old is not None:
+            _json_cache_bytes -= old[1]
+        size = len(body) * S3_JSON_CACHE_PARSED_SIZE_RATIO
+        if etag and size <= S3_JSON_CACHE_MAX_BYTES:
+            _json_cache[cache_key] = (etag, size, data, metadata)
+            _json_cache_bytes += size
+            while len(_json_cache) > S3_JSON_CACHE_MAX_ENTRIES or _json_cache_bytes > S3_JSON_CACHE_MAX_BYTES:
+                _, evicted = _json_cache.popitem(last=False)
+                _json_cache_bytes -= evicted[1]
+                _json_cache_stats["evictions"] += 1
+
+    return data, etag, metadata
+
+
+def get_s3_object_etag(s3_client, bucket: str, key: str) -> Optional[str]:
+    """Return the current ETag of an object via HEAD, or None if it does not exist."""
+    from botocore.exceptions import ClientError
+
+    metrics.add("s3_heads")
+    try:
+        with metrics.span("s3_head"):
+            return s3_client.head_object(Bucket=bucket, Key=key).get("ETag")
+    except ClientError as e:
+        status = e.response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+        if status == 404 or e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+            return None
+        raise RuntimeError(f"Failed to head {key}: {e}")
+
+
+def get_json_cache_stats() -> Dict[str, int]:
+    """Return hit/miss/revalidation counters and the cache's estimated parsed size."""
+    with _json_cache_lock:
+        return {
+            **_json_cache_stats,
+            "entries": len(_json_cache),
+            "bytes": _json_cache_bytes,
+        }
+
+
+def clear_json_cache() -> None:
+    """Drop all cached JSON objects and reset the counters."""
+    global _json_cache_bytes
+
+    with _json_cache_lock:
+        _json_cache.clear()
+        _json_cache_bytes = 0
+        for name in _json_cache_stats:
+            _json_cache_stats[name] = 0
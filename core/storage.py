@@ -0,0 +1,389 @@
+"""
+Local storage backends that stand in for the S3 client.
+
+Every handler talks to storage through the client returned by
+core.s3.get_s3_client(), using the handful of S3 calls the service needs:
+get_object, head_object, put_object, delete_object, list_objects_v2 and its
+paginator. The classes here implement that same subset, with ETags, user
+metadata and the conditional headers the service relies on (IfMatch /
+IfNoneMatch on GET and PUT), raising the botocore ClientError shapes real
+S3 returns (304, 404, 412). Handlers and core run unmodified against them.
+
+    MemoryStorage      objects in a dict; starts empty (tests, load tests)
+    DirectoryStorage   objects as files under {root}/{bucket}/{key} (offline
+                       runs, benchmarks)
+
+STORAGE_BACKEND in config.py (or the KL_STORAGE_BACKEND environment
+variable) picks the backend get_s3_client() returns.
+
+With ``record_calls=True`` both record every call in ``calls`` as
+(operation, key), so request counts can be measured without a network; it
+is off by default so a long-lived backend does not grow without bound.
+Conditional writes are atomic within one process; DirectoryStorage does
+not guard against other processes writing the same directory.
+"""
+
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+from botocore.exceptions import ClientError
+
+from core.etag import md5_etag
+
+
+class NoSuchKey(ClientError):
+    pass
+
+
+def _error(status: int, code: str, operation: str, cls=ClientError) -> ClientError:
+    return cls(
+        {"Error": {"Code": code, "Message": code}, "ResponseMetadata": {"HTTPStatusCode": status}},
+        operation,
+    )
+
+
+class ObjectStore(ABC):
+    """The S3 client subset the service uses, over backend hooks.
+
+    Subclasses implement _load, _head, _store, _metadata, _remove and _list;
+    this class adds the conditional semantics, call recording and pagination.
+    """
+
+    class exceptions:
+        NoSuchKey = NoSuchKey
+
+    def __init__(self, record_calls: bool = False):
+        self.record_calls = record_calls
+        self.calls: List[Tuple[str, str]] = []
+        self._lock = threading.RLock()
+
+    # ── backend hooks ─────────────────────────────────────────────
+
+    @abstractmethod
+    def _load(self, bucket: str, key: str) -> Optional[Tuple[BinaryIO, int, str]]:
+        """(body stream, size, etag), or None if missing."""
+
+    @abstractmethod
+    def _head(self, bucket: str, key: str) -> Optional[Tuple[int, str]]:
+        """(size, etag), or None if missing."""
+
+    @abstractmethod
+    def _store(self, bucket: str, key: str, body: bytes, metadata: Dict[str, str]) -> str:
+        """Write the object and its user metadata, returning its ETag."""
+
+    @abstractmethod
+    def _metadata(self, bucket: str, key: str) -> Dict[str, str]:
+        """User metadata of an existing object."""
+
+    @abstractmethod
+    def _remove(self, bucket: str, key: str) -> None:
+        """Delete the object and its metadata; a missing object is not an error."""
+
+    @abstractmethod
+    def _list(self, bucket: str, prefix: str) -> Dict[str, Tuple[int, str]]:
+        """key -> (size, etag) for every key starting with ``prefix``."""
+
+    # ── helpers ───────────────────────────────────────────────────
+
+    def put_bytes(self, bucket: str, key: str, body: bytes, metadata: Optional[Dict[str, str]] = None) -> str:
+        """Write an object without recording a call (for seeding)."""
+        with self._lock:
+            return self._store(bucket, key, body, dict(metadata or {}))
+
+    def get_bytes(self, bucket: str, key: str) -> Optional[bytes]:
+        """Read an object without recording a call; None if missing."""
+        with self._lock:
+            loaded = self._load(bucket, key)
+        if loaded is None:
+            return None
+        with loaded[0] as body:
+            return body.read()
+
+    def _record(self, operation: str, key: str) -> None:
+        if self.record_calls:
+            self.calls.append((operation, key))
+
+    def count(self, operation: str, prefix: str = "") -> int:
+        """Calls recorded for ``operation`` on keys (or list prefixes) under ``prefix``."""
+        return sum(1 for op, key in self.calls if op == operation and key.startswith(prefix))
+
+    # ── S3 client API ─────────────────────────────────────────────
+
+    def get_object(self, Bucket: str, Key: str, IfMatch: Optional[str] = None, IfNoneMatch: Optional[str] = None, **_: Any):
+        with self._lock:
+            self._record("get_object", Key)
+            loaded = self._load(Bucket, Key)
+            metadata = self._metadata(Bucket, Key) if loaded is not None else {}
+        if loaded is None:
+            raise _error(404, "NoSuchKey", "GetObject", NoSuchKey)
+        body, size, etag = loaded
+        if IfMatch is not None and IfMatch != etag:
+            body.close()
+            raise _error(412, "PreconditionFailed", "GetObject")
+        if IfNoneMatch is not None and IfNoneMatch in (etag, "*"):
+            body.close()
+            raise _error(304, "304", "GetObject")
+        return {"Body": body, "ETag": etag, "ContentLength": size, "Metadata": metadata}
+
+    def head_object(self, Bucket: str, Key: str, **_: Any):
+        with self._lock:
+            self._record("head_object", Key)
+            head = self._head(Bucket, Key)
+            metadata = self._metadata(Bucket, Key) if head is not None else {}
+        if head is None:
+            raise _error(404, "404", "HeadObject")
+        return {"ETag": head[1], "ContentLength": head[0], "Metadata": metadata}
+
+    def put_object(
+        self,
+        Bucket: str,
+        Key: str,
+        Body: Any,
+        IfMatch: Optional[str] = None,
+        IfNoneMatch: Optional[str] = None,
+        Metadata: Optional[Dict[str, str]] = None,
+        **_: Any,
+    ):
+        if isinstance(Body, str):
+            Body = Body.encode("utf-8")
+        with self._lock:
+            self._record("put_object", Key)
+            current = self._head(Bucket, Key)
+            if IfNoneMatch == "*" and current is not None:
+                raise _error(412, "PreconditionFailed", "PutObject")
+            if IfMatch is not None:
+                if current is None:
+                    raise _error(404, "NoSuchKey", "PutObject", NoSuchKey)
+                if current[1] != IfMatch:
+                    raise _error(412, "PreconditionFailed", "PutObject")
+            # S3 lower-cases user metadata keys
+            etag = self._store(Bucket, Key, bytes(Body), {k.lower(): v for k, v in (Metadata or {}).items()})
+        return {"ETag": etag}
+
+    def delete_object(self, Bucket: str, Key: str, **_: Any):
+        with self._lock:
+            self._record("delete_object", Key)
+            self._remove(Bucket, Key)
+        return {}
+
+    def list_objects_v2(
+        self,
+        Bucket: str,
+        Prefix: str = "",
+        Delimiter: Optional[str] = None,
+        ContinuationToken: Optional[str] = None,
+        MaxKeys: int = 1000,
+        **_: Any,
+    ):
+        with self._lock:
+            self._record("list_objects_v2", Prefix)
+            snapshot = self._list(Bucket, Prefix)
+        keys = sorted(snapshot)
+
+        # S3 pages over keys and common prefixes together, in key order
+        entries: List[Tuple[str, bool]] = []
+        seen_prefixes = set()
+        for key in keys:
+            rest = key[len(Prefix):]
+            if Delimiter and Delimiter in rest:
+                common = Prefix + rest.split(Delimiter)[0] + Delimiter
+                if common not in seen_prefixes:
+                    seen_prefixes.add(common)
+                    entries.append((common, True))
+            else:
+                entries.append((key, False))
+
+        start = int(ContinuationToken) if ContinuationToken else 0
+        page = entries[start:start + MaxKeys]
+        response: Dict[str, Any] = {
+            "Contents": [
+                {"Key": k, "ETag": snapshot[k][1], "Size": snapshot[k][0]}
+                for k, is_prefix in page if not is_prefix
+            ],
+            "CommonPrefixes": [{"Prefix": k} for k, is_prefix in page if is_prefix],
+            "IsTruncated": start + MaxKeys < len(entries),
+            "KeyCount": len(page),
+        }
+        if response["IsTruncated"]:
+            response["NextContinuationToken"] = str(start + MaxKeys)
+        return response
+
+    def get_paginator(self, operation: str):
+        if operation != "list_objects_v2":
+            raise NotImplementedError(operation)
+        client = self
+
+        class _Paginator:
+            def paginate(self, **kwargs):
+                token = None
+                while True:
+                    page = client.list_objects_v2(ContinuationToken=token, **kwargs)
+                    yield page
+                    if not page["IsTruncated"]:
+                        break
+                    token = page["NextContinuationToken"]
+
+        return _Paginator()
+
+
+class MemoryStorage(ObjectStore):
+    """Objects held in ``objects``: (bucket, key) -> (body, etag); user metadata in ``metadata``."""
+
+    def __init__(self, record_calls: bool = False):
+        super().__init__(record_calls)
+        self.objects: Dict[Tuple[str, str], Tuple[bytes, str]] = {}
+        self.metadata: Dict[Tuple[str, str], Dict[str, str]] = {}
+
+    def _load(self, bucket, key):
+        entry = self.objects.get((bucket, key))
+        if entry is None:
+            return None
+        return io.BytesIO(entry[0]), len(entry[0]), entry[1]
+
+    def _head(self, bucket, key):
+        entry = self.objects.get((bucket, key))
+        return (len(entry[0]), entry[1]) if entry else None
+
+    def _store(self, bucket, key, body, metadata):
+        etag = md5_etag(body)
+        self.objects[(bucket, key)] = (body, etag)
+        self.metadata[(bucket, key)] = metadata
+        return etag
+
+    def _metadata(self, bucket, key):
+        return dict(self.metadata.get((bucket, key), {}))
+
+    def _remove(self, bucket, key):
+        self.objects.pop((bucket, key), None)
+        self.metadata.pop((bucket, key), None)
+
+    def _list(self, bucket, prefix):
+        return {
+            k: (len(body), etag)
+            for (b, k), (body, etag) in self.objects.items()
+            if b == bucket and k.startswith(prefix)
+        }
+
+
+class DirectoryStorage(ObjectStore):
+    """Objects stored as files at {root}/{bucket}/{key}.
+
+    Writes go to a temporary file renamed into place, so readers never see
+    a partial object. ETags are the MD5 of the file, remembered per
+    (mtime, size) so large files are not re-hashed on every HEAD. User
+    metadata is kept in a JSON file next to the object.
+    """
+
+    _TEMP_SUFFIX = ".part"
+    _METADATA_SUFFIX = ".s3meta"
+
+    def __init__(self, root: str, record_calls: bool = False):
+        super().__init__(record_calls)
+        self.root = os.path.abspath(root)
+        self._etags: Dict[str, Tuple[int, int, str]] = {}
+
+    def _path(self, bucket: str, key: str) -> str:
+        path = os.path.normpath(os.path.join(self.root, bucket, key))
+        if not path.startswith(os.path.join(self.root, bucket) + os.sep):
+            raise ValueError(f"Invalid object key '{key}'")
+        return path
+
+    def _stat_etag(self, path: str) -> Optional[Tuple[int, str]]:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        cached = self._etags.get(path)
+        if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+            return st.st_size, cached[2]
+        digest = hashlib.md5()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        etag = f'"{digest.hexdigest()}"'
+        self._etags[path] = (st.st_mtime_ns, st.st_size, etag)
+        return st.st_size, etag
+
+    def _load(self, bucket, key):
+        path = self._path(bucket, key)
+        head = self._stat_etag(path)
+        if head is None:
+            return None
+        return open(path, "rb"), head[0], head[1]
+
+    def _head(self, bucket, key):
+        return self._stat_etag(self._path(bucket, key))
+
+    def _write_atomic(self, path: str, body: bytes) -> None:
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=self._TEMP_SUFFIX)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(body)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def _store(self, bucket, key, body, metadata):
+        path = self._path(bucket, key)
+        if path.endswith(self._METADATA_SUFFIX):
+            raise ValueError(f"Invalid object key '{key}'")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if metadata:
+            self._write_atomic(path + self._METADATA_SUFFIX, json.dumps(metadata).encode("utf-8"))
+        elif os.path.exists(path + self._METADATA_SUFFIX):
+            os.remove(path + self._METADATA_SUFFIX)
+        self._write_atomic(path, body)
+        st = os.stat(path)
+        etag = md5_etag(body)
+        self._etags[path] = (st.st_mtime_ns, st.st_size, etag)
+        return etag
+
+    def _metadata(self, bucket, key):
+        try:
+            with open(self._path(bucket, key) + self._METADATA_SUFFIX, "rb") as f:
+                return json.loads(f.read())
+        except FileNotFoundError:
+            return {}
+
+    def _remove(self, bucket, key):
+        path = self._path(bucket, key)
+        self._etags.pop(path, None)
+        for target in (path, path + self._METADATA_SUFFIX):
+            try:
+                os.remove(target)
+            except FileNotFoundError:
+                pass
+
+    def _list(self, bucket, prefix):
+        bucket_dir = os.path.join(self.root, bucket)
+        found: Dict[str, Tuple[int, str]] = {}
+        for dirpath, _, filenames in os.walk(bucket_dir):
+            for name in filenames:
+                if name.endswith((self._TEMP_SUFFIX, self._METADATA_SUFFIX)):
+                    continue
+                path = os.path.join(dirpath, name)
+                key = os.path.relpath(path, bucket_dir).replace(os.sep, "/")
+                if key.startswith(prefix):
+                    head = self._stat_etag(path)
+                    if head is not None:
+                        found[key] = head
+        return found
+
+
+STORAGE_BACKENDS = ("s3", "memory", "directory")
+
+
+def create_local_storage(backend: str, directory: str) -> ObjectStore:
+    """Build a non-S3 backend by name ("memory" or "directory")."""
+    if backend == "memory":
+        return MemoryStorage()
+    if backend == "directory":
+        return DirectoryStorage(directory)
+    raise ValueError(f"Invalid storage backend '{backend}', expected one of: {', '.join(STORAGE_BACKENDS)}")
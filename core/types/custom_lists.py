@@ -2,7 +2,18 @@
 Types for the custom film lists managed by this service.
 
 S3 layout:
-  s3://filmfynder/london/filmLists/{curator}/filmLists.json
+  s3://filmfynder/london/filmLists/{curator}/filmLists.json        (FILM_LISTS_LAYOUT="single")
+  s3://filmfynder/london/filmLists/{curator}/manifest.json         (FILM_LISTS_LAYOUT="sharded")
+  s3://filmfynder/london/filmLists/{curator}/lists/{list_id}/{version}.json
+  s3://filmfynder/london/filmLists/{curator}/journal/{seq}.json    (FILM_LISTS_JOURNAL_ENABLED)
+  s3://filmfynder/london/filmListsDerived/films/{db_id}.json      (reverse index)
+  s3://filmfynder/london/filmListsDerived/active_lists.json       (ActiveListsFeed)
+
+In the sharded layout each list object holds one CustomList and the
+manifest is a CuratorListsManifest; see core/curator_shards.py. Journal
+objects are JournalEntry records folded over filmLists.json; see
+core/curator_journal.py. The reverse index holds one FilmListsIndexEntry
+per film; see core/film_lists_index.py.
 
 Each curator's filmLists.json is a JSON array of CustomList objects:
 
@@ -21,6 +32,8 @@ Full structure:
           {                                    # ListFilm
             "db_id": 6114,
             "list_film_caption": "A gothic masterpiece",
+            "listing_hash": "9f2c4e1a7b3d5c60",  # optional
+            # cinema_listings is omitted in normalized storage (ListFilmRef)
             "cinema_listings": {               # Dict[str, CleanedCompactListing]
               "prince_charles": {              # CleanedCompactListing
                 "description": "...",
@@ -68,7 +81,11 @@ from core.types.film_listings import CleanMatchedFilmsCinemaListings
 CUSTOM_LIST_REQUIRED_KEYS = {"list_curator", "list_name", "list_caption", "start_date", "end_date", "list_films"}
 
 
-class ListFilm(TypedDict):
+class _ListFilmOptional(TypedDict, total=False):
+    listing_hash: str     # hash of cinema_listings when the film was stored
+
+
+class ListFilm(_ListFilmOptional):
     """A single film in a custom list, keyed by db_id.
 
     cinema_listings maps cinema snake_case name (e.g. "prince_charles")
@@ -79,6 +96,18 @@ class ListFilm(TypedDict):
     list_film_caption: str
 
 
+class ListFilmRef(TypedDict):
+    """Normalized stored form of a ListFilm (FILM_LISTS_STORAGE_MODE="normalized").
+
+    cinema_listings is omitted and hydrated from pan_cinema_listings.json
+    when the list is read; listing_hash identifies the snapshot the film
+    was stored with.
+    """
+    db_id: int
+    list_film_caption: str
+    listing_hash: str
+
+
 class CustomList(TypedDict):
     """One curated list within a curator's filmLists.json."""
     list_curator: str
@@ -89,6 +118,28 @@ class CustomList(TypedDict):
     list_films: List[ListFilm]
 
 
+class CustomListMetadata(TypedDict):
+    """A CustomList without its films, as returned by get_custom_lists view="summary"."""
+    list_curator: str
+    list_name: str
+    list_caption: str
+    start_date: str   # YYYY-MM-DD
+    end_date: str     # YYYY-MM-DD
+    film_count: int
+
+
+class ListFilmSummary(TypedDict):
+    """A ListFilm reduced to what list screens show; title is None if unknown."""
+    db_id: int
+    title: Optional[str]
+    list_film_caption: str
+
+
+class CustomListSummary(CustomListMetadata):
+    """CustomListMetadata plus one ListFilmSummary per film, in list order."""
+    films: List[ListFilmSummary]
+
+
 class CinemaShowing(TypedDict):
     """A single date + showtimes pair, used in the get_available_films response."""
     date: str           # YYYY-MM-DD
@@ -111,6 +162,101 @@ class AvailableFilmSummary(TypedDict):
     cinema_showings: Dict[str, List[CinemaShowing]]
 
 
+class FilmCatalogue(TypedDict):
+    """Precomputed get_available_films payload, stored at FILM_CATALOGUE_KEY.
+
+    Built once per version of pan_cinema_listings.json; source_etag is the
+    ETag of the listings it was built from, used to detect staleness.
+    """
+    source_key: str
+    source_etag: Optional[str]
+    built_at: str       # ISO-8601 UTC
+    film_count: int
+    skipped_no_title: int
+    films: Dict[str, AvailableFilmSummary]
+    # db_id -> other titles cinemas listed the film under, for search_films
+    # only (not served by get_available_films); films without any are left
+    # out, and catalogues built before it existed have no such key
+    original_titles: Dict[str, List[str]]
+
+
+class FilmSearchResult(TypedDict):
+    """One ranked search_films match; matched says which field scored best."""
+    db_id: str
+    title: str
+    year: Optional[int]
+    directors: List[str]
+    matched: str   # "title", "original_title" or "director"
+    score: float   # 0-1, higher is closer
+
+
+class ListManifestEntry(TypedDict):
+    """One list's metadata in a curator's manifest.json (sharded layout).
+
+    list_id is stable across renames; version names the immutable object
+    lists/{list_id}/{version}.json holding the list's current contents.
+    """
+    list_id: str
+    version: str
+    list_name: str
+    list_caption: str
+    start_date: str   # YYYY-MM-DD
+    end_date: str     # YYYY-MM-DD
+    film_count: int
+
+
+class CuratorListsManifest(TypedDict):
+    """Root of a curator's manifest.json in the sharded layout, lists in display order."""
+    curator: str
+    lists: List[ListManifestEntry]
+
+
+class JournalEntry(TypedDict):
+    """One journal object: the changes a single update made to a curator's lists.
+
+    Each change is a dict with an "op" (put_list, delete_list,
+    set_list_fields, order_lists, set_film, set_film_fields, remove_film,
+    order_films, replace_all) and its arguments; see core/curator_journal.py.
+    """
+    curator: str
+    seq: int
+    written_at: str   # ISO-8601 UTC
+    changes: List[Dict[str, Any]]
+
+
+class CuratorStats(TypedDict):
+    """Per-curator summary kept in the curators registry."""
+    list_count: int
+    film_count: int
+    latest_end_date: Optional[str]   # YYYY-MM-DD, None without lists
+    updated_at: str                  # ISO-8601 UTC
+
+
+class CuratorsRegistry(TypedDict):
+    """Root of CURATORS_REGISTRY_KEY: every curator and their stats."""
+    built_at: str                    # ISO-8601 UTC of the last full rebuild
+    curators: Dict[str, CuratorStats]
+
+
+class FilmListRef(TypedDict):
+    """One curator list a film appears in."""
+    curator: str
+    list_name: str
+
+
+class FilmListsIndexEntry(TypedDict):
+    """One film's object under FILM_LISTS_INDEX_PREFIX, lists sorted by curator then name."""
+    db_id: int
+    lists: List[FilmListRef]
+
+
+class ActiveListsFeed(TypedDict):
+    """Root of ACTIVE_LISTS_FEED_KEY: lists not ended as of pruned_on, grouped by curator."""
+    built_at: str                    # ISO-8601 UTC of the last full rebuild
+    pruned_on: str                   # YYYY-MM-DD (UTC) ended lists were last dropped
+    lists: List[CustomListSummary]   # each curator's lists in their own order
+
+
 # The root type of each curator's filmLists.json file
 CuratorFilmLists = List[CustomList]
 
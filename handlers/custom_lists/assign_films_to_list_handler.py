@@ -3,95 +3,99 @@ Route 3: Assign films to a given custom list.
 
 Payload specifies curator, list_name, and db_ids of films to assign.
 Loads pan_cinema_listings.json to get full film data for each db_id,
-then stores that data (plus empty caption) in the list.
+then stores that data (plus empty caption) in the list. In normalized
+storage mode only the db_id and a hash of the listing are stored.
+
+The pan listings GET is started in the background before the curator's
+lists are read, so the two downloads overlap instead of running in turn.
 """
 
 import logging
-from typing import Dict, Any, List, cast
+from typing import Callable, Dict, Any, List
 
 from core.types.film_listings import PanCinemaCleanedCompactedListings
-from core.types.custom_lists import CuratorFilmLists, ListFilm, validate_curator_film_lists
-from core.s3 import get_s3_client, download_json_from_s3, upload_dict_to_s3
-from config import (
-    S3_BUCKET,
-    FILM_LISTS_BASE_PREFIX,
-    FILM_LISTS_FILENAME,
-    PAN_CINEMA_LISTINGS_KEY,
-)
+from core.types.custom_lists import CuratorFilmLists
+from core.list_films import make_list_film
+from core.concurrency import prefetch
+from core.curator_store import curator_lists_uri, find_custom_list, update_curator_film_lists
+from core.s3 import get_s3_client, download_json_from_s3
+from config import S3_BUCKET, PAN_CINEMA_LISTINGS_KEY
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
 
-def assign_films_to_list_handler(event: Dict[str, Any], context=None) -> Dict[str, Any]:
+def assign_films_to_list_mutation(
+    event: Dict[str, Any], load_pan_listings: Callable[[], PanCinemaCleanedCompactedListings]
+) -> Callable[[CuratorFilmLists], Dict[str, Any]]:
+    """Validate the payload and return the in-memory edit that assigns the films.
+
+    ``load_pan_listings`` is only called once the lists have been read, so
+    it can wait on a download started earlier (e.g. a prefetched Future's result).
+    """
     curator: str = event["curator"]
     list_name: str = event["list_name"]
     db_ids: List[int] = event["db_ids"]
 
-    logger.info(
-        "assign_films_to_list_handler curator=%s list_name=%s db_ids=%s",
-        curator, list_name, db_ids,
-    )
+    def _assign(film_lists: CuratorFilmLists) -> Dict[str, Any]:
+        target_list = find_custom_list(film_lists, curator, list_name)
+        pan_listings = load_pan_listings()
 
-    s3 = get_s3_client()
+        # Already-assigned db_ids (avoid duplicates)
+        existing_db_ids = {film["db_id"] for film in target_list["list_films"]}
 
-    # Load curator's lists
-    lists_key = f"{FILM_LISTS_BASE_PREFIX}/{curator}/{FILM_LISTS_FILENAME}"
-    raw = download_json_from_s3(s3, S3_BUCKET, lists_key)
-    film_lists: CuratorFilmLists = validate_curator_film_lists(raw, curator)
+        added = []
+        skipped = []
+        not_found = []
 
-    # Find target list
-    target_list = None
-    for fl in film_lists:
-        if fl["list_name"] == list_name:
-            target_list = fl
-            break
+        for db_id in db_ids:
+            if db_id in existing_db_ids:
+                skipped.append(db_id)
+                continue
 
-    if target_list is None:
-        raise ValueError(f"List '{list_name}' not found for curator '{curator}'")
+            # pan_listings keys are stringified ints in JSON
+            str_id = str(db_id)
+            if str_id not in pan_listings:
+                not_found.append(db_id)
+                continue
 
-    # Load pan cinema listings
-    pan_listings: PanCinemaCleanedCompactedListings = download_json_from_s3(s3, S3_BUCKET, PAN_CINEMA_LISTINGS_KEY)
+            list_film = make_list_film(db_id, pan_listings[str_id])
 
-    # Already-assigned db_ids (avoid duplicates)
-    existing_db_ids = {film["db_id"] for film in target_list["list_films"]}
+            target_list["list_films"].append(list_film)
+            existing_db_ids.add(db_id)
+            added.append(db_id)
 
-    added = []
-    skipped = []
-    not_found = []
+        return {
+            "status": "ok",
+            "curator": curator,
+            "list_name": list_name,
+            "films_added": added,
+            "films_skipped_already_in_list": skipped,
+            "films_not_found_in_pan_listings": not_found,
+            "total_list_films": len(target_list["list_films"]),
+        }
 
-    for db_id in db_ids:
-        if db_id in existing_db_ids:
-            skipped.append(db_id)
-            continue
+    return _assign
 
-        # pan_listings keys are stringified ints in JSON
-        str_id = str(db_id)
-        if str_id not in pan_listings:
-            not_found.append(db_id)
-            continue
 
-        cinema_listings = pan_listings[str_id]
+def assign_films_to_list_handler(event: Dict[str, Any], context=None) -> Dict[str, Any]:
+    curator: str = event["curator"]
 
-        list_film = cast(ListFilm, {
-            "db_id": db_id,
-            "cinema_listings": cinema_listings,
-            "list_film_caption": "",
-        })
+    logger.info(
+        "assign_films_to_list_handler curator=%s list_name=%s db_ids=%s",
+        curator, event["list_name"], event["db_ids"],
+    )
 
-        target_list["list_films"].append(list_film)
-        existing_db_ids.add(db_id)
-        added.append(db_id)
+    s3 = get_s3_client()
+
+    # Pan cinema listings (shared cached copy, read-only), fetched while the lists are read
+    pan_listings = prefetch(download_json_from_s3, s3, S3_BUCKET, PAN_CINEMA_LISTINGS_KEY, cached=True)
 
-    upload_dict_to_s3(s3, S3_BUCKET, lists_key, film_lists)
+    result = update_curator_film_lists(
+        s3, curator, assign_films_to_list_mutation(event, pan_listings.result), list_names=[event["list_name"]]
+    )
 
     return {
-        "status": "ok",
-        "curator": curator,
-        "list_name": list_name,
-        "films_added": added,
-        "films_skipped_already_in_list": skipped,
-        "films_not_found_in_pan_listings": not_found,
-        "total_list_films": len(target_list["list_films"]),
-        "output_uri": f"s3://{S3_BUCKET}/{lists_key}",
+        **result,
+        "output_uri": curator_lists_uri(curator),
     }
@@ -0,0 +1,154 @@
+"""
+Apply many list mutations for one curator with a single read and write.
+
+Payload:
+  curator      the curator every operation applies to
+  operations   ordered list of payloads for create_custom_list,
+               assign_films_to_list, remove_film_from_list,
+               update_list_film_caption, update_list or delete_list,
+               each with a "handler" field (curator may be omitted)
+  atomic       default true: stop at the first failing operation and
+               write nothing; false: skip failures and keep the rest
+
+All operations are validated up front, applied in order to one in-memory
+CuratorFilmLists and uploaded once with the same compare-and-swap and
+retry as the single-operation handlers. The response carries one result
+per operation, in the shape the matching handler would have returned.
+"""
+
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+from core.concurrency import prefetch
+from core.curator_store import curator_lists_uri, update_curator_film_lists
+from core.s3 import get_s3_client, download_json_from_s3
+from core.types.custom_lists import CuratorFilmLists
+from core.types.film_listings import PanCinemaCleanedCompactedListings
+from handlers.custom_lists.assign_films_to_list_handler import assign_films_to_list_mutation
+from handlers.custom_lists.create_custom_list_handler import create_custom_list_mutation
+from handlers.custom_lists.delete_list_handler import delete_list_mutation
+from handlers.custom_lists.remove_film_from_list_handler import remove_film_from_list_mutation
+from handlers.custom_lists.update_list_film_caption_handler import update_list_film_caption_mutation
+from handlers.custom_lists.update_list_handler import update_list_mutation
+from config import S3_BUCKET, PAN_CINEMA_LISTINGS_KEY
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+Mutation = Callable[[CuratorFilmLists], Dict[str, Any]]
+
+# handler name -> builds the in-memory edit from (payload, pan listings loader)
+PanListingsLoader = Callable[[], PanCinemaCleanedCompactedListings]
+BATCH_OPERATIONS: Dict[str, Callable[[Dict[str, Any], Optional[PanListingsLoader]], Mutation]] = {
+    "create_custom_list": lambda op, pan: create_custom_list_mutation(op),
+    "assign_films_to_list": lambda op, pan: assign_films_to_list_mutation(op, pan),
+    "remove_film_from_list": lambda op, pan: remove_film_from_list_mutation(op),
+    "update_list_film_caption": lambda op, pan: update_list_film_caption_mutation(op),
+    "update_list": lambda op, pan: update_list_mutation(op),
+    "delete_list": lambda op, pan: delete_list_mutation(op),
+}
+
+MAX_BATCH_OPERATIONS = 500
+
+
+class _BatchAborted(Exception):
+    def __init__(self, results: List[Dict[str, Any]]):
+        super().__init__("batch aborted")
+        self.results = results
+
+
+def _error_result(index: int, handler_name: str, error: Exception) -> Dict[str, Any]:
+    return {"index": index, "handler": handler_name, "status": "error", "error": str(error)}
+
+
+def batch_handler(event: Dict[str, Any], context=None) -> Dict[str, Any]:
+    curator: str = event.get("curator") or ""
+    operations: List[Dict[str, Any]] = event.get("operations") or []
+    atomic: bool = event.get("atomic", True)
+
+    if not curator:
+        raise ValueError("Missing required field: curator")
+    if not operations:
+        raise ValueError("No operations provided")
+    if len(operations) > MAX_BATCH_OPERATIONS:
+        raise ValueError(f"Too many operations ({len(operations)}), max {MAX_BATCH_OPERATIONS}")
+
+    logger.info("batch_handler curator=%s operations=%d atomic=%s", curator, len(operations), atomic)
+
+    for i, op in enumerate(operations):
+        if op.get("handler") not in BATCH_OPERATIONS:
+            raise ValueError(f"Operation {i}: unsupported handler '{op.get('handler')}'")
+        if op.get("curator", curator) != curator:
+            raise ValueError(f"Operation {i}: curator '{op['curator']}' does not match batch curator '{curator}'")
+
+    s3 = get_s3_client()
+
+    pan_listings: Optional[PanListingsLoader] = None
+    if any(op["handler"] == "assign_films_to_list" for op in operations):
+        # Loaded once for every assign operation (shared cached copy, read-only),
+        # in the background while the curator's lists are read
+        pan_listings = prefetch(download_json_from_s3, s3, S3_BUCKET, PAN_CINEMA_LISTINGS_KEY, cached=True).result
+
+    # Validate every payload before touching the curator's file
+    mutations: List[Optional[Mutation]] = []
+    invalid: Dict[int, Dict[str, Any]] = {}
+    for i, op in enumerate(operations):
+        try:
+            mutations.append(BATCH_OPERATIONS[op["handler"]]({**op, "curator": curator}, pan_listings))
+        except (KeyError, TypeError, ValueError) as e:
+            mutations.append(None)
+            invalid[i] = _error_result(i, op["handler"], e)
+
+    if invalid and atomic:
+        return {
+            "status": "error",
+            "curator": curator,
+            "written": False,
+            "results": list(invalid.values()),
+        }
+
+    def _apply_all(film_lists: CuratorFilmLists) -> List[Dict[str, Any]]:
+        results: List[Dict[str, Any]] = []
+        for i, mutation in enumerate(mutations):
+            handler_name = operations[i]["handler"]
+            if mutation is None:
+                results.append(invalid[i])
+                continue
+            try:
+                # A failing edit raises before changing the lists
+                results.append({"index": i, "handler": handler_name, **mutation(film_lists)})
+            except (KeyError, TypeError, ValueError) as e:
+                results.append(_error_result(i, handler_name, e))
+                if atomic:
+                    raise _BatchAborted(results)
+        if all(r["status"] != "ok" for r in results):
+            # Nothing applied, so there is nothing to write
+            raise _BatchAborted(results)
+        return results
+
+    try:
+        creates_lists = any(op["handler"] == "create_custom_list" for op in operations)
+        # Lists created or renamed within the batch are already in memory by then
+        list_names = {op["list_name"] for op in operations if op.get("list_name")}
+        results = update_curator_film_lists(
+            s3, curator, _apply_all, create_if_missing=creates_lists, list_names=list_names
+        )
+    except _BatchAborted as aborted:
+        return {
+            "status": "error",
+            "curator": curator,
+            "written": False,
+            "results": aborted.results,
+        }
+
+    failed = sum(1 for r in results if r["status"] != "ok")
+
+    return {
+        "status": "ok" if failed == 0 else "partial",
+        "curator": curator,
+        "written": True,
+        "operations_applied": len(results) - failed,
+        "operations_failed": failed,
+        "results": results,
+        "output_uri": curator_lists_uri(curator),
+    }
@@ -0,0 +1,67 @@
+"""
+Build the film picker catalogue from pan_cinema_listings.json.
+
+Triggered by the S3 put event on PAN_CINEMA_LISTINGS_KEY (routed here by the
+entrypoint) or invoked directly. Writes the AvailableFilmSummary map to
+FILM_CATALOGUE_KEY tagged with the ETag of the listings it was built from.
+Skips the rebuild when the stored catalogue already matches, unless force=true.
+The listings are streamed film by film, never parsed whole.
+"""
+
+import logging
+from typing import Dict, Any
+
+from core.film_catalogue import build_film_catalogue
+from core.s3 import (
+    get_s3_client,
+    download_json_from_s3,
+    get_s3_object_etag,
+    stream_json_items_from_s3,
+    upload_dict_to_s3,
+)
+from core.types.custom_lists import FilmCatalogue
+from config import S3_BUCKET, PAN_CINEMA_LISTINGS_KEY, FILM_CATALOGUE_KEY
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+def build_film_catalogue_handler(event: Dict[str, Any], context=None) -> Dict[str, Any]:
+    force = bool(event.get("force", False))
+    logger.info("build_film_catalogue_handler force=%s", force)
+
+    s3 = get_s3_client()
+
+    if not force:
+        source_etag = get_s3_object_etag(s3, S3_BUCKET, PAN_CINEMA_LISTINGS_KEY)
+        try:
+            existing: FilmCatalogue = download_json_from_s3(s3, S3_BUCKET, FILM_CATALOGUE_KEY, cached=True)
+            if source_etag is not None and existing.get("source_etag") == source_etag:
+                logger.info("film catalogue already built from %s, skipping", source_etag)
+                return {
+                    "status": "ok",
+                    "rebuilt": False,
+                    "source_etag": source_etag,
+                    "film_count": existing["film_count"],
+                    "output_uri": f"s3://{S3_BUCKET}/{FILM_CATALOGUE_KEY}",
+                }
+        except FileNotFoundError:
+            pass
+
+    films, source_etag = stream_json_items_from_s3(s3, S3_BUCKET, PAN_CINEMA_LISTINGS_KEY)
+    catalogue = build_film_catalogue(films, source_etag)
+    upload_dict_to_s3(s3, S3_BUCKET, FILM_CATALOGUE_KEY, catalogue)
+
+    logger.info(
+        "film catalogue built film_count=%d skipped_no_title=%d source_etag=%s",
+        catalogue["film_count"], catalogue["skipped_no_title"], source_etag,
+    )
+
+    return {
+        "status": "ok",
+        "rebuilt": True,
+        "source_etag": source_etag,
+        "film_count": catalogue["film_count"],
+        "skipped_no_title": catalogue["skipped_no_title"],
+        "output_uri": f"s3://{S3_BUCKET}/{FILM_CATALOGUE_KEY}",
+    }
@@ -0,0 +1,82 @@
+"""
+Fold curators' list journals back into filmLists.json (see core/curator_journal.py).
+
+Payload:
+  curator / curators   one curator, a list of curators, or "all" (default)
+  min_entries          skip curators with fewer journal entries than this;
+                       defaults to 1 for named curators and to
+                       FILM_LISTS_JOURNAL_COMPACT_MIN_ENTRIES for "all"
+
+Each curator's pending entries are written into a new filmLists.json in one
+conditional PUT, then the folded entries are deleted. Reads stay correct
+throughout, so this can run at any time; schedule it (e.g. an EventBridge
+rule invoking {"handler": "compact_curator"}) to keep journals short, and
+run it for every curator before turning FILM_LISTS_JOURNAL_ENABLED off.
+
+Curators are compacted concurrently.
+"""
+
+import logging
+from typing import Any, Dict, List
+
+from core.concurrency import fanout_status, run_concurrently
+from core.curator_journal import compact_journal, list_journal
+from core.curator_store import FILM_LISTS_LAYOUT, curator_lists_key
+from core.curators_registry import resolve_curators, scan_curator_names
+from core.s3 import PreconditionFailedError, get_s3_client
+from config import FILM_LISTS_JOURNAL_COMPACT_MIN_ENTRIES
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+def _compact_curator(s3, curator: str, min_entries: int) -> Dict[str, Any]:
+    entries = len(list_journal(s3, curator))
+    if entries == 0 or entries < min_entries:
+        return {"curator": curator, "status": "skipped", "journal_entries": entries}
+    try:
+        return {"status": "ok", **compact_journal(s3, curator, curator_lists_key(curator))}
+    except PreconditionFailedError:
+        return {"curator": curator, "status": "skipped", "reason": "compacted concurrently"}
+
+
+def compact_curator_handler(event: Dict[str, Any], context=None) -> Dict[str, Any]:
+    if FILM_LISTS_LAYOUT != "single":
+        raise ValueError("compact_curator requires FILM_LISTS_LAYOUT 'single'")
+
+    s3 = get_s3_client()
+
+    curators = resolve_curators(event, lambda: scan_curator_names(s3))
+
+    named = bool(event.get("curator") or isinstance(event.get("curators"), list))
+    default_min = 1 if named else FILM_LISTS_JOURNAL_COMPACT_MIN_ENTRIES
+    min_entries = int(event.get("min_entries", default_min))
+    if min_entries < 0:
+        raise ValueError("min_entries must not be negative")
+
+    logger.info("compact_curator_handler curators=%d min_entries=%d", len(curators), min_entries)
+
+    outcomes = run_concurrently(lambda curator: _compact_curator(s3, curator, min_entries), curators)
+
+    results: List[Dict[str, Any]] = []
+    errors: Dict[str, str] = {}
+    for outcome in outcomes:
+        if outcome.error is not None:
+            logger.warning("compaction failed for curator '%s': %s", outcome.item, outcome.error)
+            errors[outcome.item] = str(outcome.error)
+        else:
+            results.append(outcome.value)
+
+    compacted = [r for r in results if r["status"] == "ok"]
+    logger.info(
+        "compact_curator curators=%d compacted=%d entries=%d errors=%d",
+        len(curators), len(compacted), sum(r["compacted"] for r in compacted), len(errors),
+    )
+
+    return {
+        "status": fanout_status(results, errors),
+        "curators_compacted": len(compacted),
+        "entries_compacted": sum(r["compacted"] for r in compacted),
+        "results": results,
+        "errors": errors,
+    }
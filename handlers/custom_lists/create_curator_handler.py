@@ -1,16 +1,21 @@
 """
 Create a new curator.
 
-Validates the curator name, checks it doesn't already exist,
-then writes an empty filmLists.json to establish the curator's folder.
+Validates the curator name, then writes an empty filmLists.json (or an
+empty manifest.json in the sharded layout) to establish the curator's
+folder. The write is conditional (IfNoneMatch: *), so an existing curator
+is detected by S3 without a separate GET. The new curator is then added
+to the curators registry served by get_curators, if it has been built.
 """
 
 import logging
 import re
 from typing import Dict, Any
 
-from core.s3 import get_s3_client, download_json_from_s3, upload_dict_to_s3
-from config import S3_BUCKET, FILM_LISTS_BASE_PREFIX, FILM_LISTS_FILENAME
+from core.curator_store import curator_root_key, empty_curator_root
+from core.curators_registry import curator_stats, record_curator_stats
+from core.s3 import PreconditionFailedError, get_s3_client, upload_dict_to_s3
+from config import S3_BUCKET
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -34,17 +39,19 @@ def create_curator_handler(event: Dict[str, Any], context=None) -> Dict[str, Any
     logger.info("create_curator_handler curator=%s", curator)
 
     s3 = get_s3_client()
-    key = f"{FILM_LISTS_BASE_PREFIX}/{curator}/{FILM_LISTS_FILENAME}"
+    key = curator_root_key(curator)
 
-    # Check if curator already exists
+    # Create empty filmLists.json / manifest.json, only if the curator doesn't exist yet
     try:
-        download_json_from_s3(s3, S3_BUCKET, key)
+        upload_dict_to_s3(s3, S3_BUCKET, key, empty_curator_root(curator), if_none_match="*")
+    except PreconditionFailedError:
         raise ValueError(f"Curator '{curator}' already exists")
-    except FileNotFoundError:
-        pass  # Expected — curator doesn't exist yet
 
-    # Create empty filmLists.json
-    upload_dict_to_s3(s3, S3_BUCKET, key, [])
+    try:
+        record_curator_stats(s3, curator, curator_stats([]))
+    except Exception as e:
+        # The curator exists either way; rebuild_curators_registry picks it up
+        logger.warning("could not add '%s' to the curators registry: %s", curator, e)
 
     return {
         "status": "ok",
@@ -7,11 +7,11 @@ Takes a payload with all required fields and creates a new list
 
 import logging
 import re
-from typing import Dict, Any
+from typing import Callable, Dict, Any
 
-from core.s3 import get_s3_client, download_json_from_s3, upload_dict_to_s3
-from core.types.custom_lists import CuratorFilmLists, validate_curator_film_lists
-from config import S3_BUCKET, FILM_LISTS_BASE_PREFIX, FILM_LISTS_FILENAME
+from core.curator_store import curator_lists_uri, update_curator_film_lists
+from core.s3 import get_s3_client
+from core.types.custom_lists import CuratorFilmLists
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -21,7 +21,8 @@ DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
 REQUIRED_FIELDS = ["curator", "list_name", "list_caption", "start_date", "end_date"]
 
 
-def create_custom_list_handler(event: Dict[str, Any], context=None) -> Dict[str, Any]:
+def create_custom_list_mutation(event: Dict[str, Any]) -> Callable[[CuratorFilmLists], Dict[str, Any]]:
+    """Validate the payload and return the in-memory edit that appends the new list."""
     # Validate required fields
     missing = [f for f in REQUIRED_FIELDS if not event.get(f)]
     if missing:
@@ -33,46 +34,51 @@ def create_custom_list_handler(event: Dict[str, Any], context=None) -> Dict[str,
     start_date: str = event["start_date"]
     end_date: str = event["end_date"]
 
-    logger.info("create_custom_list_handler curator=%s list_name=%s", curator, list_name)
-
     # Validate date formats
     if not DATE_PATTERN.match(start_date):
         raise ValueError(f"Invalid start_date format '{start_date}', expected YYYY-MM-DD")
     if not DATE_PATTERN.match(end_date):
         raise ValueError(f"Invalid end_date format '{end_date}', expected YYYY-MM-DD")
 
+    def _create(film_lists: CuratorFilmLists) -> Dict[str, Any]:
+        # Check for duplicate list name
+        for existing in film_lists:
+            if existing["list_name"] == list_name:
+                raise ValueError(f"List '{list_name}' already exists for curator '{curator}'")
+
+        new_list = {
+            "list_curator": curator,
+            "list_name": list_name,
+            "list_caption": list_caption,
+            "start_date": start_date,
+            "end_date": end_date,
+            "list_films": [],
+        }
+
+        film_lists.append(new_list)
+
+        return {
+            "status": "ok",
+            "curator": curator,
+            "list_name": list_name,
+            "lists_total": len(film_lists),
+        }
+
+    return _create
+
+
+def create_custom_list_handler(event: Dict[str, Any], context=None) -> Dict[str, Any]:
+    mutation = create_custom_list_mutation(event)
+    curator: str = event["curator"]
+
+    logger.info("create_custom_list_handler curator=%s list_name=%s", curator, event["list_name"])
+
     s3 = get_s3_client()
-    key = f"{FILM_LISTS_BASE_PREFIX}/{curator}/{FILM_LISTS_FILENAME}"
 
     # Load existing lists or start fresh
-    try:
-        raw = download_json_from_s3(s3, S3_BUCKET, key)
-    except FileNotFoundError:
-        raw = []
-
-    film_lists: CuratorFilmLists = validate_curator_film_lists(raw, curator)
-
-    # Check for duplicate list name
-    for existing in film_lists:
-        if existing["list_name"] == list_name:
-            raise ValueError(f"List '{list_name}' already exists for curator '{curator}'")
-
-    new_list = {
-        "list_curator": curator,
-        "list_name": list_name,
-        "list_caption": list_caption,
-        "start_date": start_date,
-        "end_date": end_date,
-        "list_films": [],
-    }
-
-    film_lists.append(new_list)
-    upload_dict_to_s3(s3, S3_BUCKET, key, film_lists)
+    result = update_curator_film_lists(s3, curator, mutation, create_if_missing=True, list_names=[])
 
     return {
-        "status": "ok",
-        "curator": curator,
-        "list_name": list_name,
-        "lists_total": len(film_lists),
-        "output_uri": f"s3://{S3_BUCKET}/{key}",
+        **result,
+        "output_uri": curator_lists_uri(curator),
     }
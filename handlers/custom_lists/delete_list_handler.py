@@ -2,43 +2,53 @@
 Route 5: Delete a custom list.
 
 Payload specifies curator and list_name. Removes the list entirely
-from the curator's filmLists.json.
+from the curator's filmLists.json. The list's films are loaded (in the
+sharded layout, that one list object) so the reverse film index can drop
+the list from each of them.
 """
 
 import logging
-from typing import Dict, Any
+from typing import Callable, Dict, Any
 
-from core.s3 import get_s3_client, download_json_from_s3, upload_dict_to_s3
-from core.types.custom_lists import CuratorFilmLists, validate_curator_film_lists
-from config import S3_BUCKET, FILM_LISTS_BASE_PREFIX, FILM_LISTS_FILENAME
+from core.curator_store import curator_lists_uri, update_curator_film_lists
+from core.s3 import get_s3_client
+from core.types.custom_lists import CuratorFilmLists
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
 
-def delete_list_handler(event: Dict[str, Any], context=None) -> Dict[str, Any]:
+def delete_list_mutation(event: Dict[str, Any]) -> Callable[[CuratorFilmLists], Dict[str, Any]]:
+    """Validate the payload and return the in-memory edit that drops the list."""
     curator: str = event["curator"]
     list_name: str = event["list_name"]
 
-    logger.info("delete_list_handler curator=%s list_name=%s", curator, list_name)
+    def _delete(film_lists: CuratorFilmLists) -> Dict[str, Any]:
+        original_count = len(film_lists)
+        film_lists[:] = [fl for fl in film_lists if fl["list_name"] != list_name]
 
-    s3 = get_s3_client()
-    lists_key = f"{FILM_LISTS_BASE_PREFIX}/{curator}/{FILM_LISTS_FILENAME}"
-    raw = download_json_from_s3(s3, S3_BUCKET, lists_key)
-    film_lists: CuratorFilmLists = validate_curator_film_lists(raw, curator)
+        if len(film_lists) == original_count:
+            raise ValueError(f"List '{list_name}' not found for curator '{curator}'")
+
+        return {
+            "status": "ok",
+            "curator": curator,
+            "deleted_list": list_name,
+            "remaining_lists": len(film_lists),
+        }
+
+    return _delete
 
-    original_count = len(film_lists)
-    film_lists = [fl for fl in film_lists if fl["list_name"] != list_name]
 
-    if len(film_lists) == original_count:
-        raise ValueError(f"List '{list_name}' not found for curator '{curator}'")
+def delete_list_handler(event: Dict[str, Any], context=None) -> Dict[str, Any]:
+    curator: str = event["curator"]
 
-    upload_dict_to_s3(s3, S3_BUCKET, lists_key, film_lists)
+    logger.info("delete_list_handler curator=%s list_name=%s", curator, event["list_name"])
+
+    s3 = get_s3_client()
+    result = update_curator_film_lists(s3, curator, delete_list_mutation(event), list_names=[event["list_name"]])
 
     return {
-        "status": "ok",
-        "curator": curator,
-        "deleted_list": list_name,
-        "remaining_lists": len(film_lists),
-        "output_uri": f"s3://{S3_BUCKET}/{lists_key}",
+        **result,
+        "output_uri": curator_lists_uri(curator),
     }
@@ -1,43 +1,161 @@
 import argparse
+import base64
+import importlib
 import json
 import logging
-from typing import Dict, Any
-
-from handlers.custom_lists.get_curators_handler import get_curators_handler
-from handlers.custom_lists.get_custom_lists_handler import get_custom_lists_handler
-from handlers.custom_lists.create_custom_list_handler import create_custom_list_handler
-from handlers.custom_lists.assign_films_to_list_handler import assign_films_to_list_handler
-from handlers.custom_lists.remove_film_from_list_handler import remove_film_from_list_handler
-from handlers.custom_lists.update_list_film_caption_handler import update_list_film_caption_handler
-from handlers.custom_lists.update_list_handler import update_list_handler
-from handlers.custom_lists.delete_list_handler import delete_list_handler
-from handlers.custom_lists.create_curator_handler import create_curator_handler
-from handlers.custom_lists.get_available_films_handler import get_available_films_handler
-
-HANDLER_REGISTRY = {
-    "get_curators": get_curators_handler,
-    "create_curator": create_curator_handler,
-    "get_custom_lists": get_custom_lists_handler,
-    "create_custom_list": create_custom_list_handler,
-    "assign_films_to_list": assign_films_to_list_handler,
-    "remove_film_from_list": remove_film_from_list_handler,
-    "update_list_film_caption": update_list_film_caption_handler,
-    "update_list": update_list_handler,
-    "delete_list": delete_list_handler,
-    "get_available_films": get_available_films_handler,
+from collections.abc import Mapping
+from typing import Callable, Dict, Any, Iterator, Optional
+from urllib.parse import unquote_plus
+
+from core import codec, metrics
+from core.compression import compress
+from core.conditional import encoded_etag, if_none_match_matches, response_etag
+from core.s3 import get_json_cache_stats
+from config import S3_BUCKET, PAN_CINEMA_LISTINGS_KEY
+
+HandlerFn = Callable[[Dict[str, Any], Any], Dict[str, Any]]
+
+
+class LazyHandlerRegistry(Mapping):
+    """Handler name -> handler function, importing each module on first lookup.
+
+    Only the module for the handler actually dispatched is imported, so a
+    cold start never pays for code paths the request will not touch.
+    """
+
+    def __init__(self, targets: Dict[str, str]):
+        # handler name -> "package.module:function"
+        self._targets = targets
+        self._resolved: Dict[str, HandlerFn] = {}
+
+    def __getitem__(self, name: str) -> HandlerFn:
+        handler_fn = self._resolved.get(name)
+        if handler_fn is None:
+            module_name, fn_name = self._targets[name].split(":")
+            handler_fn = getattr(importlib.import_module(module_name), fn_name)
+            self._resolved[name] = handler_fn
+        return handler_fn
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._targets)
+
+    def __len__(self) -> int:
+        return len(self._targets)
+
+    def module_name(self, name: str) -> str:
+        return self._targets[name].split(":")[0]
+
+
+HANDLER_REGISTRY = LazyHandlerRegistry({
+    "get_curators": "handlers.custom_lists.get_curators_handler:get_curators_handler",
+    "create_curator": "handlers.custom_lists.create_curator_handler:create_curator_handler",
+    "get_custom_lists": "handlers.custom_lists.get_custom_lists_handler:get_custom_lists_handler",
+    "get_custom_lists_bulk": "handlers.custom_lists.get_custom_lists_bulk_handler:get_custom_lists_bulk_handler",
+    "create_custom_list": "handlers.custom_lists.create_custom_list_handler:create_custom_list_handler",
+    "assign_films_to_list": "handlers.custom_lists.assign_films_to_list_handler:assign_films_to_list_handler",
+    "remove_film_from_list": "handlers.custom_lists.remove_film_from_list_handler:remove_film_from_list_handler",
+    "update_list_film_caption": "handlers.custom_lists.update_list_film_caption_handler:update_list_film_caption_handler",
+    "update_list": "handlers.custom_lists.update_list_handler:update_list_handler",
+    "delete_list": "handlers.custom_lists.delete_list_handler:delete_list_handler",
+    "get_available_films": "handlers.custom_lists.get_available_films_handler:get_available_films_handler",
+    "build_film_catalogue": "handlers.custom_lists.build_film_catalogue_handler:build_film_catalogue_handler",
+    "batch": "handlers.custom_lists.batch_handler:batch_handler",
+    "migrate_curator_layout": "handlers.custom_lists.migrate_curator_layout_handler:migrate_curator_layout_handler",
+    "refresh_lists": "handlers.custom_lists.refresh_lists_handler:refresh_lists_handler",
+    "rebuild_curators_registry": "handlers.custom_lists.rebuild_curators_registry_handler:rebuild_curators_registry_handler",
+    "compact_curator": "handlers.custom_lists.compact_curator_handler:compact_curator_handler",
+    "get_lists_for_film": "handlers.custom_lists.get_lists_for_film_handler:get_lists_for_film_handler",
+    "rebuild_film_index": "handlers.custom_lists.rebuild_film_index_handler:rebuild_film_index_handler",
+    "get_active_lists": "handlers.custom_lists.get_active_lists_handler:get_active_lists_handler",
+    "refresh_active_lists": "handlers.custom_lists.refresh_active_lists_handler:refresh_active_lists_handler",
+    "search_films": "handlers.custom_lists.search_films_handler:search_films_handler",
+})
+
+# Read handler name -> function returning the S3 ETags its response depends on
+# (None when it cannot tell). Responses to these carry an ETag and are
+# answered 304 Not Modified when the request's If-None-Match still matches.
+SOURCE_ETAG_REGISTRY = LazyHandlerRegistry({
+    "get_curators": "handlers.custom_lists.get_curators_handler:get_curators_source_etags",
+    "get_custom_lists": "handlers.custom_lists.get_custom_lists_handler:get_custom_lists_source_etags",
+    "get_available_films": "handlers.custom_lists.get_available_films_handler:get_available_films_source_etags",
+    "get_lists_for_film": "handlers.custom_lists.get_lists_for_film_handler:get_lists_for_film_source_etags",
+    "get_active_lists": "handlers.custom_lists.get_active_lists_handler:get_active_lists_source_etags",
+    "search_films": "handlers.custom_lists.search_films_handler:search_films_source_etags",
+})
+
+# S3 object key -> handler run when that object is written (S3 event notifications)
+S3_EVENT_HANDLERS = {
+    PAN_CINEMA_LISTINGS_KEY: "build_film_catalogue",
 }
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+def _s3_event_payload(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Map an S3 event notification to the handler registered for its key."""
+    for record in event["Records"]:
+        if record.get("eventSource") != "aws:s3":
+            continue
+        bucket = record["s3"]["bucket"]["name"]
+        key = unquote_plus(record["s3"]["object"]["key"])
+        handler_name = S3_EVENT_HANDLERS.get(key)
+        if bucket == S3_BUCKET and handler_name:
+            return {"handler": handler_name, "s3_bucket": bucket, "s3_key": key}
+    raise ValueError("S3 event does not match any registered object key")
+
+
 def _normalize_event(event: Dict[str, Any]) -> Dict[str, Any]:
     if "body" in event and isinstance(event["body"], str):
-        return json.loads(event["body"])
+        return codec.loads(event["body"])
+    if isinstance(event.get("Records"), list):
+        return _s3_event_payload(event)
     return event
 
 
+def _request_header(event: Dict[str, Any], name: str) -> Optional[str]:
+    """Case-insensitive lookup of a function URL / API Gateway request header."""
+    for key, value in (event.get("headers") or {}).items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+def _response_etag(event: Dict[str, Any], handler_name: str, payload: Dict[str, Any]) -> Optional[str]:
+    """ETag for an HTTP read request's response, or None if it has none.
+
+    Only computed for function URL requests (which carry headers); direct
+    invocations could not use it. Failing to compute one is not an error.
+    """
+    source_fn = SOURCE_ETAG_REGISTRY.get(handler_name)
+    if source_fn is None or "headers" not in event:
+        return None
+    try:
+        source_etags = source_fn(payload)
+    except Exception as e:
+        logger.warning("could not compute ETag for handler=%s: %s", handler_name, e)
+        return None
+    if source_etags is None:
+        return None
+    return response_etag(handler_name, payload, source_etags)
+
+
 def handler(event: Dict[str, Any], context=None) -> Dict[str, Any]:
+    """Lambda entry point: dispatch the event and log its metrics line (core.metrics)."""
+    metrics.start_invocation("unknown")
+    try:
+        response = _dispatch(event, context)
+        metrics.set_property("status_code", response["statusCode"])
+        return response
+    except Exception as e:
+        metrics.set_property("error", type(e).__name__)
+        raise
+    finally:
+        metrics.emit(metrics.finish_invocation())
+
+
+def _dispatch(event: Dict[str, Any], context) -> Dict[str, Any]:
     logger.info("Entrypoint start event_keys=%s", sorted(event.keys()))
+    codec.reset_codec_stats()
 
     payload = _normalize_event(event)
 
@@ -48,27 +166,76 @@ def handler(event: Dict[str, Any], context=None) -> Dict[str, Any]:
     handler_fn = HANDLER_REGISTRY.get(handler_name)
     if not handler_fn:
         raise ValueError(f"Unknown handler '{handler_name}'")
+    metrics.set_handler(handler_name)
+
+    with metrics.span("etag"):
+        etag = _response_etag(event, handler_name, payload)
+    if etag is not None and if_none_match_matches(_request_header(event, "if-none-match"), etag):
+        logger.info("Not modified handler=%s etag=%s", handler_name, etag)
+        return {
+            "statusCode": 304,
+            "headers": {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"},
+            "body": "",
+        }
 
     logger.info("Dispatching to handler=%s", handler_name)
-    result = handler_fn(payload, context)
+    with metrics.span("handler"):
+        result = handler_fn(payload, context)
+    with metrics.span("response_encode"):
+        body = codec.dumps(result)
+    metrics.add("response_bytes", len(body))
+
+    logger.info("s3_json_cache %s", get_json_cache_stats())
+    logger.info("codec handler=%s %s", handler_name, codec.get_codec_stats())
+
+    headers = {
+        "Content-Type": "application/json",
+        "Vary": "Accept-Encoding",
+    }
 
+    with metrics.span("response_compress"):
+        compressed, content_encoding = compress(body, _request_header(event, "accept-encoding"))
+    if etag is not None:
+        # Clients may keep the body but must revalidate before reusing it
+        headers["ETag"] = encoded_etag(etag, content_encoding)
+        headers["Cache-Control"] = "no-cache"
+
+    if content_encoding is None:
+        return {
+            "statusCode": 200,
+            "headers": headers,
+            "body": body.decode("utf-8"),
+        }
+
+    logger.info(
+        "response compressed encoding=%s bytes=%d->%d",
+        content_encoding, len(body), len(compressed),
+    )
+    headers["Content-Encoding"] = content_encoding
+    metrics.add("response_compressed_bytes", len(compressed))
     return {
         "statusCode": 200,
-        "headers": {
-            "Content-Type": "application/json",
-        },
-        "body": json.dumps(result),
+        "headers": headers,
+        "body": base64.b64encode(compressed).decode("ascii"),
+        "isBase64Encoded": True,
     }
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
-    parser.add_argument("--handler", required=True)
-    parser.add_argument("--payload", required=True)
+    parser.add_argument("--handler")
+    parser.add_argument("--payload")
+    parser.add_argument("--event", help="Path to a raw Lambda event JSON file (e.g. an S3 notification)")
 
     args = parser.parse_args()
 
-    event = json.loads(args.payload)
-    event["handler"] = args.handler
+    if args.event:
+        with open(args.event) as f:
+            event = json.load(f)
+    else:
+        if not args.handler or args.payload is None:
+            parser.error("--handler and --payload are required unless --event is given")
+        event = json.loads(args.payload)
+        event["handler"] = args.handler
 
     handler(event, context=None)
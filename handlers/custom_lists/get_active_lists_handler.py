@@ -0,0 +1,53 @@
+"""
+Route 7: Get every curator's lists that are running today.
+
+Served from the active lists feed (ACTIVE_LISTS_FEED_KEY) with one cached
+GET rather than reading every curator's lists. Returns the lists whose
+start_date <= today (UTC) <= end_date, grouped by curator, in the
+"summary" view: metadata, film_count and each film's db_id, title and
+caption (see core/list_views.py). If the feed has never been built, it is
+built here from a full scan (see refresh_active_lists_handler).
+
+Optional payload fields:
+  fields   keep only these list-level keys of the summary view
+
+get_active_lists_source_etags reports the feed's ETag and today's date for
+HTTP ETag / 304 handling; there is none until the feed has been built.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from core.active_lists import is_active, today
+from core.list_views import parse_view, project_fields
+from core.s3 import get_s3_client, get_s3_object_etag
+from handlers.custom_lists.refresh_active_lists_handler import load_or_rebuild_active_lists_feed
+from config import S3_BUCKET, ACTIVE_LISTS_FEED_KEY
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+def get_active_lists_source_etags(event: Dict[str, Any]) -> Optional[List[Optional[str]]]:
+    etag = get_s3_object_etag(get_s3_client(), S3_BUCKET, ACTIVE_LISTS_FEED_KEY)
+    # The same feed answers differently once lists start or end
+    return [etag, today()] if etag is not None else None
+
+
+def get_active_lists_handler(event: Dict[str, Any], context=None) -> Dict[str, Any]:
+    _, fields = parse_view({"view": "summary", "fields": event.get("fields")})
+    logger.info("get_active_lists_handler fields=%s", ",".join(fields))
+
+    feed = load_or_rebuild_active_lists_feed(get_s3_client())
+
+    on = today()
+    lists: List[Dict[str, Any]] = [s for s in feed["lists"] if is_active(s, on)]
+    if event.get("fields") is not None:
+        lists = project_fields(lists, fields)
+
+    return {
+        "status": "ok",
+        "date": on,
+        "lists_count": len(lists),
+        "film_lists": lists,
+    }
@@ -4,89 +4,99 @@ Return a compact summary of all films in pan_cinema_listings.json.
 Used by the UI film picker so users can search and select films
 to add to a custom list without needing to know db_ids up front.
 Films without a title in _additional_info are excluded.
+
+Served from the precomputed film catalogue (see build_film_catalogue_handler),
+built on the fly only when that artifact is missing or stale.
+
+Optional payload fields narrow and page the result:
+  title, director          case-insensitive substring
+  year_from, year_to       inclusive release year range
+  cinema                   cinema key, e.g. "prince_charles"
+  date_from, date_to       inclusive showing date window (YYYY-MM-DD)
+  limit, cursor            page size and the next_cursor of the previous page
+Films are ordered by title then db_id. Without limit/cursor every match is returned.
+
+The response depends only on the payload and the pan listings version, which
+get_available_films_source_etags reports for HTTP ETag / 304 handling.
 """
 
 import logging
-from typing import Dict, Any, Optional, List
+import re
+from typing import Dict, Any, List, Optional
 
-from core.s3 import get_s3_client, download_json_from_s3
-from core.types.film_listings import PanCinemaCleanedCompactedListings
-from core.types.custom_lists import AvailableFilmSummary, CinemaShowing
+from core.film_catalogue import load_film_catalogue
+from core.film_index import get_film_catalogue_index
+from core.s3 import get_s3_client, get_s3_object_etag
+from core.types.custom_lists import AvailableFilmSummary, FilmCatalogue
 from config import S3_BUCKET, PAN_CINEMA_LISTINGS_KEY
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def _optional_int(event: Dict[str, Any], field: str) -> Optional[int]:
+    value = event.get(field)
+    if value is None or value == "":
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid {field} '{value}', expected an integer")
+
+
+def get_available_films_source_etags(event: Dict[str, Any]) -> List[Optional[str]]:
+    return [get_s3_object_etag(get_s3_client(), S3_BUCKET, PAN_CINEMA_LISTINGS_KEY)]
+
 
 def get_available_films_handler(event: Dict[str, Any], context=None) -> Dict[str, Any]:
-    logger.info("get_available_films_handler")
+    year_from = _optional_int(event, "year_from")
+    year_to = _optional_int(event, "year_to")
+    limit = _optional_int(event, "limit")
+    cursor: Optional[str] = event.get("cursor") or None
+
+    for date_field in ("date_from", "date_to"):
+        if event.get(date_field) and not DATE_PATTERN.match(event[date_field]):
+            raise ValueError(f"Invalid {date_field} format '{event[date_field]}', expected YYYY-MM-DD")
+
+    if limit is None and cursor:
+        limit = DEFAULT_PAGE_SIZE
+    if limit is not None and not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"Invalid limit {limit}, expected 1-{MAX_PAGE_SIZE}")
+
+    logger.info("get_available_films_handler limit=%s cursor=%s", limit, bool(cursor))
 
     s3 = get_s3_client()
-    pan_listings: PanCinemaCleanedCompactedListings = download_json_from_s3(
-        s3, S3_BUCKET, PAN_CINEMA_LISTINGS_KEY
+    catalogue: FilmCatalogue = load_film_catalogue(s3)
+    index = get_film_catalogue_index(catalogue)
+
+    matched = index.filter(
+        title=event.get("title"),
+        director=event.get("director"),
+        year_from=year_from,
+        year_to=year_to,
+        cinema=event.get("cinema"),
+        date_from=event.get("date_from"),
+        date_to=event.get("date_to"),
     )
+    page_ids, next_cursor = index.page(matched, cursor, limit)
 
-    films: Dict[str, AvailableFilmSummary] = {}
-    skipped_no_title = 0
-
-    for db_id_str, cinema_listings in pan_listings.items():
-        title: Optional[str] = None
-        directors: Optional[List[str]] = None
-        year: Optional[int] = None
-
-        for listing in cinema_listings.values():
-            info = listing.get("_additional_info", {})
-            if not title and info.get("title"):
-                title = info["title"]
-            if not directors:
-                raw_dirs = info.get("directors")
-                if isinstance(raw_dirs, list):
-                    directors = raw_dirs
-                elif isinstance(raw_dirs, str):
-                    directors = [raw_dirs]
-            if not year and info.get("year"):
-                year = info["year"]
-
-        # Skip films without a proper title
-        if not title:
-            skipped_no_title += 1
-            continue
-
-        # Ensure directors is always a list of strings
-        if directors is None:
-            directors = []
-
-        # Build per-cinema showings (always include cinema even if no dates)
-        cinema_showings: Dict[str, List[CinemaShowing]] = {}
-        for cinema_name, listing in cinema_listings.items():
-            when_list = listing.get("when", [])
-            dates: List[CinemaShowing] = []
-            if isinstance(when_list, list):
-                for entry in when_list:
-                    d = entry.get("date", "")
-                    if isinstance(d, str) and d:
-                        dates.append(CinemaShowing(
-                            date=d,
-                            showtimes=entry.get("showtimes", []),
-                        ))
-            cinema_showings[cinema_name] = dates
-
-        films[db_id_str] = AvailableFilmSummary(
-            title=title,
-            directors=directors,
-            year=year,
-            cinema_count=len(cinema_listings),
-            cinemas=list(cinema_listings.keys()),
-            cinema_showings=cinema_showings,
-        )
+    films: Dict[str, AvailableFilmSummary] = {db_id: catalogue["films"][db_id] for db_id in page_ids}
 
     logger.info(
-        "available_films=%d skipped_no_title=%d",
-        len(films), skipped_no_title,
+        "available_films=%d matched=%d returned=%d skipped_no_title=%d source_etag=%s",
+        catalogue["film_count"], len(matched), len(films),
+        catalogue["skipped_no_title"], catalogue["source_etag"],
     )
 
     return {
         "status": "ok",
-        "film_count": len(films),
+        "film_count": len(matched),
+        "returned_count": len(films),
+        "next_cursor": next_cursor,
         "films": films,
     }
@@ -1,43 +1,48 @@
 """
-Route 0: Get list of curators who have filmLists.json files.
+Route 0: Get the list of curators, with per-curator stats.
 
-Lists all "folders" (common prefixes) under:
-  s3://filmfynder/london/filmLists/
+Served from the curators registry (CURATORS_REGISTRY_KEY) with one cached
+GET rather than listing s3://filmfynder/london/filmLists/ on every request.
+If the registry has never been built, it is built here from a full
+paginated scan (see rebuild_curators_registry_handler).
 
-Returns curator names (e.g. ["kinologue", "bfi", ...]).
+Returns curator names (e.g. ["kinologue", "bfi", ...]) and, per curator,
+list_count, film_count and latest_end_date.
+
+get_curators_source_etags reports the registry's ETag for HTTP ETag / 304
+handling; there is none until the registry has been built.
 """
 
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
-from core.s3 import get_s3_client
-from config import S3_BUCKET, FILM_LISTS_BASE_PREFIX
+from core.s3 import get_s3_client, get_s3_object_etag
+from core.types.custom_lists import CuratorsRegistry
+from handlers.custom_lists.rebuild_curators_registry_handler import load_or_rebuild_curators_registry
+from config import S3_BUCKET, CURATORS_REGISTRY_KEY
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
 
+def get_curators_source_etags(event: Dict[str, Any]) -> Optional[List[Optional[str]]]:
+    etag = get_s3_object_etag(get_s3_client(), S3_BUCKET, CURATORS_REGISTRY_KEY)
+    return [etag] if etag is not None else None
+
+
 def get_curators_handler(event: Dict[str, Any], context=None) -> Dict[str, Any]:
     logger.info("get_curators_handler called")
 
     s3 = get_s3_client()
 
-    prefix = f"{FILM_LISTS_BASE_PREFIX}/"
-    response = s3.list_objects_v2(
-        Bucket=S3_BUCKET,
-        Prefix=prefix,
-        Delimiter="/",
-    )
+    registry: CuratorsRegistry = load_or_rebuild_curators_registry(s3)
 
-    curators = []
-    for cp in response.get("CommonPrefixes", []):
-        # cp["Prefix"] looks like "london/filmLists/kinologue/"
-        curator_name = cp["Prefix"].rstrip("/").split("/")[-1]
-        curators.append(curator_name)
+    curators = sorted(registry["curators"])
 
     logger.info("Found %d curators", len(curators))
 
     return {
         "status": "ok",
         "curators": curators,
+        "curator_stats": {name: registry["curators"][name] for name in curators},
     }
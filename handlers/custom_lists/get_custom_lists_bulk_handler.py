@@ -0,0 +1,74 @@
+"""
+Get custom lists for many curators in one call.
+
+Payload:
+  curators   list of curator names, or "all" for every curator in the registry
+
+Each curator's lists are fetched concurrently on a bounded thread pool
+sharing the one S3 client, so the call takes about as long as the slowest
+single fetch. A curator that fails to load is reported under "errors"
+and does not fail the others; status is "partial" when some failed.
+Normalized films are hydrated from one shared cached pan_cinema_listings.json.
+"""
+
+import logging
+from typing import Any, Dict, List, Union
+
+from core.concurrency import fanout_status, run_concurrently
+from core.curator_store import load_curator_film_lists
+from core.curators_registry import resolve_curators
+from core.list_films import hydrate_film_lists, needs_hydration
+from core.s3 import get_s3_client, download_json_from_s3
+from core.types.custom_lists import CuratorFilmLists
+from handlers.custom_lists.rebuild_curators_registry_handler import load_or_rebuild_curators_registry
+from config import S3_BUCKET, PAN_CINEMA_LISTINGS_KEY
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+MAX_BULK_CURATORS = 200
+
+
+def get_custom_lists_bulk_handler(event: Dict[str, Any], context=None) -> Dict[str, Any]:
+    requested: Union[str, List[str]] = event.get("curators") or []
+
+    s3 = get_s3_client()
+
+    if not requested:
+        raise ValueError("Missing required field: curators (a list of names or \"all\")")
+    if isinstance(requested, list) and len(requested) > MAX_BULK_CURATORS:
+        raise ValueError(f"Too many curators ({len(requested)}), max {MAX_BULK_CURATORS}; use \"all\"")
+    # Only "curators" is accepted here, not a single "curator"
+    curators = resolve_curators(
+        {"curators": requested}, lambda: sorted(load_or_rebuild_curators_registry(s3)["curators"])
+    )
+
+    logger.info("get_custom_lists_bulk_handler curators=%d", len(curators))
+
+    outcomes = run_concurrently(
+        lambda curator: load_curator_film_lists(s3, curator, missing_ok=True)[0], curators
+    )
+
+    lists_by_curator: Dict[str, CuratorFilmLists] = {}
+    errors: Dict[str, str] = {}
+    for outcome in outcomes:
+        if outcome.error is not None:
+            logger.warning("failed to load lists for curator '%s': %s", outcome.item, outcome.error)
+            errors[outcome.item] = str(outcome.error)
+        else:
+            lists_by_curator[outcome.item] = outcome.value
+
+    if any(needs_hydration(film_lists) for film_lists in lists_by_curator.values()):
+        pan_listings = download_json_from_s3(s3, S3_BUCKET, PAN_CINEMA_LISTINGS_KEY, cached=True)
+        for film_lists in lists_by_curator.values():
+            hydrate_film_lists(film_lists, pan_listings)
+
+    return {
+        "status": fanout_status(list(lists_by_curator), errors),
+        "curator_count": len(lists_by_curator),
+        "results": {
+            curator: {"lists_count": len(film_lists), "film_lists": film_lists}
+            for curator, film_lists in lists_by_curator.items()
+        },
+        "errors": errors,
+    }
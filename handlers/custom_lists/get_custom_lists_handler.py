@@ -2,37 +2,96 @@
 Route 1: Get custom lists for a given curator.
 
 Downloads s3://filmfynder/london/filmLists/{curator}/filmLists.json
-and returns the list of CustomList objects.
+and returns the list of CustomList objects. Films stored in normalized
+form are hydrated with their current cinema_listings from the cached
+pan_cinema_listings.json.
+
+Optional payload fields:
+  list_name   return just that list; in the sharded layout only the
+              manifest and that one list object are downloaded
+  view        "full" (default) or "summary": metadata, film_count and each
+              film's db_id, title and caption, without cinema_listings
+  fields      keep only these list-level keys of the chosen view
+
+See core/list_views.py. Listings are only hydrated when list_films is
+returned, and a summary without films is served from list metadata.
+
+get_custom_lists_source_etags gives the entrypoint the S3 ETags the
+response depends on, for HTTP ETag / 304 handling (core/conditional.py).
 """
 
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
-from core.s3 import get_s3_client, download_json_from_s3
-from core.types.custom_lists import CuratorFilmLists, validate_curator_film_lists
-from config import S3_BUCKET, FILM_LISTS_BASE_PREFIX, FILM_LISTS_FILENAME
+from core.concurrency import gather
+from core.curator_store import (
+    curator_journal_head,
+    curator_root_key,
+    load_curator_film_lists,
+    load_curator_list_metadata,
+)
+from core.film_catalogue import load_film_catalogue
+from core.list_views import FILMS_FIELD, parse_view, project_fields, summarise_custom_list
+from core.s3 import get_s3_client, download_json_from_s3, get_s3_object_etag
+from core.list_films import hydrate_film_lists, needs_hydration
+from config import S3_BUCKET, PAN_CINEMA_LISTINGS_KEY
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
 
+def get_custom_lists_source_etags(event: Dict[str, Any]) -> List[Optional[str]]:
+    """ETags of the curator's root object (filmLists.json or the manifest) and,
+    when films are returned, of the pan listings they are hydrated from; plus
+    the newest journal entry's key when the journal is on."""
+    view, fields = parse_view(event)
+    s3 = get_s3_client()
+    curator = event["curator"]
+    keys = [curator_root_key(curator)]
+    if FILMS_FIELD[view] in fields:
+        keys.append(PAN_CINEMA_LISTINGS_KEY)
+    return gather(
+        *(lambda key=key: get_s3_object_etag(s3, S3_BUCKET, key) for key in keys),
+        lambda: curator_journal_head(s3, curator),
+    )
+
+
 def get_custom_lists_handler(event: Dict[str, Any], context=None) -> Dict[str, Any]:
     curator: str = event["curator"]
-    logger.info("get_custom_lists_handler curator=%s", curator)
+    list_name: Optional[str] = event.get("list_name") or None
+    view, fields = parse_view(event)
+    logger.info(
+        "get_custom_lists_handler curator=%s list_name=%s view=%s fields=%s",
+        curator, list_name, view, ",".join(fields),
+    )
 
     s3 = get_s3_client()
-    key = f"{FILM_LISTS_BASE_PREFIX}/{curator}/{FILM_LISTS_FILENAME}"
+    list_names = [list_name] if list_name else None
+    with_films = FILMS_FIELD[view] in fields
 
-    try:
-        raw = download_json_from_s3(s3, S3_BUCKET, key)
-    except FileNotFoundError:
-        raw = []
+    lists: List[Dict[str, Any]]
+    if view == "summary" and not with_films:
+        lists = load_curator_list_metadata(s3, curator, missing_ok=True, list_names=list_names)
+    else:
+        film_lists, _ = load_curator_film_lists(s3, curator, missing_ok=True, list_names=list_names)
+        if view == "summary":
+            catalogue_films = load_film_catalogue(s3)["films"] if needs_hydration(film_lists) else {}
+            lists = [summarise_custom_list(fl, catalogue_films) for fl in film_lists]
+        else:
+            if with_films and needs_hydration(film_lists):
+                pan_listings = download_json_from_s3(s3, S3_BUCKET, PAN_CINEMA_LISTINGS_KEY, cached=True)
+                hydrate_film_lists(film_lists, pan_listings)
+            lists = film_lists
 
-    film_lists: CuratorFilmLists = validate_curator_film_lists(raw, curator)
+    if list_name and not lists:
+        raise ValueError(f"List '{list_name}' not found for curator '{curator}'")
+    if event.get("fields") is not None:
+        lists = project_fields(lists, fields)
 
     return {
         "status": "ok",
         "curator": curator,
-        "lists_count": len(film_lists),
-        "film_lists": film_lists,
+        "view": view,
+        "lists_count": len(lists),
+        "film_lists": lists,
     }
@@ -0,0 +1,49 @@
+"""
+Route 6: Which curator lists feature a film?
+
+Payload specifies db_id. Answered with one GET of the film's entry in the
+reverse film index ({FILM_LISTS_INDEX_PREFIX}/{db_id}.json), kept current
+by list updates and regenerated by rebuild_film_index. A film in no list
+(or never indexed) returns no lists.
+
+get_lists_for_film_source_etags reports the entry's ETag for HTTP ETag /
+304 handling; there is none for a film without an entry.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from core.film_lists_index import film_index_key, load_film_index_entry
+from core.s3 import get_s3_client, get_s3_object_etag
+from config import S3_BUCKET
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+def _db_id(event: Dict[str, Any]) -> int:
+    db_id = event["db_id"]
+    if isinstance(db_id, bool) or not isinstance(db_id, (int, str)) or not str(db_id).isdigit():
+        raise ValueError(f"db_id must be a non-negative integer, got {db_id!r}")
+    return int(db_id)
+
+
+def get_lists_for_film_source_etags(event: Dict[str, Any]) -> Optional[List[Optional[str]]]:
+    etag = get_s3_object_etag(get_s3_client(), S3_BUCKET, film_index_key(_db_id(event)))
+    return [etag] if etag is not None else None
+
+
+def get_lists_for_film_handler(event: Dict[str, Any], context=None) -> Dict[str, Any]:
+    db_id = _db_id(event)
+
+    logger.info("get_lists_for_film_handler db_id=%d", db_id)
+
+    entry, _ = load_film_index_entry(get_s3_client(), db_id)
+
+    return {
+        "status": "ok",
+        "db_id": db_id,
+        "list_count": len(entry["lists"]),
+        "lists": entry["lists"],
+    }
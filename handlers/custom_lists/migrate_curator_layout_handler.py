@@ -0,0 +1,110 @@
+"""
+Migrate curators from the single filmLists.json layout to the sharded
+layout (one object per list plus manifest.json, see core/curator_shards.py).
+
+Payload:
+  curator          the curator to migrate; omit to migrate every curator
+  overwrite        default false: skip curators that already have a manifest;
+                   true: rebuild the manifest from filmLists.json
+  delete_source    default false: delete filmLists.json once migrated
+
+Run this before switching FILM_LISTS_LAYOUT to "sharded", and again with
+overwrite=true for any curator edited in between. Re-running is safe.
+Curators with pending list journal entries are skipped, since the sharded
+layout would not include them: run compact_curator for them first.
+"""
+
+import logging
+from typing import Any, Dict
+
+from core.curator_journal import JOURNAL_SEQ_METADATA, list_journal
+from core.curator_shards import (
+    curator_manifest_key,
+    delete_list_versions,
+    load_manifest,
+    write_sharded_film_lists,
+)
+from core.curator_store import curator_lists_key
+from core.curators_registry import scan_curator_names
+from core.s3 import (
+    PreconditionFailedError,
+    get_s3_client,
+    download_json_with_metadata_from_s3,
+    get_s3_object_etag,
+)
+from core.types.custom_lists import validate_curator_film_lists
+from config import S3_BUCKET
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+def _migrate_curator(s3, curator: str, overwrite: bool, delete_source: bool) -> Dict[str, Any]:
+    try:
+        raw, source_etag, metadata = download_json_with_metadata_from_s3(s3, S3_BUCKET, curator_lists_key(curator))
+    except FileNotFoundError:
+        return {"curator": curator, "status": "skipped", "reason": "no filmLists.json"}
+    film_lists = validate_curator_film_lists(raw, curator)
+
+    # filmLists.json alone would lose the edits not yet folded into it
+    base_seq = int(metadata.get(JOURNAL_SEQ_METADATA, 0))
+    pending = sum(1 for obj in list_journal(s3, curator) if obj.seq > base_seq)
+    if pending:
+        return {
+            "curator": curator,
+            "status": "skipped",
+            "reason": f"{pending} pending journal entries, run compact_curator first",
+        }
+
+    existing, manifest_etag = load_manifest(s3, curator, missing_ok=True)
+    if manifest_etag is not None and not overwrite:
+        return {"curator": curator, "status": "skipped", "reason": "already migrated"}
+
+    try:
+        manifest = write_sharded_film_lists(s3, curator, film_lists, manifest_etag)
+    except PreconditionFailedError:
+        return {"curator": curator, "status": "skipped", "reason": "manifest changed during migration"}
+
+    # Versions the replaced manifest pointed at
+    delete_list_versions(s3, curator, existing["lists"])
+
+    source_deleted = False
+    if delete_source:
+        # Only delete the exact version that was migrated
+        if get_s3_object_etag(s3, S3_BUCKET, curator_lists_key(curator)) == source_etag:
+            s3.delete_object(Bucket=S3_BUCKET, Key=curator_lists_key(curator))
+            source_deleted = True
+        else:
+            logger.warning("filmLists.json for '%s' changed during migration, keeping it", curator)
+
+    return {
+        "curator": curator,
+        "status": "ok",
+        "lists": len(manifest["lists"]),
+        "films": sum(entry["film_count"] for entry in manifest["lists"]),
+        "source_deleted": source_deleted,
+        "output_uri": f"s3://{S3_BUCKET}/{curator_manifest_key(curator)}",
+    }
+
+
+def migrate_curator_layout_handler(event: Dict[str, Any], context=None) -> Dict[str, Any]:
+    curator: str = (event.get("curator") or "").strip()
+    overwrite = bool(event.get("overwrite", False))
+    delete_source = bool(event.get("delete_source", False))
+
+    s3 = get_s3_client()
+    curators = [curator] if curator else scan_curator_names(s3)
+
+    logger.info(
+        "migrate_curator_layout_handler curators=%d overwrite=%s delete_source=%s",
+        len(curators), overwrite, delete_source,
+    )
+
+    results = [_migrate_curator(s3, name, overwrite, delete_source) for name in curators]
+
+    return {
+        "status": "ok",
+        "migrated": sum(1 for r in results if r["status"] == "ok"),
+        "skipped": sum(1 for r in results if r["status"] == "skipped"),
+        "results": results,
+    }
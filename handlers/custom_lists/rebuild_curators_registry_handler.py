@@ -0,0 +1,87 @@
+"""
+Rebuild the curators registry from a full scan of the curator folders.
+
+Lists every prefix under s3://filmfynder/london/filmLists/ (following
+pagination), computes each curator's stats from their lists (or manifest)
+and replaces CURATORS_REGISTRY_KEY. Use after curators are added or edited
+outside this service; get_curators also runs it once if the registry is missing.
+"""
+
+import logging
+from typing import Any, Dict, Optional
+
+from core.concurrency import run_concurrently
+from core.curator_store import load_curator_stats
+from core.curators_registry import (
+    empty_registry,
+    load_curators_registry,
+    save_curators_registry,
+    scan_curator_names,
+)
+from core.s3 import PreconditionFailedError, get_s3_client
+from core.types.custom_lists import CuratorsRegistry
+from config import S3_BUCKET, CURATORS_REGISTRY_KEY, CURATOR_WRITE_MAX_ATTEMPTS
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+def build_curators_registry(s3) -> CuratorsRegistry:
+    """Scan every curator and compute their stats (no write).
+
+    Curators are loaded concurrently; the first failure is raised once all
+    have been tried, so a registry never leaves a curator out.
+    """
+    registry = empty_registry()
+    outcomes = run_concurrently(lambda curator: load_curator_stats(s3, curator), scan_curator_names(s3))
+    for outcome in outcomes:
+        if outcome.error is not None:
+            raise outcome.error
+        registry["curators"][outcome.item] = outcome.value
+    return registry
+
+
+def rebuild_curators_registry(s3) -> CuratorsRegistry:
+    """Build and store the registry, rescanning if it changes underneath."""
+    for attempt in range(1, CURATOR_WRITE_MAX_ATTEMPTS + 1):
+        etag: Optional[str]
+        try:
+            _, etag = load_curators_registry(s3)
+        except FileNotFoundError:
+            etag = None
+
+        registry = build_curators_registry(s3)
+        try:
+            save_curators_registry(s3, registry, etag)
+            return registry
+        except PreconditionFailedError:
+            logger.warning(
+                "curators registry changed during rebuild (attempt %d/%d), rescanning",
+                attempt, CURATOR_WRITE_MAX_ATTEMPTS,
+            )
+
+    raise RuntimeError(f"Gave up rebuilding the curators registry after {CURATOR_WRITE_MAX_ATTEMPTS} attempts")
+
+
+def load_or_rebuild_curators_registry(s3) -> CuratorsRegistry:
+    """The stored registry (cached, do not mutate), built from a scan if missing."""
+    try:
+        registry, _ = load_curators_registry(s3)
+        return registry
+    except FileNotFoundError:
+        logger.warning("curators registry missing, building it from a full scan")
+        return rebuild_curators_registry(s3)
+
+
+def rebuild_curators_registry_handler(event: Dict[str, Any], context=None) -> Dict[str, Any]:
+    logger.info("rebuild_curators_registry_handler called")
+
+    registry = rebuild_curators_registry(get_s3_client())
+
+    logger.info("curators registry rebuilt curators=%d", len(registry["curators"]))
+
+    return {
+        "status": "ok",
+        "curator_count": len(registry["curators"]),
+        "output_uri": f"s3://{S3_BUCKET}/{CURATORS_REGISTRY_KEY}",
+    }
@@ -0,0 +1,56 @@
+"""
+Rebuild the reverse film index (db_id -> curator lists) from a full scan.
+
+Lists every curator folder, loads each curator's lists concurrently and
+rewrites {FILM_LISTS_INDEX_PREFIX}/{db_id}.json for every film whose
+entry changed, deleting entries of films no longer in any list. Use after
+lists are edited outside this service, after a best-effort incremental
+update failed, or to seed the index for the first time.
+
+If any curator cannot be read, nothing is written: the scan would
+otherwise drop that curator's lists from the index.
+"""
+
+import logging
+from typing import Any, Dict
+
+from core.concurrency import run_concurrently
+from core.curator_store import load_curator_film_lists
+from core.curators_registry import scan_curator_names
+from core.film_lists_index import film_index_from_lists, write_film_index
+from core.s3 import get_s3_client
+from config import S3_BUCKET, FILM_LISTS_INDEX_PREFIX
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+def rebuild_film_index_handler(event: Dict[str, Any], context=None) -> Dict[str, Any]:
+    logger.info("rebuild_film_index_handler called")
+
+    s3 = get_s3_client()
+    curators = scan_curator_names(s3)
+
+    outcomes = run_concurrently(lambda curator: load_curator_film_lists(s3, curator, missing_ok=True)[0], curators)
+    errors = {outcome.item: str(outcome.error) for outcome in outcomes if outcome.error is not None}
+    if errors:
+        logger.warning("film index rebuild aborted, unreadable curators: %s", errors)
+        return {
+            "status": "error",
+            "curator_count": len(curators),
+            "written": False,
+            "errors": errors,
+        }
+
+    index = film_index_from_lists((outcome.item, outcome.value) for outcome in outcomes)
+    counts = write_film_index(s3, index)
+
+    logger.info("film index rebuilt curators=%d %s", len(curators), counts)
+
+    return {
+        "status": "ok" if counts["errors"] == 0 else "partial",
+        "curator_count": len(curators),
+        "written": True,
+        **counts,
+        "output_uri": f"s3://{S3_BUCKET}/{FILM_LISTS_INDEX_PREFIX}/",
+    }
@@ -0,0 +1,128 @@
+"""
+Re-filter or rebuild the active lists feed (ACTIVE_LISTS_FEED_KEY).
+
+Payload:
+  rescan   false (default): drop lists whose end_date has passed, with one
+           cached read and at most one write. Schedule this daily, e.g. an
+           EventBridge rule invoking {"handler": "refresh_active_lists"}.
+           true: rebuild the feed from a full scan, loading every
+           curator's lists concurrently. Use after lists are edited
+           outside this service or an incremental update failed.
+
+A missing feed is always rebuilt from a scan. Curators that cannot be read
+during a scan keep their current entries and are reported under errors.
+"""
+
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+from core.active_lists import (
+    empty_feed,
+    load_active_lists_feed,
+    prune_active_lists_feed,
+    save_active_lists_feed,
+    summarise_unended_lists,
+    today,
+)
+from core.concurrency import run_concurrently
+from core.curator_store import load_curator_film_lists
+from core.curators_registry import scan_curator_names
+from core.s3 import PreconditionFailedError, get_s3_client
+from core.types.custom_lists import ActiveListsFeed
+from config import S3_BUCKET, ACTIVE_LISTS_FEED_KEY, CURATOR_WRITE_MAX_ATTEMPTS
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+def build_active_lists_feed(s3, current: Optional[ActiveListsFeed]) -> Tuple[ActiveListsFeed, Dict[str, str]]:
+    """Scan every curator and summarise their unended lists (no write).
+
+    Returns the feed and the curators that could not be read, whose
+    entries are carried over from ``current``.
+    """
+    on = today()
+    curators = scan_curator_names(s3)
+    outcomes = run_concurrently(
+        lambda curator: summarise_unended_lists(s3, load_curator_film_lists(s3, curator, missing_ok=True)[0], on),
+        curators,
+    )
+
+    feed = empty_feed()
+    errors: Dict[str, str] = {}
+    for outcome in outcomes:
+        if outcome.error is None:
+            feed["lists"].extend(outcome.value)
+            continue
+        logger.warning("could not summarise lists of curator '%s': %s", outcome.item, outcome.error)
+        errors[outcome.item] = str(outcome.error)
+        if current is not None:
+            feed["lists"].extend(
+                s for s in current["lists"] if s["list_curator"] == outcome.item and s["end_date"] >= on
+            )
+    feed["lists"].sort(key=lambda s: s["list_curator"])
+    return feed, errors
+
+
+def rebuild_active_lists_feed(s3) -> Tuple[ActiveListsFeed, Dict[str, str]]:
+    """Build and store the feed, rescanning if it changes underneath."""
+    for attempt in range(1, CURATOR_WRITE_MAX_ATTEMPTS + 1):
+        current: Optional[ActiveListsFeed]
+        etag: Optional[str]
+        try:
+            current, etag = load_active_lists_feed(s3)
+        except FileNotFoundError:
+            current, etag = None, None
+
+        feed, errors = build_active_lists_feed(s3, current)
+        try:
+            save_active_lists_feed(s3, feed, etag)
+            return feed, errors
+        except PreconditionFailedError:
+            logger.warning(
+                "active lists feed changed during rebuild (attempt %d/%d), rescanning",
+                attempt, CURATOR_WRITE_MAX_ATTEMPTS,
+            )
+
+    raise RuntimeError(f"Gave up rebuilding the active lists feed after {CURATOR_WRITE_MAX_ATTEMPTS} attempts")
+
+
+def load_or_rebuild_active_lists_feed(s3) -> ActiveListsFeed:
+    """The stored feed (cached, do not mutate), built from a scan if missing."""
+    try:
+        feed, _ = load_active_lists_feed(s3)
+        return feed
+    except FileNotFoundError:
+        logger.warning("active lists feed missing, building it from a full scan")
+        feed, _ = rebuild_active_lists_feed(s3)
+        return feed
+
+
+def refresh_active_lists_handler(event: Dict[str, Any], context=None) -> Dict[str, Any]:
+    rescan = bool(event.get("rescan", False))
+    logger.info("refresh_active_lists_handler rescan=%s", rescan)
+
+    s3 = get_s3_client()
+    dropped = 0
+    errors: Dict[str, str] = {}
+    if not rescan:
+        try:
+            feed, dropped = prune_active_lists_feed(s3)
+        except FileNotFoundError:
+            logger.warning("active lists feed missing, building it from a full scan")
+            rescan = True
+    if rescan:
+        feed, errors = rebuild_active_lists_feed(s3)
+
+    logger.info(
+        "active lists feed refreshed lists=%d dropped=%d errors=%d", len(feed["lists"]), dropped, len(errors)
+    )
+
+    return {
+        "status": "ok" if not errors else "partial",
+        "rescanned": rescan,
+        "lists_dropped": dropped,
+        "list_count": len(feed["lists"]),
+        "errors": errors,
+        "output_uri": f"s3://{S3_BUCKET}/{ACTIVE_LISTS_FEED_KEY}",
+    }
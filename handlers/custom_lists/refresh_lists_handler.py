@@ -0,0 +1,174 @@
+"""
+Refresh the cinema_listings embedded in ListFilm entries from the current
+pan_cinema_listings.json.
+
+Payload:
+  curator / curators   one curator, a list of curators, or "all" (default)
+  dry_run              default false: report what would change without writing
+
+Each embedded film's listing_hash (computed on the fly for films stored
+without one) is compared with the hash of its current pan listing, and
+only films whose listing actually changed are rewritten, with the cinemas
+added and removed reported. Films no longer in the pan listings are kept
+as they are and reported as dropped. Curators with no changed films are
+not written at all. Normalized films (ListFilmRef) are hydrated on read
+and are always current, so they are skipped.
+
+Curators are refreshed concurrently; run after every upstream publish.
+"""
+
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core.concurrency import fanout_status, prefetch, run_concurrently
+from core.curator_store import update_curator_film_lists
+from core.curators_registry import resolve_curators
+from core.list_films import is_hydrated, listing_hash
+from core.s3 import get_s3_client, download_json_from_s3
+from core.types.custom_lists import CuratorFilmLists
+from core.types.film_listings import PanCinemaCleanedCompactedListings
+from handlers.custom_lists.rebuild_curators_registry_handler import load_or_rebuild_curators_registry
+from config import S3_BUCKET, PAN_CINEMA_LISTINGS_KEY
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+class _NoWrite(Exception):
+    """Raised from the mutation to leave the curator's lists unwritten."""
+
+    def __init__(self, report: Dict[str, Any]):
+        super().__init__("nothing to write")
+        self.report = report
+
+
+def refresh_film_lists_mutation(
+    curator: str,
+    pan_listings: PanCinemaCleanedCompactedListings,
+    current_hashes: Dict[str, str],
+    dry_run: bool = False,
+) -> Callable[[CuratorFilmLists], Dict[str, Any]]:
+    """Return the in-memory edit that refreshes every stale embedded film.
+
+    ``current_hashes`` memoises db_id -> hash of the current pan listing and
+    may be shared between curators. Raises _NoWrite (carrying the report)
+    when nothing changed or for a dry run.
+    """
+
+    def _current_hash(str_id: str) -> str:
+        h = current_hashes.get(str_id)
+        if h is None:
+            h = current_hashes[str_id] = listing_hash(pan_listings[str_id])
+        return h
+
+    def _refresh(film_lists: CuratorFilmLists) -> Dict[str, Any]:
+        refreshed: List[Dict[str, Any]] = []
+        dropped: List[Dict[str, Any]] = []
+        unstamped: List[Tuple[Dict[str, Any], str]] = []
+        checked = 0
+
+        for custom_list in film_lists:
+            for film in custom_list["list_films"]:
+                if not is_hydrated(film):
+                    continue
+                checked += 1
+                str_id = str(film["db_id"])
+                if str_id not in pan_listings:
+                    dropped.append({"list_name": custom_list["list_name"], "db_id": film["db_id"]})
+                    continue
+
+                new_hash = _current_hash(str_id)
+                stored_hash: Optional[str] = film.get("listing_hash")
+                if not stored_hash:
+                    # Stored before listing_hash existed; stamped below if the file is written anyway
+                    stored_hash = listing_hash(film["cinema_listings"])
+                    unstamped.append((film, stored_hash))
+                if stored_hash == new_hash:
+                    continue
+
+                old_cinemas = set(film["cinema_listings"])
+                new_cinemas = set(pan_listings[str_id])
+                film["cinema_listings"] = pan_listings[str_id]
+                film["listing_hash"] = new_hash
+                refreshed.append({
+                    "list_name": custom_list["list_name"],
+                    "db_id": film["db_id"],
+                    "cinemas_added": sorted(new_cinemas - old_cinemas),
+                    "cinemas_removed": sorted(old_cinemas - new_cinemas),
+                })
+
+        report = {
+            "curator": curator,
+            "status": "ok",
+            "written": bool(refreshed) and not dry_run,
+            "films_checked": checked,
+            "films_refreshed": refreshed,
+            "films_dropped": dropped,
+        }
+        if not report["written"]:
+            raise _NoWrite(report)
+        for film, stored_hash in unstamped:
+            film.setdefault("listing_hash", stored_hash)
+        return report
+
+    return _refresh
+
+
+def _refresh_curator(
+    s3,
+    curator: str,
+    pan_listings: PanCinemaCleanedCompactedListings,
+    current_hashes: Dict[str, str],
+    dry_run: bool,
+) -> Dict[str, Any]:
+    mutation = refresh_film_lists_mutation(curator, pan_listings, current_hashes, dry_run)
+    try:
+        return update_curator_film_lists(s3, curator, mutation)
+    except _NoWrite as skipped:
+        return skipped.report
+
+
+def refresh_lists_handler(event: Dict[str, Any], context=None) -> Dict[str, Any]:
+    dry_run = bool(event.get("dry_run", False))
+
+    s3 = get_s3_client()
+
+    # Shared cached copy, read-only: refreshed films point at its objects.
+    # Fetched while the curators are resolved (possibly a registry read).
+    pan_future = prefetch(download_json_from_s3, s3, S3_BUCKET, PAN_CINEMA_LISTINGS_KEY, cached=True)
+
+    curators = resolve_curators(event, lambda: sorted(load_or_rebuild_curators_registry(s3)["curators"]))
+
+    logger.info("refresh_lists_handler curators=%d dry_run=%s", len(curators), dry_run)
+
+    pan_listings: PanCinemaCleanedCompactedListings = pan_future.result()
+    current_hashes: Dict[str, str] = {}
+
+    outcomes = run_concurrently(
+        lambda curator: _refresh_curator(s3, curator, pan_listings, current_hashes, dry_run), curators
+    )
+
+    results: List[Dict[str, Any]] = []
+    errors: Dict[str, str] = {}
+    for outcome in outcomes:
+        if outcome.error is not None:
+            logger.warning("refresh failed for curator '%s': %s", outcome.item, outcome.error)
+            errors[outcome.item] = str(outcome.error)
+        else:
+            results.append(outcome.value)
+
+    films_refreshed = sum(len(r["films_refreshed"]) for r in results)
+    logger.info(
+        "refresh_lists curators=%d written=%d films_refreshed=%d errors=%d",
+        len(curators), sum(1 for r in results if r["written"]), films_refreshed, len(errors),
+    )
+
+    return {
+        "status": fanout_status(results, errors),
+        "dry_run": dry_run,
+        "curators_checked": len(results),
+        "curators_written": sum(1 for r in results if r["written"]),
+        "films_refreshed": films_refreshed,
+        "results": results,
+        "errors": errors,
+    }
@@ -5,57 +5,59 @@ Payload specifies curator, list_name, and db_id of the film to remove.
 """
 
 import logging
-from typing import Dict, Any
+from typing import Callable, Dict, Any
 
-from core.s3 import get_s3_client, download_json_from_s3, upload_dict_to_s3
-from core.types.custom_lists import CuratorFilmLists, validate_curator_film_lists
-from config import S3_BUCKET, FILM_LISTS_BASE_PREFIX, FILM_LISTS_FILENAME
+from core.curator_store import curator_lists_uri, find_custom_list, update_curator_film_lists
+from core.s3 import get_s3_client
+from core.types.custom_lists import CuratorFilmLists
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
 
-def remove_film_from_list_handler(event: Dict[str, Any], context=None) -> Dict[str, Any]:
+def remove_film_from_list_mutation(event: Dict[str, Any]) -> Callable[[CuratorFilmLists], Dict[str, Any]]:
+    """Validate the payload and return the in-memory edit that removes the film."""
     curator: str = event["curator"]
     list_name: str = event["list_name"]
     db_id: int = event["db_id"]
 
-    logger.info(
-        "remove_film_from_list_handler curator=%s list_name=%s db_id=%d",
-        curator, list_name, db_id,
-    )
+    def _remove(film_lists: CuratorFilmLists) -> Dict[str, Any]:
+        target_list = find_custom_list(film_lists, curator, list_name)
 
-    s3 = get_s3_client()
-    lists_key = f"{FILM_LISTS_BASE_PREFIX}/{curator}/{FILM_LISTS_FILENAME}"
-    raw = download_json_from_s3(s3, S3_BUCKET, lists_key)
-    film_lists: CuratorFilmLists = validate_curator_film_lists(raw, curator)
+        original_count = len(target_list["list_films"])
+        target_list["list_films"] = [
+            f for f in target_list["list_films"] if f["db_id"] != db_id
+        ]
+        removed = original_count - len(target_list["list_films"])
+
+        if removed == 0:
+            raise ValueError(f"Film with db_id={db_id} not found in list '{list_name}'")
+
+        return {
+            "status": "ok",
+            "curator": curator,
+            "list_name": list_name,
+            "removed_db_id": db_id,
+            "remaining_films": len(target_list["list_films"]),
+        }
 
-    # Find target list
-    target_list = None
-    for fl in film_lists:
-        if fl["list_name"] == list_name:
-            target_list = fl
-            break
+    return _remove
 
-    if target_list is None:
-        raise ValueError(f"List '{list_name}' not found for curator '{curator}'")
 
-    original_count = len(target_list["list_films"])
-    target_list["list_films"] = [
-        f for f in target_list["list_films"] if f["db_id"] != db_id
-    ]
-    removed = original_count - len(target_list["list_films"])
+def remove_film_from_list_handler(event: Dict[str, Any], context=None) -> Dict[str, Any]:
+    curator: str = event["curator"]
 
-    if removed == 0:
-        raise ValueError(f"Film with db_id={db_id} not found in list '{list_name}'")
+    logger.info(
+        "remove_film_from_list_handler curator=%s list_name=%s db_id=%d",
+        curator, event["list_name"], event["db_id"],
+    )
 
-    upload_dict_to_s3(s3, S3_BUCKET, lists_key, film_lists)
+    s3 = get_s3_client()
+    result = update_curator_film_lists(
+        s3, curator, remove_film_from_list_mutation(event), list_names=[event["list_name"]]
+    )
 
     return {
-        "status": "ok",
-        "curator": curator,
-        "list_name": list_name,
-        "removed_db_id": db_id,
-        "remaining_films": len(target_list["list_films"]),
-        "output_uri": f"s3://{S3_BUCKET}/{lists_key}",
+        **result,
+        "output_uri": curator_lists_uri(curator),
     }
@@ -0,0 +1,63 @@
+"""
+Ranked, typo-tolerant film search for the UI film picker.
+
+Searches the film catalogue's titles, the original titles cinemas listed
+films under and directors, tolerating misspellings and partial or
+partly-typed titles (see core/film_search.py), and returns the best
+matches first. The index is built once per pan listings version and kept
+in the container, so a warm query takes milliseconds.
+
+Payload:
+  query    text to search for (at least two letters or digits)
+  limit    number of results, 1-100 (default 20)
+
+Each result has db_id, title, year, directors, which field matched best
+and a 0-1 score. Like get_available_films, the response depends only on
+the payload and the pan listings version, which
+search_films_source_etags reports for HTTP ETag / 304 handling.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from core.film_catalogue import load_film_catalogue
+from core.film_search import get_film_search_index, normalise
+from core.s3 import get_s3_client, get_s3_object_etag
+from config import S3_BUCKET, PAN_CINEMA_LISTINGS_KEY
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+
+def search_films_source_etags(event: Dict[str, Any]) -> List[Optional[str]]:
+    return [get_s3_object_etag(get_s3_client(), S3_BUCKET, PAN_CINEMA_LISTINGS_KEY)]
+
+
+def search_films_handler(event: Dict[str, Any], context=None) -> Dict[str, Any]:
+    query = event.get("query")
+    if not isinstance(query, str) or len(normalise(query).replace(" ", "")) < 2:
+        raise ValueError("query must contain at least two letters or digits")
+
+    try:
+        limit = int(event.get("limit", DEFAULT_LIMIT))
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid limit '{event.get('limit')}', expected an integer")
+    if not 1 <= limit <= MAX_LIMIT:
+        raise ValueError(f"Invalid limit {limit}, expected 1-{MAX_LIMIT}")
+
+    logger.info("search_films_handler query=%r limit=%d", query, limit)
+
+    index = get_film_search_index(load_film_catalogue(get_s3_client()))
+    results = index.search(query, limit)
+
+    logger.info("search_films results=%d entries=%d", len(results), len(index.entry_film))
+
+    return {
+        "status": "ok",
+        "query": query,
+        "result_count": len(results),
+        "results": results,
+    }
@@ -7,11 +7,11 @@ Payload specifies curator, list_name, and any fields to update:
 
 import logging
 import re
-from typing import Dict, Any
+from typing import Callable, Dict, Any
 
-from core.s3 import get_s3_client, download_json_from_s3, upload_dict_to_s3
-from core.types.custom_lists import CuratorFilmLists, validate_curator_film_lists
-from config import S3_BUCKET, FILM_LISTS_BASE_PREFIX, FILM_LISTS_FILENAME
+from core.curator_store import curator_lists_uri, find_custom_list, update_curator_film_lists
+from core.s3 import get_s3_client
+from core.types.custom_lists import CuratorFilmLists
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -21,16 +21,12 @@ DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
 UPDATABLE_FIELDS = {"list_name", "list_caption", "start_date", "end_date"}
 
 
-def update_list_handler(event: Dict[str, Any], context=None) -> Dict[str, Any]:
+def update_list_mutation(event: Dict[str, Any]) -> Callable[[CuratorFilmLists], Dict[str, Any]]:
+    """Validate the payload and return the in-memory edit that updates the list metadata."""
     curator: str = event["curator"]
     list_name: str = event["list_name"]
     updates: Dict[str, str] = event.get("updates", {})
 
-    logger.info(
-        "update_list_handler curator=%s list_name=%s updates=%s",
-        curator, list_name, list(updates.keys()),
-    )
-
     if not updates:
         raise ValueError("No updates provided")
 
@@ -43,32 +39,37 @@ def update_list_handler(event: Dict[str, Any], context=None) -> Dict[str, Any]:
         if date_field in updates and not DATE_PATTERN.match(updates[date_field]):
             raise ValueError(f"Invalid {date_field} format '{updates[date_field]}', expected YYYY-MM-DD")
 
-    s3 = get_s3_client()
-    lists_key = f"{FILM_LISTS_BASE_PREFIX}/{curator}/{FILM_LISTS_FILENAME}"
-    raw = download_json_from_s3(s3, S3_BUCKET, lists_key)
-    film_lists: CuratorFilmLists = validate_curator_film_lists(raw, curator)
+    def _update(film_lists: CuratorFilmLists) -> Dict[str, Any]:
+        target_list = find_custom_list(film_lists, curator, list_name)
 
-    # Find target list
-    target_list = None
-    for fl in film_lists:
-        if fl["list_name"] == list_name:
-            target_list = fl
-            break
+        updated_fields = []
+        for field, value in updates.items():
+            target_list[field] = value
+            updated_fields.append(field)
 
-    if target_list is None:
-        raise ValueError(f"List '{list_name}' not found for curator '{curator}'")
+        return {
+            "status": "ok",
+            "curator": curator,
+            "list_name": target_list["list_name"],
+            "updated_fields": updated_fields,
+        }
 
-    updated_fields = []
-    for field, value in updates.items():
-        target_list[field] = value
-        updated_fields.append(field)
+    return _update
 
-    upload_dict_to_s3(s3, S3_BUCKET, lists_key, film_lists)
+
+def update_list_handler(event: Dict[str, Any], context=None) -> Dict[str, Any]:
+    curator: str = event["curator"]
+
+    logger.info(
+        "update_list_handler curator=%s list_name=%s updates=%s",
+        curator, event["list_name"], list(event.get("updates", {}).keys()),
+    )
+
+    mutation = update_list_mutation(event)
+    s3 = get_s3_client()
+    result = update_curator_film_lists(s3, curator, mutation, list_names=[event["list_name"]])
 
     return {
-        "status": "ok",
-        "curator": curator,
-        "list_name": target_list["list_name"],
-        "updated_fields": updated_fields,
-        "output_uri": f"s3://{S3_BUCKET}/{lists_key}",
+        **result,
+        "output_uri": curator_lists_uri(curator),
     }
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Report the cold-start import cost of the Lambda entrypoint and each handler.
+
+Every measurement runs in a fresh interpreter with ``-X importtime`` so
+nothing is already cached in sys.modules. Run from the project root:
+
+    python local_testing/import_cost_report.py
+    python local_testing/import_cost_report.py --json import_costs.json
+    python local_testing/import_cost_report.py --max-entrypoint-ms 50
+"""
+
+import argparse
+import json
+import pathlib
+import subprocess
+import sys
+from typing import Dict
+
+PROJECT_DIR = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+
+from handlers.custom_lists.entrypoint import HANDLER_REGISTRY  # noqa: E402
+
+ENTRYPOINT_MODULE = "handlers.custom_lists.entrypoint"
+
+# Imported lazily on the first S3 call, reported so its share of a cold start is visible
+EXTRA_MODULES = ["boto3"]
+
+
+def measure_import_ms(module: str, preload: str = "") -> float:
+    """Cumulative import time of ``module`` in a fresh interpreter.
+
+    ``preload`` is imported first and excluded from the measurement, e.g.
+    the entrypoint, so a handler's cost is what dispatch adds on top of it.
+    """
+    code = f"import {preload}\nimport {module}" if preload else f"import {module}"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=PROJECT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    # Lines look like: "import time:       412 |      15034 | handlers.custom_lists.entrypoint"
+    for line in reversed(proc.stderr.splitlines()):
+        parts = [p.strip() for p in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1]) / 1000.0
+    return 0.0
+
+
+def build_report() -> Dict[str, float]:
+    report = {ENTRYPOINT_MODULE: measure_import_ms(ENTRYPOINT_MODULE)}
+    for name in HANDLER_REGISTRY:
+        module = HANDLER_REGISTRY.module_name(name)
+        report[module] = measure_import_ms(module, preload=ENTRYPOINT_MODULE)
+    for module in EXTRA_MODULES:
+        report[module] = measure_import_ms(module, preload=ENTRYPOINT_MODULE)
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--json", help="Write the report to this path")
+    parser.add_argument(
+        "--max-entrypoint-ms",
+        type=float,
+        help="Exit non-zero if importing the entrypoint takes longer than this",
+    )
+    args = parser.parse_args()
+
+    report = build_report()
+
+    print(f"{'module':<70} {'import ms':>10}")
+    for module, ms in report.items():
+        print(f"{module:<70} {ms:>10.1f}")
+
+    if args.json:
+        pathlib.Path(args.json).write_text(json.dumps(report, indent=2))
+        print(f"Wrote {args.json}")
+
+    if args.max_entrypoint_ms is not None and report[ENTRYPOINT_MODULE] > args.max_entrypoint_ms:
+        print(
+            f"Entrypoint import took {report[ENTRYPOINT_MODULE]:.1f} ms "
+            f"(limit {args.max_entrypoint_ms:.1f} ms)"
+        )
+        sys.exit(1)
@@ -40,6 +40,13 @@ if __name__ == "__main__":
     # print("=== get_custom_lists ===")
     # print(json.dumps(invoke("get_custom_lists", {"curator": "kinologue"}), indent=2))
 
+    # 1.05) Summary view: names, dates, film counts and titles only
+    # print(json.dumps(invoke("get_custom_lists", {"curator": "kinologue", "view": "summary"}), indent=2))
+
+    # 1.1) Get lists for every curator in one call
+    # print("=== get_custom_lists_bulk ===")
+    # print(json.dumps(invoke("get_custom_lists_bulk", {"curators": "all"}), indent=2))
+
     # 2) Create a list
     # print("=== create_custom_list ===")
     # print(json.dumps(invoke("create_custom_list", {
@@ -89,3 +96,36 @@ if __name__ == "__main__":
     #     "curator": "kinologue",
     #     "list_name": "Best of 2025",
     # }), indent=2))
+
+    # 6) Batch: build a list in one call (one read, one write)
+    # print("=== batch ===")
+    # print(json.dumps(invoke("batch", {
+    #     "curator": "kinologue",
+    #     "operations": [
+    #         {"handler": "create_custom_list", "list_name": "Best of 2025", "list_caption": "Our picks",
+    #          "start_date": "2025-01-01", "end_date": "2025-12-31"},
+    #         {"handler": "assign_films_to_list", "list_name": "Best of 2025", "db_ids": [12345, 67890]},
+    #         {"handler": "update_list_film_caption", "list_name": "Best of 2025", "db_id": 67890,
+    #          "new_caption": "A stunning debut feature"},
+    #     ],
+    # }), indent=2))
+
+    # 7) Refresh embedded listings that changed upstream (dry run first)
+    # print("=== refresh_lists ===")
+    # print(json.dumps(invoke("refresh_lists", {"curators": "all", "dry_run": True}), indent=2))
+
+    # 8) Fold list journals into filmLists.json (FILM_LISTS_JOURNAL_ENABLED)
+    # print("=== compact_curator ===")
+    # print(json.dumps(invoke("compact_curator", {"curator": "kinologue"}), indent=2))
+
+    # 9) Which lists feature a film?
+    # print("=== get_lists_for_film ===")
+    # print(json.dumps(invoke("get_lists_for_film", {"db_id": 6114}), indent=2))
+
+    # 10) Every curator's lists running today
+    # print("=== get_active_lists ===")
+    # print(json.dumps(invoke("get_active_lists", {}), indent=2))
+
+    # 11) Search films by title or director, typos allowed
+    # print("=== search_films ===")
+    # print(json.dumps(invoke("search_films", {"query": "tokio story", "limit": 5}), indent=2))
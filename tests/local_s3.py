@@ -0,0 +1,17 @@
+"""
+In-process stand-in for the boto3 S3 client used by unit tests.
+
+LocalS3Client is core.storage.MemoryStorage with call recording on: objects
+in memory, honouring the conditional headers the service relies on and
+raising the same botocore ClientError shapes real S3 returns, so handlers
+and core.s3 run unmodified against it, while tests count the requests made.
+"""
+
+from core.storage import MemoryStorage
+
+__all__ = ["LocalS3Client"]
+
+
+class LocalS3Client(MemoryStorage):
+    def __init__(self):
+        super().__init__(record_calls=True)
@@ -0,0 +1,17 @@
+"""Shared fixtures for unit tests."""
+
+import pytest
+
+from core import s3 as core_s3
+from core.s3 import clear_json_cache
+from tests.local_s3 import LocalS3Client
+
+
+@pytest.fixture
+def local_s3(monkeypatch):
+    """Install a LocalS3Client as the process-wide client returned by get_s3_client."""
+    s3 = LocalS3Client()
+    monkeypatch.setattr(core_s3, "_s3_client", s3)
+    clear_json_cache()
+    yield s3
+    clear_json_cache()
@@ -0,0 +1,177 @@
+"""
+Unit tests for the active lists feed (core.active_lists) and the
+get_active_lists / refresh_active_lists handlers.
+
+List windows are far in the past or future so the tests do not depend on
+today's date.
+"""
+
+import json
+
+import pytest
+
+from core import curator_store
+from core.active_lists import load_active_lists_feed, save_active_lists_feed
+from core.curator_store import curator_lists_key
+from handlers.custom_lists.create_custom_list_handler import create_custom_list_handler
+from handlers.custom_lists.delete_list_handler import delete_list_handler
+from handlers.custom_lists.get_active_lists_handler import get_active_lists_handler
+from handlers.custom_lists.refresh_active_lists_handler import refresh_active_lists_handler
+from handlers.custom_lists.update_list_film_caption_handler import update_list_film_caption_handler
+from handlers.custom_lists.update_list_handler import update_list_handler
+from config import S3_BUCKET, ACTIVE_LISTS_FEED_KEY
+
+RUNNING = ("2000-01-01", "2999-12-31")
+UPCOMING = ("2999-01-01", "2999-12-31")
+ENDED = ("2000-01-01", "2000-12-31")
+
+
+def _film(db_id: int) -> dict:
+    listings = {"prince_charles": {"_additional_info": {"title": f"Film {db_id}"}}}
+    return {"db_id": db_id, "cinema_listings": listings, "list_film_caption": ""}
+
+
+def _list(curator: str, name: str, window, db_ids=(1,)) -> dict:
+    return {
+        "list_curator": curator,
+        "list_name": name,
+        "list_caption": "",
+        "start_date": window[0],
+        "end_date": window[1],
+        "list_films": [_film(i) for i in db_ids],
+    }
+
+
+def _active() -> list:
+    return [(s["list_curator"], s["list_name"]) for s in get_active_lists_handler({})["film_lists"]]
+
+
+def _feed_names(s3) -> list:
+    return [(s["list_curator"], s["list_name"]) for s in load_active_lists_feed(s3)[0]["lists"]]
+
+
+@pytest.fixture
+def seeded(local_s3):
+    """kinologue has running R, upcoming U and ended E; bfi has running C. No feed yet."""
+    local_s3.put_bytes(S3_BUCKET, curator_lists_key("kinologue"), json.dumps([
+        _list("kinologue", "R", RUNNING), _list("kinologue", "U", UPCOMING), _list("kinologue", "E", ENDED),
+    ]).encode())
+    local_s3.put_bytes(S3_BUCKET, curator_lists_key("bfi"), json.dumps([_list("bfi", "C", RUNNING)]).encode())
+    return local_s3
+
+
+class TestGetActiveLists:
+    def test_builds_missing_feed_and_filters_by_date(self, seeded):
+        result = get_active_lists_handler({})
+
+        assert [(s["list_curator"], s["list_name"]) for s in result["film_lists"]] == [
+            ("bfi", "C"), ("kinologue", "R"),
+        ]
+        assert result["film_lists"][0]["films"] == [{"db_id": 1, "title": "Film 1", "list_film_caption": ""}]
+        # Upcoming lists are kept for when they start; ended ones are not
+        assert _feed_names(seeded) == [("bfi", "C"), ("kinologue", "R"), ("kinologue", "U")]
+
+    def test_served_from_one_read(self, seeded):
+        get_active_lists_handler({})
+        seeded.calls.clear()
+
+        get_active_lists_handler({})
+
+        assert [c[0] for c in seeded.calls] == ["get_object"]
+
+    def test_fields(self, seeded):
+        result = get_active_lists_handler({"fields": ["list_name", "film_count"]})
+
+        assert result["film_lists"] == [{"list_name": "C", "film_count": 1}, {"list_name": "R", "film_count": 1}]
+
+
+class TestIncrementalUpdates:
+    @pytest.fixture(autouse=True)
+    def _feed(self, seeded):
+        refresh_active_lists_handler({"rescan": True})
+
+    def test_new_running_list_appears(self, seeded):
+        create_custom_list_handler({
+            "curator": "bfi", "list_name": "D", "list_caption": "d",
+            "start_date": RUNNING[0], "end_date": RUNNING[1],
+        })
+
+        assert _active() == [("bfi", "C"), ("bfi", "D"), ("kinologue", "R")]
+
+    def test_rename_and_delete(self, seeded):
+        update_list_handler({"curator": "kinologue", "list_name": "R", "updates": {"list_name": "R2"}})
+        delete_list_handler({"curator": "bfi", "list_name": "C"})
+
+        assert _active() == [("kinologue", "R2")]
+
+    def test_caption_edit_is_reflected(self, seeded):
+        update_list_film_caption_handler({"curator": "bfi", "list_name": "C", "db_id": 1, "new_caption": "hi"})
+
+        assert get_active_lists_handler({})["film_lists"][0]["films"][0]["list_film_caption"] == "hi"
+
+    def test_edit_to_ended_list_writes_no_feed(self, seeded):
+        seeded.calls.clear()
+        update_list_handler({"curator": "kinologue", "list_name": "E", "updates": {"list_caption": "old"}})
+
+        assert seeded.count("put_object", prefix=ACTIVE_LISTS_FEED_KEY) == 0
+
+    def test_feed_failure_does_not_fail_the_write(self, seeded, monkeypatch):
+        def _fail(*args):
+            raise RuntimeError("feed down")
+
+        monkeypatch.setattr(curator_store, "record_curator_active_lists", _fail)
+        result = delete_list_handler({"curator": "bfi", "list_name": "C"})
+
+        assert result["status"] == "ok"
+        assert ("bfi", "C") in _active()  # stale until refreshed
+
+
+class TestMissingFeed:
+    def test_update_does_not_write_a_partial_feed(self, seeded):
+        update_list_handler({"curator": "bfi", "list_name": "C", "updates": {"list_caption": "new"}})
+
+        assert seeded.get_bytes(S3_BUCKET, ACTIVE_LISTS_FEED_KEY) is None
+        assert _active() == [("bfi", "C"), ("kinologue", "R")]
+
+
+class TestRefresh:
+    def test_prune_drops_ended_lists(self, seeded):
+        refresh_active_lists_handler({"rescan": True})
+        feed, etag = load_active_lists_feed(seeded)
+        stale = {**feed, "pruned_on": "2001-01-01", "lists": feed["lists"] + [_summary("old", ENDED)]}
+        save_active_lists_feed(seeded, stale, etag)
+
+        result = refresh_active_lists_handler({})
+
+        assert (result["rescanned"], result["lists_dropped"], result["list_count"]) == (False, 1, 3)
+        assert ("old", "E") not in _feed_names(seeded)
+
+    def test_prune_without_change_writes_nothing(self, seeded):
+        refresh_active_lists_handler({"rescan": True})
+        seeded.calls.clear()
+
+        assert refresh_active_lists_handler({})["lists_dropped"] == 0
+        assert seeded.count("put_object", prefix=ACTIVE_LISTS_FEED_KEY) == 0
+
+    def test_missing_feed_is_rescanned(self, seeded):
+        result = refresh_active_lists_handler({})
+
+        assert result["rescanned"] is True
+        assert result["list_count"] == 3
+
+    def test_unreadable_curator_keeps_its_entries(self, seeded):
+        refresh_active_lists_handler({"rescan": True})
+        seeded.put_bytes(S3_BUCKET, curator_lists_key("bfi"), b'[{"list_name": 1}]')
+
+        result = refresh_active_lists_handler({"rescan": True})
+
+        assert result["status"] == "partial"
+        assert list(result["errors"]) == ["bfi"]
+        assert ("bfi", "C") in _feed_names(seeded)
+
+
+def _summary(curator: str, window) -> dict:
+    return {
+        "list_curator": curator, "list_name": "E", "list_caption": "",
+        "start_date": window[0], "end_date": window[1], "film_count": 0, "films": [],
+    }
@@ -0,0 +1,62 @@
+"""
+Unit tests for assign_films_to_list_handler.
+
+Runs against LocalS3Client; a delayed variant records when each GET runs
+to check that the pan listings are read alongside the curator's lists.
+"""
+
+import json
+import pathlib
+import threading
+import time
+
+from core import s3 as core_s3
+from core.curator_store import curator_lists_key
+from core.s3 import clear_json_cache
+from handlers.custom_lists.assign_films_to_list_handler import assign_films_to_list_handler
+from tests.local_s3 import LocalS3Client
+from config import S3_BUCKET, PAN_CINEMA_LISTINGS_KEY
+
+FIXTURES = pathlib.Path(__file__).parent.parent / "fixtures" / "film_catalogue"
+
+
+class _SlowS3(LocalS3Client):
+    """Delays every GET and records its (start, end) per key."""
+
+    DELAY_SECONDS = 0.05
+
+    def __init__(self):
+        super().__init__()
+        self.get_intervals = {}
+        self._intervals_lock = threading.Lock()
+
+    def get_object(self, **kwargs):
+        start = time.perf_counter()
+        time.sleep(self.DELAY_SECONDS)
+        try:
+            return super().get_object(**kwargs)
+        finally:
+            with self._intervals_lock:
+                self.get_intervals.setdefault(kwargs["Key"], []).append((start, time.perf_counter()))
+
+
+class TestAssignOverlapsReads:
+    def test_pan_listings_and_lists_are_fetched_concurrently(self, monkeypatch):
+        slow = _SlowS3()
+        monkeypatch.setattr(core_s3, "_s3_client", slow)
+        clear_json_cache()
+        slow.put_bytes(S3_BUCKET, curator_lists_key("kinologue"), json.dumps([{
+            "list_curator": "kinologue", "list_name": "A", "list_caption": "",
+            "start_date": "2026-01-01", "end_date": "2026-12-31", "list_films": [],
+        }]).encode())
+        slow.put_bytes(S3_BUCKET, PAN_CINEMA_LISTINGS_KEY, (FIXTURES / "pan_cinema_listings_small.json").read_bytes())
+
+        try:
+            result = assign_films_to_list_handler({"curator": "kinologue", "list_name": "A", "db_ids": [6114]})
+        finally:
+            clear_json_cache()
+
+        assert result["films_added"] == [6114]
+        lists_start, lists_end = slow.get_intervals[curator_lists_key("kinologue")][0]
+        pan_start, pan_end = slow.get_intervals[PAN_CINEMA_LISTINGS_KEY][0]
+        assert lists_start < pan_end and pan_start < lists_end
@@ -0,0 +1,100 @@
+"""
+Unit tests for batch_handler.
+
+Runs against LocalS3Client so the single read / single write guarantee
+can be checked by counting S3 calls.
+"""
+
+import json
+import pathlib
+
+import pytest
+
+from core.curator_store import curator_lists_key
+from handlers.custom_lists.batch_handler import batch_handler
+from config import S3_BUCKET, PAN_CINEMA_LISTINGS_KEY
+
+FIXTURES = pathlib.Path(__file__).parent.parent / "fixtures" / "film_catalogue"
+
+CURATOR = "kinologue"
+LISTS_KEY = curator_lists_key(CURATOR)
+
+
+@pytest.fixture
+def s3(local_s3):
+    pan = (FIXTURES / "pan_cinema_listings_small.json").read_bytes()
+    local_s3.put_bytes(S3_BUCKET, PAN_CINEMA_LISTINGS_KEY, pan)
+    return local_s3
+
+
+def _stored(s3) -> list:
+    return json.loads(s3.get_bytes(S3_BUCKET, LISTS_KEY))
+
+
+def _build_list_ops() -> list:
+    return [
+        {
+            "handler": "create_custom_list",
+            "list_name": "March Picks",
+            "list_caption": "Our favourites",
+            "start_date": "2026-03-01",
+            "end_date": "2026-03-31",
+        },
+        {"handler": "assign_films_to_list", "list_name": "March Picks", "db_ids": [6114, 7001]},
+        {"handler": "update_list_film_caption", "list_name": "March Picks", "db_id": 6114, "new_caption": "Gothic"},
+        {"handler": "update_list_film_caption", "list_name": "March Picks", "db_id": 7001, "new_caption": "Quiet"},
+    ]
+
+
+class TestBatch:
+    def test_builds_list_with_one_read_and_one_write(self, s3):
+        result = batch_handler({"curator": CURATOR, "operations": _build_list_ops()})
+
+        assert result["status"] == "ok"
+        assert result["operations_applied"] == 4
+        assert [r["handler"] for r in result["results"]] == [op["handler"] for op in _build_list_ops()]
+        assert s3.count("put_object", prefix=LISTS_KEY) == 1
+        assert [k for op, k in s3.calls if op == "get_object"].count(LISTS_KEY) == 1
+
+        films = _stored(s3)[0]["list_films"]
+        assert [(f["db_id"], f["list_film_caption"]) for f in films] == [(6114, "Gothic"), (7001, "Quiet")]
+
+    def test_atomic_failure_writes_nothing(self, s3):
+        ops = _build_list_ops()
+        ops.append({"handler": "remove_film_from_list", "list_name": "March Picks", "db_id": 1})
+
+        result = batch_handler({"curator": CURATOR, "operations": ops})
+
+        assert result["status"] == "error"
+        assert result["written"] is False
+        assert result["results"][-1]["status"] == "error"
+        assert s3.get_bytes(S3_BUCKET, LISTS_KEY) is None
+
+    def test_non_atomic_keeps_successful_operations(self, s3):
+        ops = _build_list_ops()
+        ops.insert(1, {"handler": "delete_list", "list_name": "Missing"})
+
+        result = batch_handler({"curator": CURATOR, "operations": ops, "atomic": False})
+
+        assert result["status"] == "partial"
+        assert result["operations_failed"] == 1
+        assert result["results"][1]["status"] == "error"
+        assert len(_stored(s3)[0]["list_films"]) == 2
+
+    def test_invalid_payload_rejected_before_any_read(self, s3):
+        ops = [{"handler": "update_list", "list_name": "March Picks", "updates": {"bogus": "x"}}]
+
+        result = batch_handler({"curator": CURATOR, "operations": ops})
+
+        assert result["status"] == "error"
+        assert "Cannot update fields" in result["results"][0]["error"]
+        assert s3.count("get_object") == 0
+
+    def test_unsupported_handler_rejected(self, s3):
+        with pytest.raises(ValueError, match="unsupported handler"):
+            batch_handler({"curator": CURATOR, "operations": [{"handler": "get_curators"}]})
+
+    def test_mismatched_curator_rejected(self, s3):
+        ops = [{"handler": "delete_list", "curator": "someone_else", "list_name": "x"}]
+        with pytest.raises(ValueError, match="does not match"):
+            batch_handler({"curator": CURATOR, "operations": ops})
@@ -0,0 +1,47 @@
+"""
+Smoke test for the handler benchmark suite: every registered handler has a
+scenario that runs cleanly at a tiny scale, and regression flagging works.
+"""
+
+import copy
+
+import pytest
+
+from benchmarks.handler_suite import SCALES, SCENARIOS, find_regressions, run_suite
+from core import metrics
+from core import s3 as core_s3
+from handlers.custom_lists.entrypoint import HANDLER_REGISTRY
+
+
+@pytest.fixture(scope="module")
+def report():
+    # run_suite selects its backend through the environment; restore it afterwards
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("KL_STORAGE_BACKEND", "memory")
+        mp.setattr(metrics, "METRICS_ENABLED", metrics.METRICS_ENABLED)
+        yield run_suite(SCALES["tiny"], iterations=1, warmup=0)
+    core_s3.reset_s3_client()
+    core_s3.clear_json_cache()
+
+
+def test_every_handler_has_a_scenario():
+    assert set(SCENARIOS) == set(HANDLER_REGISTRY)
+
+
+def test_suite_runs_every_handler(report):
+    errors = {name: r["error"] for name, r in report["results"].items() if "error" in r}
+    assert errors == {}
+    assert set(report["results"]) == set(HANDLER_REGISTRY)
+    assert report["results"]["get_custom_lists"]["storage_calls_per_invocation"] >= 1
+
+
+def test_regressions_are_flagged_beyond_tolerance(report):
+    slower = copy.deepcopy(report)
+    slower["results"]["get_curators"]["latency_ms"]["p50"] += 50
+    slower["results"]["get_custom_lists"]["peak_mib"] += 10
+
+    flagged = find_regressions(slower, report)
+
+    assert len(flagged) == 2
+    assert flagged[0].startswith("get_curators: p50 latency")
+    assert find_regressions(report, report) == []
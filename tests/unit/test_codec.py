@@ -0,0 +1,43 @@
+"""
+Unit tests for the core JSON codec, covering both the orjson and the
+stdlib code paths.
+"""
+
+import pytest
+
+from core import codec
+
+
+@pytest.fixture(params=["orjson", "json"])
+def codec_impl(request, monkeypatch):
+    if request.param == "orjson" and codec.orjson is None:
+        pytest.skip("orjson not installed")
+    monkeypatch.setattr(codec, "USE_ORJSON", request.param == "orjson")
+    codec.reset_codec_stats()
+    return request.param
+
+
+class TestCodec:
+    def test_round_trip(self, codec_impl):
+        data = {"6114": {"title": "Bram Stoker's Dracula", "year": 1992, "when": [{"showtimes": ["14:00"]}]}}
+        assert codec.loads(codec.dumps(data)) == data
+
+    def test_output_is_compact_utf8(self, codec_impl):
+        encoded = codec.dumps({"director": "Yasujirō Ozu", "ids": [1, 2]})
+        assert encoded == '{"director":"Yasujirō Ozu","ids":[1,2]}'.encode("utf-8")
+
+    def test_decodes_bytes_and_str(self, codec_impl):
+        assert codec.loads(b'[1, 2]') == [1, 2]
+        assert codec.loads('{"a": null}') == {"a": None}
+
+    def test_stats_accumulate_and_reset(self, codec_impl):
+        encoded = codec.dumps([1, 2, 3])
+        codec.loads(encoded)
+
+        stats = codec.get_codec_stats()
+        assert stats["encoded_bytes"] == len(encoded)
+        assert stats["decoded_bytes"] == len(encoded)
+        assert stats["encode_ms"] >= 0
+
+        codec.reset_codec_stats()
+        assert codec.get_codec_stats()["encoded_bytes"] == 0
@@ -0,0 +1,93 @@
+"""
+Unit tests for Accept-Encoding negotiation and compressed entrypoint responses.
+"""
+
+import base64
+import gzip
+import json
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+from core import compression
+from core.compression import choose_encoding, compress
+from handlers.custom_lists.entrypoint import HANDLER_REGISTRY, handler
+
+LARGE_RESULT = {"status": "ok", "films": [{"cinema": "Prince Charles Cinema", "date": "2026-03-20"}] * 200}
+
+
+@pytest.fixture
+def gzip_only():
+    with patch.object(compression, "brotli", None):
+        yield
+
+
+# ── negotiation ─────────────────────────────────────────────────────
+
+
+class TestChooseEncoding:
+    def test_no_header_is_identity(self):
+        assert choose_encoding(None) is None
+        assert choose_encoding("") is None
+
+    def test_gzip_accepted(self, gzip_only):
+        assert choose_encoding("gzip, deflate") == "gzip"
+
+    def test_q_zero_rejects_encoding(self, gzip_only):
+        assert choose_encoding("gzip;q=0, identity") is None
+
+    def test_wildcard_matches(self, gzip_only):
+        assert choose_encoding("*") == "gzip"
+
+    def test_br_ignored_without_brotli(self, gzip_only):
+        assert choose_encoding("br") is None
+        assert choose_encoding("br, gzip") == "gzip"
+
+    def test_br_preferred_when_available(self):
+        with patch.object(compression, "brotli", MagicMock()):
+            assert choose_encoding("gzip, br") == "br"
+            assert choose_encoding("gzip;q=1.0, br;q=0.5") == "gzip"
+
+
+class TestCompress:
+    def test_small_body_not_compressed(self):
+        body = b'{"status":"ok"}'
+        assert compress(body, "gzip") == (body, None)
+
+    def test_large_body_gzipped(self, gzip_only):
+        body = json.dumps(LARGE_RESULT).encode()
+        compressed, encoding = compress(body, "gzip")
+        assert encoding == "gzip"
+        assert gzip.decompress(compressed) == body
+        assert len(compressed) < len(body) // 8
+
+
+# ── entrypoint ──────────────────────────────────────────────────────
+
+
+def _invoke(headers):
+    fake = MagicMock(return_value=LARGE_RESULT)
+    with patch.dict(HANDLER_REGISTRY._resolved, {"get_available_films": fake}):
+        return handler({"headers": headers, "body": json.dumps({"handler": "get_available_films"})})
+
+
+class TestEntrypointCompression:
+    def test_gzip_response_is_base64_encoded(self, gzip_only):
+        response = _invoke({"accept-encoding": "gzip, deflate, br"})
+
+        assert response["isBase64Encoded"] is True
+        assert response["headers"]["Content-Encoding"] == "gzip"
+        assert response["headers"]["Vary"] == "Accept-Encoding"
+        body = gzip.decompress(base64.b64decode(response["body"]))
+        assert json.loads(body) == LARGE_RESULT
+
+    def test_header_lookup_is_case_insensitive(self, gzip_only):
+        response = _invoke({"Accept-Encoding": "gzip"})
+        assert response["headers"]["Content-Encoding"] == "gzip"
+
+    def test_identity_without_accept_encoding(self):
+        response = _invoke({})
+
+        assert "isBase64Encoded" not in response
+        assert "Content-Encoding" not in response["headers"]
+        assert json.loads(response["body"]) == LARGE_RESULT
@@ -0,0 +1,49 @@
+"""
+Unit tests for core.concurrency: run_concurrently, fanout_status, gather and prefetch.
+"""
+
+import time
+
+import pytest
+
+from core.concurrency import fanout_status, gather, prefetch, run_concurrently
+
+
+class TestRunConcurrently:
+    def test_outcomes_keep_input_order_and_capture_errors(self):
+        outcomes = run_concurrently(lambda x: 10 // x, [5, 0, 2], max_workers=3)
+
+        assert [o.item for o in outcomes] == [5, 0, 2]
+        assert [o.value for o in outcomes] == [2, None, 5]
+        assert isinstance(outcomes[1].error, ZeroDivisionError)
+
+    def test_fanout_status(self):
+        assert fanout_status([{}], {}) == "ok"
+        assert fanout_status([{}], {"a": "boom"}) == "partial"
+        assert fanout_status([], {"a": "boom"}) == "error"
+
+
+class TestGather:
+    def test_results_keep_argument_order(self):
+        def slow(value):
+            time.sleep(0.05)
+            return value
+
+        assert gather(lambda: slow(1), lambda: 2, lambda: slow(3)) == [1, 2, 3]
+
+    def test_first_error_in_argument_order_is_raised_after_all_finish(self):
+        finished = []
+
+        def fail(exc):
+            time.sleep(0.05)
+            finished.append(exc)
+            raise exc
+
+        with pytest.raises(KeyError):
+            gather(lambda: fail(KeyError("a")), lambda: fail(ValueError("b")))
+        assert len(finished) == 2
+
+    def test_prefetch_result_reraises(self):
+        future = prefetch(lambda: 1 // 0)
+        with pytest.raises(ZeroDivisionError):
+            future.result()
@@ -11,7 +11,10 @@ from unittest.mock import patch, MagicMock
 
 import pytest
 
+from core.s3 import PreconditionFailedError, upload_dict_to_s3
 from handlers.custom_lists.create_curator_handler import create_curator_handler
+from tests.local_s3 import LocalS3Client
+from config import FILM_LISTS_BASE_PREFIX
 
 FIXTURES = pathlib.Path(__file__).parent.parent / "fixtures" / "create_curator"
 
@@ -28,15 +31,12 @@ def _mock_s3():
     """Patch S3 so no real AWS calls are made."""
     with (
         patch("handlers.custom_lists.create_curator_handler.get_s3_client") as mock_client,
-        patch("handlers.custom_lists.create_curator_handler.download_json_from_s3") as mock_download,
         patch("handlers.custom_lists.create_curator_handler.upload_dict_to_s3") as mock_upload,
     ):
         mock_client.return_value = MagicMock()
-        mock_download.side_effect = FileNotFoundError  # curator doesn't exist yet
-        mock_upload.return_value = None
+        mock_upload.return_value = '"etag"'  # curator doesn't exist yet
         yield {
             "client": mock_client,
-            "download": mock_download,
             "upload": mock_upload,
         }
 
@@ -137,20 +137,28 @@ class TestCreateCuratorInvalidName:
 
 class TestCreateCuratorDuplicate:
     def test_existing_curator_raises(self, _mock_s3):
-        # Make download succeed → curator already exists
-        _mock_s3["download"].side_effect = None
-        _mock_s3["download"].return_value = []
+        # Conditional write fails → curator already exists
+        _mock_s3["upload"].side_effect = PreconditionFailedError("exists")
 
         payload = _load_fixture("create_curator_valid.json")
         with pytest.raises(ValueError, match="already exists"):
             create_curator_handler(payload)
 
-    def test_no_upload_when_duplicate(self, _mock_s3):
-        _mock_s3["download"].side_effect = None
-        _mock_s3["download"].return_value = []
+    def test_write_is_create_only(self, _mock_s3):
+        payload = _load_fixture("create_curator_valid.json")
+        create_curator_handler(payload)
+
+        assert _mock_s3["upload"].call_args.kwargs["if_none_match"] == "*"
+
+    def test_existing_file_is_not_overwritten(self, _mock_s3):
+        s3 = LocalS3Client()
+        _mock_s3["client"].return_value = s3
+        _mock_s3["upload"].side_effect = upload_dict_to_s3
 
         payload = _load_fixture("create_curator_valid.json")
-        with pytest.raises(ValueError):
+        create_curator_handler(payload)
+        with pytest.raises(ValueError, match="already exists"):
             create_curator_handler(payload)
 
-        _mock_s3["upload"].assert_not_called()
+        assert s3.count("put_object", prefix=f"{FILM_LISTS_BASE_PREFIX}/") == 2
+        assert s3.count("get_object", prefix=f"{FILM_LISTS_BASE_PREFIX}/") == 0
@@ -1,17 +1,19 @@
 """
 Unit tests for create_custom_list_handler.
 
-All S3 calls are mocked — these tests only exercise payload validation
-and the handler's return shape on success.
+S3 is replaced by the in-process LocalS3Client — these tests only exercise
+payload validation and the handler's return shape on success.
 """
 
 import json
 import pathlib
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 
 import pytest
 
 from handlers.custom_lists.create_custom_list_handler import create_custom_list_handler
+from tests.local_s3 import LocalS3Client
+from config import S3_BUCKET
 
 FIXTURES = pathlib.Path(__file__).parent.parent / "fixtures" / "create_custom_list"
 
@@ -25,20 +27,10 @@ def _load_fixture(name: str) -> dict:
 
 @pytest.fixture(autouse=True)
 def _mock_s3():
-    """Patch S3 so no real AWS calls are made."""
-    with (
-        patch("handlers.custom_lists.create_custom_list_handler.get_s3_client") as mock_client,
-        patch("handlers.custom_lists.create_custom_list_handler.download_json_from_s3") as mock_download,
-        patch("handlers.custom_lists.create_custom_list_handler.upload_dict_to_s3") as mock_upload,
-    ):
-        mock_client.return_value = MagicMock()
-        mock_download.side_effect = FileNotFoundError  # fresh curator, no existing lists
-        mock_upload.return_value = None
-        yield {
-            "client": mock_client,
-            "download": mock_download,
-            "upload": mock_upload,
-        }
+    """Patch S3 so no real AWS calls are made (fresh curator, no existing lists)."""
+    s3 = LocalS3Client()
+    with patch("handlers.custom_lists.create_custom_list_handler.get_s3_client", return_value=s3):
+        yield s3
 
 
 # ── happy path ──────────────────────────────────────────────────────
@@ -56,10 +48,11 @@ class TestCreateCustomListValid:
 
     def test_valid_payload_uploads_to_s3(self, _mock_s3):
         payload = _load_fixture("create_custom_list_valid.json")
-        create_custom_list_handler(payload)
+        result = create_custom_list_handler(payload)
 
-        _mock_s3["upload"].assert_called_once()
-        uploaded_data = _mock_s3["upload"].call_args[0][3]
+        key = result["output_uri"].split(f"s3://{S3_BUCKET}/")[1]
+        assert _mock_s3.count("put_object", prefix=key) == 1
+        uploaded_data = json.loads(_mock_s3.get_bytes(S3_BUCKET, key))
         assert len(uploaded_data) == 1
         assert uploaded_data[0]["list_curator"] == "TEST_CURATOR"
         assert uploaded_data[0]["list_films"] == []
@@ -0,0 +1,241 @@
+"""
+Unit tests for the journal write path (core.curator_journal) and the
+compact_curator handler.
+
+Runs the real handlers against LocalS3Client with FILM_LISTS_JOURNAL_ENABLED
+switched on.
+"""
+
+import json
+
+import pytest
+
+from core import curator_journal, curator_store
+from core.curator_journal import (
+    JOURNAL_SEQ_METADATA,
+    apply_changes,
+    copy_film_lists,
+    diff_film_lists,
+    journal_entry_key,
+    list_journal,
+)
+from core.curator_store import curator_lists_key, load_curator_film_lists, update_curator_film_lists
+from core.s3 import get_s3_client
+from handlers.custom_lists.compact_curator_handler import compact_curator_handler
+from handlers.custom_lists.create_custom_list_handler import create_custom_list_handler
+from handlers.custom_lists.get_custom_lists_handler import get_custom_lists_source_etags
+from handlers.custom_lists.remove_film_from_list_handler import remove_film_from_list_handler
+from handlers.custom_lists.update_list_film_caption_handler import update_list_film_caption_handler
+from handlers.custom_lists.update_list_handler import update_list_handler
+from config import S3_BUCKET
+
+CURATOR = "kinologue"
+
+
+def _film(db_id: int) -> dict:
+    listings = {"prince_charles": {"description": "x" * 200, "when": [{"date": "2026-01-01"}]}}
+    return {"db_id": db_id, "cinema_listings": listings, "list_film_caption": "", "listing_hash": f"h{db_id}"}
+
+
+def _list(name: str, films: int = 0) -> dict:
+    return {
+        "list_curator": CURATOR,
+        "list_name": name,
+        "list_caption": f"{name} caption",
+        "start_date": "2026-01-01",
+        "end_date": "2026-12-31",
+        "list_films": [_film(i) for i in range(films)],
+    }
+
+
+def _snapshot(local_s3) -> list:
+    return json.loads(local_s3.get_bytes(S3_BUCKET, curator_lists_key(CURATOR)))
+
+
+def _lists() -> list:
+    return load_curator_film_lists(get_s3_client(), CURATOR)[0]
+
+
+@pytest.fixture(autouse=True)
+def _journal(monkeypatch):
+    monkeypatch.setattr(curator_store, "FILM_LISTS_JOURNAL_ENABLED", True)
+    monkeypatch.setattr("core.s3.RETRY_BACKOFF_SECONDS", 0)
+    monkeypatch.setattr(curator_journal, "FILM_LISTS_JOURNAL_RETAIN_SECONDS", 0)
+    curator_journal.clear_journal_cache()
+    yield
+    curator_journal.clear_journal_cache()
+
+
+@pytest.fixture
+def seeded(local_s3):
+    """A curator whose filmLists.json holds "A" (3 films) and "B" (2 films), with an empty journal."""
+    local_s3.put_bytes(S3_BUCKET, curator_lists_key(CURATOR), json.dumps([_list("A", 3), _list("B", 2)]).encode())
+    local_s3.calls.clear()
+    return local_s3
+
+
+class TestDiff:
+    @pytest.mark.parametrize("edit", [
+        lambda fl: fl[0]["list_films"][1].update(list_film_caption="new"),
+        lambda fl: fl[0]["list_films"].pop(0),
+        lambda fl: fl[1]["list_films"].append(_film(99)),
+        lambda fl: fl[1]["list_films"].reverse(),
+        lambda fl: fl[0].update(list_caption="renamed", end_date="2027-01-01"),
+        lambda fl: fl.pop(0),
+        lambda fl: fl.append(_list("C", 1)),
+        lambda fl: fl.reverse(),
+        lambda fl: fl[0].update(list_name="A2"),
+        lambda fl: fl.append(_list("A", 1)),
+    ])
+    def test_applying_the_diff_reproduces_the_edit(self, edit):
+        before = [_list("A", 3), _list("B", 2)]
+        after = copy_film_lists(before)
+        edit(after)
+
+        assert apply_changes(copy_film_lists(before), diff_film_lists(before, after)) == after
+
+    def test_caption_edit_is_one_small_change(self):
+        before = [_list("A", 3)]
+        after = copy_film_lists(before)
+        after[0]["list_films"][1]["list_film_caption"] = "new"
+
+        assert diff_film_lists(before, after) == [
+            {"op": "set_film_fields", "list_name": "A", "db_id": 1, "fields": {"list_film_caption": "new"}},
+        ]
+
+    def test_no_edit_no_changes(self):
+        before = [_list("A", 3)]
+        assert diff_film_lists(before, copy_film_lists(before)) == []
+
+    def test_unknown_change_raises(self):
+        with pytest.raises(ValueError, match="Unknown journal change"):
+            apply_changes([], [{"op": "shuffle"}])
+
+
+class TestJournaledWrites:
+    def test_edit_appends_entry_and_leaves_snapshot(self, seeded):
+        snapshot = _snapshot(seeded)
+        update_list_film_caption_handler({"curator": CURATOR, "list_name": "B", "db_id": 1, "new_caption": "hi"})
+
+        assert _snapshot(seeded) == snapshot
+        assert [obj.seq for obj in list_journal(seeded, CURATOR)] == [1]
+        assert _lists()[1]["list_films"][1]["list_film_caption"] == "hi"
+
+    def test_bytes_per_edit_do_not_grow_with_curator(self, local_s3):
+        sizes = []
+        for films in (2, 200):
+            curator = f"curator{films:03d}"
+            lists = [{**_list(f"L{n}", films), "list_curator": curator} for n in range(5)]
+            local_s3.put_bytes(S3_BUCKET, curator_lists_key(curator), json.dumps(lists).encode())
+            update_list_film_caption_handler({"curator": curator, "list_name": "L0", "db_id": 1, "new_caption": "hi"})
+            sizes.append(len(local_s3.get_bytes(S3_BUCKET, journal_entry_key(curator, 1))))
+
+        assert sizes[1] == sizes[0] < 400
+
+    def test_handlers_compose_through_the_journal(self, seeded):
+        create_custom_list_handler({
+            "curator": CURATOR, "list_name": "C", "list_caption": "c",
+            "start_date": "2026-01-01", "end_date": "2026-12-31",
+        })
+        remove_film_from_list_handler({"curator": CURATOR, "list_name": "A", "db_id": 0})
+        update_list_handler({"curator": CURATOR, "list_name": "B", "updates": {"list_caption": "bee"}})
+
+        lists = _lists()
+        assert [fl["list_name"] for fl in lists] == ["A", "B", "C"]
+        assert [f["db_id"] for f in lists[0]["list_films"]] == [1, 2]
+        assert lists[1]["list_caption"] == "bee"
+        assert len(list_journal(seeded, CURATOR)) == 3
+
+    def test_create_if_missing_creates_snapshot(self, local_s3):
+        create_custom_list_handler({
+            "curator": "newbie", "list_name": "C", "list_caption": "c",
+            "start_date": "2026-01-01", "end_date": "2026-12-31",
+        })
+
+        assert json.loads(local_s3.get_bytes(S3_BUCKET, curator_lists_key("newbie"))) == []
+        assert [fl["list_name"] for fl in load_curator_film_lists(local_s3, "newbie")[0]] == ["C"]
+
+    def test_racing_writer_retries_against_newer_state(self, seeded):
+        calls = []
+
+        def mutate(film_lists):
+            calls.append(1)
+            if len(calls) == 1:
+                # Another writer appends entry 1 between our read and our write
+                update_curator_film_lists(seeded, CURATOR, lambda fl: fl[0].update(list_caption="theirs"))
+            film_lists[1]["list_caption"] = "ours"
+
+        update_curator_film_lists(seeded, CURATOR, mutate)
+
+        assert len(calls) == 2
+        assert [fl["list_caption"] for fl in _lists()] == ["theirs", "ours"]
+        assert [obj.seq for obj in list_journal(seeded, CURATOR)] == [1, 2]
+
+    def test_unchanged_update_writes_nothing(self, seeded):
+        update_curator_film_lists(seeded, CURATOR, lambda fl: None)
+
+        assert list_journal(seeded, CURATOR) == []
+        assert seeded.count("put_object", prefix=curator_lists_key(CURATOR)) == 0
+
+    def test_response_etag_changes_with_journal(self, seeded):
+        before = get_custom_lists_source_etags({"curator": CURATOR})
+        update_list_handler({"curator": CURATOR, "list_name": "B", "updates": {"list_caption": "bee"}})
+
+        assert get_custom_lists_source_etags({"curator": CURATOR}) != before
+
+
+class TestCompaction:
+    def _edit(self, n: int) -> None:
+        for i in range(n):
+            update_list_handler({"curator": CURATOR, "list_name": "A", "updates": {"list_caption": f"v{i}"}})
+
+    def test_folds_entries_into_snapshot_and_deletes_them(self, seeded):
+        self._edit(3)
+        result = compact_curator_handler({"curator": CURATOR})
+
+        assert result["entries_compacted"] == 3
+        assert _snapshot(seeded)[0]["list_caption"] == "v2"
+        assert seeded.metadata[(S3_BUCKET, curator_lists_key(CURATOR))] == {JOURNAL_SEQ_METADATA: "3"}
+        assert list_journal(seeded, CURATOR) == []
+
+    def test_seq_continues_after_compaction(self, seeded):
+        self._edit(2)
+        compact_curator_handler({"curator": CURATOR})
+        self._edit(1)
+
+        assert [obj.seq for obj in list_journal(seeded, CURATOR)] == [3]
+        assert _lists()[0]["list_caption"] == "v0"
+
+    def test_young_entries_are_kept_but_not_refolded(self, seeded, monkeypatch):
+        monkeypatch.setattr(curator_journal, "FILM_LISTS_JOURNAL_RETAIN_SECONDS", 900)
+        self._edit(2)
+        result = compact_curator_handler({"curator": CURATOR})
+
+        assert result["results"][0]["entries_retained"] == 2
+        # A later edit on top of the new snapshot is not undone by the kept entries
+        update_list_handler({"curator": CURATOR, "list_name": "A", "updates": {"list_caption": "later"}})
+        assert _lists()[0]["list_caption"] == "later"
+
+    def test_read_restarts_when_compacted_underneath(self, seeded, monkeypatch):
+        self._edit(2)
+        original = curator_journal.list_journal
+        compacted = []
+
+        def list_then_compact(s3, curator):
+            objects = original(s3, curator)
+            if not compacted:
+                compacted.append(1)
+                curator_journal.compact_journal(s3, curator, curator_lists_key(curator))
+                curator_journal.clear_journal_cache()
+            return objects
+
+        monkeypatch.setattr(curator_journal, "list_journal", list_then_compact)
+
+        assert _lists()[0]["list_caption"] == "v1"
+
+    def test_all_skips_short_journals(self, seeded):
+        self._edit(2)
+        result = compact_curator_handler({"min_entries": 3})
+
+        assert result["curators_compacted"] == 0
+        assert result["results"] == [{"curator": CURATOR, "status": "skipped", "journal_entries": 2}]
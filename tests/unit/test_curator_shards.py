@@ -0,0 +1,258 @@
+"""
+Unit tests for the sharded list layout (core.curator_shards) and the
+migrate_curator_layout handler.
+
+Runs the real handlers against LocalS3Client with FILM_LISTS_LAYOUT
+switched to "sharded".
+"""
+
+import json
+
+import pytest
+
+from core import curator_store
+from core.curator_journal import journal_entry_key
+from core.curator_shards import curator_manifest_key, list_object_key, load_manifest
+from core.curator_store import curator_lists_key, load_curator_film_lists, update_curator_film_lists
+from handlers.custom_lists.batch_handler import batch_handler
+from handlers.custom_lists.create_curator_handler import create_curator_handler
+from handlers.custom_lists.create_custom_list_handler import create_custom_list_handler
+from handlers.custom_lists.delete_list_handler import delete_list_handler
+from handlers.custom_lists.get_custom_lists_handler import get_custom_lists_handler
+from handlers.custom_lists.migrate_curator_layout_handler import migrate_curator_layout_handler
+from handlers.custom_lists.update_list_film_caption_handler import update_list_film_caption_handler
+from handlers.custom_lists.update_list_handler import update_list_handler
+from config import S3_BUCKET, FILM_LISTS_BASE_PREFIX
+
+CURATOR = "kinologue"
+
+
+def _list(name: str, films: int = 0) -> dict:
+    return {
+        "list_curator": CURATOR,
+        "list_name": name,
+        "list_caption": f"{name} caption",
+        "start_date": "2026-01-01",
+        "end_date": "2026-12-31",
+        "list_films": [
+            {"db_id": i, "cinema_listings": {}, "list_film_caption": ""} for i in range(films)
+        ],
+    }
+
+
+def _manifest(local_s3) -> dict:
+    return json.loads(local_s3.get_bytes(S3_BUCKET, curator_manifest_key(CURATOR)))
+
+
+def _list_keys(local_s3) -> set:
+    return {key for (_, key) in local_s3.objects if "/lists/" in key}
+
+
+@pytest.fixture(autouse=True)
+def _sharded(monkeypatch):
+    monkeypatch.setattr(curator_store, "FILM_LISTS_LAYOUT", "sharded")
+    monkeypatch.setattr("core.s3.RETRY_BACKOFF_SECONDS", 0)
+
+
+@pytest.fixture
+def two_lists(local_s3):
+    """A curator with lists "A" (3 films) and "B" (2 films), seeded via the store."""
+    update_curator_film_lists(
+        local_s3, CURATOR, lambda fl: fl.extend([_list("A", 3), _list("B", 2)]), create_if_missing=True
+    )
+    local_s3.calls.clear()
+    return local_s3
+
+
+# ── layout ──────────────────────────────────────────────────────────
+
+
+class TestShardedLayout:
+    def test_create_curator_writes_empty_manifest(self, local_s3):
+        result = create_curator_handler({"curator": CURATOR})
+
+        assert result["output_uri"].endswith("manifest.json")
+        assert _manifest(local_s3) == {"curator": CURATOR, "lists": []}
+
+    def test_manifest_has_names_dates_and_counts(self, two_lists):
+        entries = _manifest(two_lists)["lists"]
+
+        assert [(e["list_name"], e["film_count"]) for e in entries] == [("A", 3), ("B", 2)]
+        assert entries[0]["start_date"] == "2026-01-01"
+        assert len(_list_keys(two_lists)) == 2
+
+    def test_caption_edit_reads_and_writes_only_that_list(self, two_lists):
+        old = _manifest(two_lists)["lists"][1]
+        update_list_film_caption_handler({"curator": CURATOR, "list_name": "B", "db_id": 1, "new_caption": "hi"})
+        new = _manifest(two_lists)["lists"][1]
+
+        calls = [(op, key) for op, key in two_lists.calls if key.startswith(f"{FILM_LISTS_BASE_PREFIX}/")]
+        read = [key for op, key in calls if op == "get_object"]
+        written = [key for op, key in calls if op == "put_object"]
+        deleted = [key for op, key in calls if op == "delete_object"]
+
+        assert read == [curator_manifest_key(CURATOR), list_object_key(CURATOR, old["list_id"], old["version"])]
+        assert written == [list_object_key(CURATOR, new["list_id"], new["version"]), curator_manifest_key(CURATOR)]
+        assert deleted == [list_object_key(CURATOR, old["list_id"], old["version"])]
+
+    def test_rename_keeps_list_id(self, two_lists):
+        before = _manifest(two_lists)["lists"][0]
+        update_list_handler({"curator": CURATOR, "list_name": "A", "updates": {"list_name": "A2"}})
+        after = _manifest(two_lists)["lists"][0]
+
+        assert (after["list_name"], after["list_id"]) == ("A2", before["list_id"])
+        assert after["version"] != before["version"]
+
+    def test_delete_list_drops_entry_and_object_reading_only_that_list(self, two_lists):
+        delete_list_handler({"curator": CURATOR, "list_name": "A"})
+
+        assert [e["list_name"] for e in _manifest(two_lists)["lists"]] == ["B"]
+        assert len(_list_keys(two_lists)) == 1
+        # The manifest, plus list A so its films can leave the film index
+        assert two_lists.count("get_object", prefix=f"{FILM_LISTS_BASE_PREFIX}/") == 2
+
+    def test_create_custom_list_appends_new_list(self, two_lists):
+        create_custom_list_handler({
+            "curator": CURATOR, "list_name": "C", "list_caption": "c",
+            "start_date": "2026-01-01", "end_date": "2026-12-31",
+        })
+
+        assert [e["list_name"] for e in _manifest(two_lists)["lists"]] == ["A", "B", "C"]
+        assert two_lists.count("get_object", prefix=f"{FILM_LISTS_BASE_PREFIX}/") == 1
+
+    def test_get_custom_lists_single_list(self, two_lists):
+        result = get_custom_lists_handler({"curator": CURATOR, "list_name": "B"})
+
+        assert [fl["list_name"] for fl in result["film_lists"]] == ["B"]
+        assert two_lists.count("get_object") == 2
+
+    def test_summary_without_films_reads_only_the_manifest(self, two_lists):
+        result = get_custom_lists_handler({"curator": CURATOR, "view": "summary", "fields": ["list_name", "film_count"]})
+
+        assert result["film_lists"] == [{"list_name": "A", "film_count": 3}, {"list_name": "B", "film_count": 2}]
+        assert two_lists.count("get_object") == 1
+
+    def test_full_read_keeps_manifest_order(self, local_s3):
+        names = [f"L{i:02d}" for i in range(20)]
+        update_curator_film_lists(
+            local_s3, CURATOR, lambda fl: fl.extend(_list(name, 1) for name in names), create_if_missing=True
+        )
+
+        film_lists, _ = load_curator_film_lists(local_s3, CURATOR)
+
+        assert [fl["list_name"] for fl in film_lists] == names
+
+    def test_get_custom_lists_unknown_list_raises(self, two_lists):
+        with pytest.raises(ValueError, match="not found"):
+            get_custom_lists_handler({"curator": CURATOR, "list_name": "Z"})
+
+    def test_editing_an_unloaded_list_is_refused(self, two_lists):
+        def _edit(film_lists):
+            curator_store.find_custom_list(film_lists, CURATOR, "A")["list_caption"] = "x"
+
+        with pytest.raises(RuntimeError, match="not loaded"):
+            update_curator_film_lists(two_lists, CURATOR, _edit, list_names=["B"])
+        assert two_lists.count("put_object") == 0
+
+
+# ── commit and retry ────────────────────────────────────────────────
+
+
+class TestShardedCommit:
+    def test_batch_across_lists_is_all_or_nothing(self, two_lists):
+        before = _manifest(two_lists)
+
+        result = batch_handler({
+            "curator": CURATOR,
+            "operations": [
+                {"handler": "update_list_film_caption", "list_name": "A", "db_id": 0, "new_caption": "ok"},
+                {"handler": "update_list_film_caption", "list_name": "B", "db_id": 99, "new_caption": "missing"},
+            ],
+        })
+
+        assert result["written"] is False
+        assert _manifest(two_lists) == before
+        assert two_lists.count("put_object") == 0
+
+    def test_lost_race_is_retried_and_orphan_removed(self, two_lists):
+        attempts = []
+
+        def _mutate(film_lists):
+            attempts.append(1)
+            if len(attempts) == 1:
+                # Another editor commits a change to list A between our read and write
+                update_curator_film_lists(
+                    two_lists, CURATOR,
+                    lambda fl: curator_store.find_custom_list(fl, CURATOR, "A").update(list_caption="theirs"),
+                    list_names=["A"],
+                )
+            curator_store.find_custom_list(film_lists, CURATOR, "B")["list_films"].pop()
+
+        update_curator_film_lists(two_lists, CURATOR, _mutate, list_names=["B"])
+
+        entries = {e["list_name"]: e for e in _manifest(two_lists)["lists"]}
+        assert len(attempts) == 2
+        assert (entries["A"]["list_caption"], entries["B"]["film_count"]) == ("theirs", 1)
+        assert len(_list_keys(two_lists)) == 2
+
+    def test_unchanged_update_writes_nothing(self, two_lists):
+        update_curator_film_lists(two_lists, CURATOR, lambda fl: None)
+        assert two_lists.count("put_object") == 0
+
+
+# ── migration ───────────────────────────────────────────────────────
+
+
+class TestMigration:
+    @pytest.fixture
+    def single_file(self, local_s3):
+        lists = [_list("A", 3), _list("B", 1)]
+        local_s3.put_bytes(S3_BUCKET, curator_lists_key(CURATOR), json.dumps(lists).encode())
+        return lists
+
+    def test_migrates_lists_into_shards(self, local_s3, single_file):
+        result = migrate_curator_layout_handler({"curator": CURATOR})
+
+        assert result["migrated"] == 1
+        assert result["results"][0]["films"] == 4
+        film_lists, _ = load_curator_film_lists(local_s3, CURATOR)
+        assert film_lists == single_file
+        assert local_s3.get_bytes(S3_BUCKET, curator_lists_key(CURATOR)) is not None
+
+    def test_rerun_skips_migrated_curator(self, local_s3, single_file):
+        migrate_curator_layout_handler({"curator": CURATOR})
+        result = migrate_curator_layout_handler({})
+
+        assert result["results"] == [{"curator": CURATOR, "status": "skipped", "reason": "already migrated"}]
+
+    def test_overwrite_replaces_manifest_and_old_versions(self, local_s3, single_file):
+        migrate_curator_layout_handler({"curator": CURATOR})
+        migrate_curator_layout_handler({"curator": CURATOR, "overwrite": True})
+
+        manifest, _ = load_manifest(local_s3, CURATOR)
+        assert len(manifest["lists"]) == 2
+        assert len(_list_keys(local_s3)) == 2
+
+    def test_delete_source(self, local_s3, single_file):
+        result = migrate_curator_layout_handler({"curator": CURATOR, "delete_source": True})
+
+        assert result["results"][0]["source_deleted"] is True
+        assert local_s3.get_bytes(S3_BUCKET, curator_lists_key(CURATOR)) is None
+
+    def test_pending_journal_is_not_migrated(self, local_s3, single_file):
+        local_s3.put_bytes(S3_BUCKET, journal_entry_key(CURATOR, 1), b"{}")
+
+        result = migrate_curator_layout_handler({"curator": CURATOR, "delete_source": True})
+
+        assert result["migrated"] == 0
+        assert "compact_curator" in result["results"][0]["reason"]
+        assert load_manifest(local_s3, CURATOR, missing_ok=True)[1] is None
+        assert local_s3.get_bytes(S3_BUCKET, curator_lists_key(CURATOR)) is not None
+
+    def test_already_folded_journal_entries_do_not_block(self, local_s3, single_file):
+        local_s3.put_bytes(
+            S3_BUCKET, curator_lists_key(CURATOR), json.dumps(single_file).encode(), metadata={"journal-seq": "1"}
+        )
+        local_s3.put_bytes(S3_BUCKET, journal_entry_key(CURATOR, 1), b"{}")
+
+        assert migrate_curator_layout_handler({"curator": CURATOR})["migrated"] == 1
@@ -0,0 +1,136 @@
+"""
+Unit tests for optimistic concurrency on filmLists.json (core.curator_store)
+and the mutation handlers built on it.
+
+Runs against LocalS3Client, which honours IfMatch / IfNoneMatch like S3.
+"""
+
+import json
+import threading
+
+import pytest
+
+from core.curator_store import (
+    curator_lists_key,
+    load_curator_film_lists,
+    save_curator_film_lists,
+    update_curator_film_lists,
+)
+from core.s3 import PreconditionFailedError
+from handlers.custom_lists.create_custom_list_handler import create_custom_list_handler
+from handlers.custom_lists.update_list_film_caption_handler import update_list_film_caption_handler
+from config import S3_BUCKET, CURATOR_WRITE_MAX_ATTEMPTS
+
+CURATOR = "kinologue"
+
+
+def _new_list(name: str) -> dict:
+    return {
+        "list_curator": CURATOR,
+        "list_name": name,
+        "list_caption": "",
+        "start_date": "2026-01-01",
+        "end_date": "2026-12-31",
+        "list_films": [],
+    }
+
+
+def _stored(local_s3) -> list:
+    return json.loads(local_s3.get_bytes(S3_BUCKET, curator_lists_key(CURATOR)))
+
+
+@pytest.fixture(autouse=True)
+def _no_backoff(monkeypatch):
+    monkeypatch.setattr("core.s3.RETRY_BACKOFF_SECONDS", 0)
+
+
+# ── conditional writes ──────────────────────────────────────────────
+
+
+class TestConditionalSave:
+    def test_stale_etag_is_rejected(self, local_s3):
+        save_curator_film_lists(local_s3, CURATOR, [], None)
+        _, etag = load_curator_film_lists(local_s3, CURATOR)
+        save_curator_film_lists(local_s3, CURATOR, [_new_list("A")], etag)
+
+        with pytest.raises(PreconditionFailedError):
+            save_curator_film_lists(local_s3, CURATOR, [_new_list("B")], etag)
+
+    def test_create_fails_if_file_exists(self, local_s3):
+        save_curator_film_lists(local_s3, CURATOR, [], None)
+        with pytest.raises(PreconditionFailedError):
+            save_curator_film_lists(local_s3, CURATOR, [], None)
+
+
+# ── retry on conflict ───────────────────────────────────────────────
+
+
+class TestUpdateRetry:
+    def test_mutation_is_reapplied_after_concurrent_write(self, local_s3):
+        save_curator_film_lists(local_s3, CURATOR, [], None)
+        attempts = []
+
+        def _mutate(film_lists):
+            attempts.append(len(film_lists))
+            if len(attempts) == 1:
+                # Another editor commits between our read and our write
+                _, etag = load_curator_film_lists(local_s3, CURATOR)
+                save_curator_film_lists(local_s3, CURATOR, [_new_list("Theirs")], etag)
+            film_lists.append(_new_list("Ours"))
+
+        update_curator_film_lists(local_s3, CURATOR, _mutate)
+
+        assert attempts == [0, 1]
+        assert [fl["list_name"] for fl in _stored(local_s3)] == ["Theirs", "Ours"]
+
+    def test_gives_up_after_max_attempts(self, local_s3):
+        save_curator_film_lists(local_s3, CURATOR, [], None)
+
+        def _always_conflict(film_lists):
+            _, etag = load_curator_film_lists(local_s3, CURATOR)
+            save_curator_film_lists(local_s3, CURATOR, film_lists + [_new_list("x")], etag)
+
+        calls = []
+        with pytest.raises(RuntimeError, match="conflicting writes"):
+            update_curator_film_lists(local_s3, CURATOR, lambda fl: calls.append(_always_conflict(fl)))
+        assert len(calls) == CURATOR_WRITE_MAX_ATTEMPTS
+
+    def test_failed_mutation_does_not_write(self, local_s3):
+        save_curator_film_lists(local_s3, CURATOR, [], None)
+
+        def _fail(film_lists):
+            raise ValueError("nope")
+
+        with pytest.raises(ValueError):
+            update_curator_film_lists(local_s3, CURATOR, _fail)
+        assert local_s3.count("put_object") == 1
+
+    def test_concurrent_editors_do_not_lose_writes(self, local_s3):
+        create_custom_list_handler({
+            "curator": CURATOR, "list_name": "Shared", "list_caption": "c",
+            "start_date": "2026-01-01", "end_date": "2026-12-31",
+        })
+        # Seed films directly so every editor has its own caption to set.
+        # Each conflict means another editor committed, so with fewer editors
+        # than CURATOR_WRITE_MAX_ATTEMPTS every editor is guaranteed to land.
+        editors = CURATOR_WRITE_MAX_ATTEMPTS - 1
+        film_lists = _stored(local_s3)
+        film_lists[0]["list_films"] = [
+            {"db_id": i, "cinema_listings": {}, "list_film_caption": ""} for i in range(editors)
+        ]
+        _, etag = load_curator_film_lists(local_s3, CURATOR)
+        save_curator_film_lists(local_s3, CURATOR, film_lists, etag)
+
+        def _edit(i):
+            update_list_film_caption_handler({
+                "curator": CURATOR, "list_name": "Shared", "db_id": i, "new_caption": f"caption {i}",
+            })
+
+        threads = [threading.Thread(target=_edit, args=(i,)) for i in range(editors)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        captions = [f["list_film_caption"] for f in _stored(local_s3)[0]["list_films"]]
+        assert captions == [f"caption {i}" for i in range(editors)]
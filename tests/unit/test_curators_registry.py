@@ -0,0 +1,130 @@
+"""
+Unit tests for the curators registry (core.curators_registry), get_curators
+and rebuild_curators_registry.
+
+Runs against LocalS3Client.
+"""
+
+import json
+
+import pytest
+
+from core.curator_store import curator_lists_key
+from core.curators_registry import resolve_curators
+from handlers.custom_lists.create_curator_handler import create_curator_handler
+from handlers.custom_lists.create_custom_list_handler import create_custom_list_handler
+from handlers.custom_lists.get_curators_handler import get_curators_handler
+from handlers.custom_lists.rebuild_curators_registry_handler import rebuild_curators_registry_handler
+from handlers.custom_lists.update_list_film_caption_handler import update_list_film_caption_handler
+from config import S3_BUCKET, CURATORS_REGISTRY_KEY
+
+CURATOR = "kinologue"
+
+
+def _registry(local_s3) -> dict:
+    return json.loads(local_s3.get_bytes(S3_BUCKET, CURATORS_REGISTRY_KEY))
+
+
+def _seed_curator(local_s3, curator: str, lists: list) -> None:
+    local_s3.put_bytes(S3_BUCKET, curator_lists_key(curator), json.dumps(lists).encode())
+
+
+def _list(name: str, end_date: str, films: int) -> dict:
+    return {
+        "list_curator": CURATOR, "list_name": name, "list_caption": "",
+        "start_date": "2026-01-01", "end_date": end_date,
+        "list_films": [{"db_id": i, "cinema_listings": {}, "list_film_caption": ""} for i in range(films)],
+    }
+
+
+@pytest.fixture(autouse=True)
+def _no_backoff(monkeypatch):
+    monkeypatch.setattr("core.s3.RETRY_BACKOFF_SECONDS", 0)
+
+
+class TestGetCurators:
+    def test_missing_registry_is_built_from_a_paginated_scan(self, local_s3):
+        # More curators than one LIST page (1,000 prefixes) returns
+        for i in range(1005):
+            _seed_curator(local_s3, f"curator{i:04d}", [])
+
+        result = get_curators_handler({})
+
+        assert len(result["curators"]) == 1005
+        assert local_s3.count("list_objects_v2") == 2
+        assert len(_registry(local_s3)["curators"]) == 1005
+
+    def test_registry_is_served_without_listing(self, local_s3):
+        _seed_curator(local_s3, CURATOR, [_list("A", "2026-03-31", 2), _list("B", "2026-12-31", 1)])
+        get_curators_handler({})
+        local_s3.calls.clear()
+
+        result = get_curators_handler({})
+
+        assert result["curators"] == [CURATOR]
+        stats = result["curator_stats"][CURATOR]
+        assert (stats["list_count"], stats["film_count"], stats["latest_end_date"]) == (2, 3, "2026-12-31")
+        assert local_s3.count("list_objects_v2") == 0
+        assert local_s3.calls == [("get_object", CURATORS_REGISTRY_KEY)]
+
+
+class TestRegistryMaintenance:
+    def test_create_curator_adds_empty_entry(self, local_s3):
+        rebuild_curators_registry_handler({})
+        create_curator_handler({"curator": CURATOR})
+
+        stats = _registry(local_s3)["curators"][CURATOR]
+        assert (stats["list_count"], stats["film_count"], stats["latest_end_date"]) == (0, 0, None)
+
+    def test_list_mutations_refresh_stats(self, local_s3):
+        rebuild_curators_registry_handler({})
+        create_curator_handler({"curator": CURATOR})
+        create_custom_list_handler({
+            "curator": CURATOR, "list_name": "A", "list_caption": "c",
+            "start_date": "2026-01-01", "end_date": "2026-06-30",
+        })
+
+        stats = _registry(local_s3)["curators"][CURATOR]
+        assert (stats["list_count"], stats["latest_end_date"]) == (1, "2026-06-30")
+
+    def test_missing_registry_is_not_written_partially(self, local_s3):
+        _seed_curator(local_s3, "alpha", [])
+        _seed_curator(local_s3, "beta", [])
+
+        create_curator_handler({"curator": "gamma"})
+
+        assert local_s3.get_bytes(S3_BUCKET, CURATORS_REGISTRY_KEY) is None
+        assert get_curators_handler({})["curators"] == ["alpha", "beta", "gamma"]
+
+    def test_unchanged_stats_are_not_rewritten(self, local_s3):
+        _seed_curator(local_s3, CURATOR, [_list("A", "2026-03-31", 2)])
+        get_curators_handler({})
+        local_s3.calls.clear()
+
+        update_list_film_caption_handler({"curator": CURATOR, "list_name": "A", "db_id": 0, "new_caption": "x"})
+
+        assert local_s3.count("put_object", prefix=CURATORS_REGISTRY_KEY) == 0
+
+    def test_rebuild_picks_up_curators_added_outside_the_service(self, local_s3):
+        create_curator_handler({"curator": CURATOR})
+        _seed_curator(local_s3, "bfi", [_list("A", "2026-03-31", 4)])
+
+        result = rebuild_curators_registry_handler({})
+
+        assert result["curator_count"] == 2
+        assert _registry(local_s3)["curators"]["bfi"]["film_count"] == 4
+
+
+class TestResolveCurators:
+    @pytest.mark.parametrize("event, expected", [
+        ({"curator": "bfi"}, ["bfi"]),
+        ({"curators": ["bfi", "kinologue", "bfi"]}, ["bfi", "kinologue"]),
+        ({"curators": "all"}, ["everyone"]),
+        ({}, ["everyone"]),
+    ])
+    def test_payload_forms(self, event, expected):
+        assert resolve_curators(event, lambda: ["everyone"]) == expected
+
+    def test_invalid_curators_raises(self):
+        with pytest.raises(ValueError, match="curators"):
+            resolve_curators({"curators": "bfi"}, lambda: [])
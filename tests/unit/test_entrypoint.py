@@ -0,0 +1,146 @@
+"""
+Unit tests for the Lambda entrypoint's dispatch, lazy handler registry
+and ETag / 304 conditional responses.
+"""
+
+import json
+import pathlib
+import subprocess
+import sys
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+from core.curator_store import curator_lists_key
+from handlers.custom_lists.entrypoint import HANDLER_REGISTRY, SOURCE_ETAG_REGISTRY, handler
+from config import S3_BUCKET
+
+PROJECT_DIR = pathlib.Path(__file__).resolve().parent.parent.parent
+
+
+# ── lazy registry ───────────────────────────────────────────────────
+
+
+class TestLazyRegistry:
+    def test_importing_entrypoint_does_not_import_handlers_or_boto3(self):
+        code = (
+            "import sys, handlers.custom_lists.entrypoint\n"
+            "loaded = [m for m in sys.modules if m.endswith('_handler') or m.split('.')[0] in ('boto3', 'botocore')]\n"
+            "print(loaded)\n"
+        )
+        out = subprocess.run(
+            [sys.executable, "-c", code], cwd=PROJECT_DIR, capture_output=True, text=True, check=True
+        ).stdout
+        assert out.strip() == "[]"
+
+    def test_importing_every_handler_does_not_import_boto3(self):
+        code = (
+            "import sys\n"
+            "from handlers.custom_lists.entrypoint import HANDLER_REGISTRY\n"
+            "for name in HANDLER_REGISTRY: HANDLER_REGISTRY[name]\n"
+            "print([m for m in sys.modules if m.split('.')[0] in ('boto3', 'botocore')])\n"
+        )
+        out = subprocess.run(
+            [sys.executable, "-c", code], cwd=PROJECT_DIR, capture_output=True, text=True, check=True
+        ).stdout
+        assert out.strip() == "[]"
+
+    def test_lookup_resolves_handler_function(self):
+        fn = HANDLER_REGISTRY["get_curators"]
+        assert callable(fn)
+        assert fn.__name__ == "get_curators_handler"
+
+    def test_unknown_name_is_not_in_registry(self):
+        assert HANDLER_REGISTRY.get("not_a_handler") is None
+        assert "not_a_handler" not in HANDLER_REGISTRY
+
+    def test_every_registered_handler_resolves(self):
+        for name in HANDLER_REGISTRY:
+            assert callable(HANDLER_REGISTRY[name])
+        for name in SOURCE_ETAG_REGISTRY:
+            assert name in HANDLER_REGISTRY
+            assert callable(SOURCE_ETAG_REGISTRY[name])
+
+
+# ── dispatch ────────────────────────────────────────────────────────
+
+
+class TestDispatch:
+    def test_dispatches_function_url_body(self):
+        fake = MagicMock(return_value={"status": "ok", "curators": []})
+        with patch.dict(HANDLER_REGISTRY._resolved, {"get_curators": fake}):
+            response = handler({"body": json.dumps({"handler": "get_curators"})})
+
+        assert response["statusCode"] == 200
+        assert json.loads(response["body"]) == {"status": "ok", "curators": []}
+
+    def test_missing_handler_field_raises(self):
+        with pytest.raises(ValueError, match="Missing required 'handler'"):
+            handler({})
+
+    def test_unknown_handler_raises(self):
+        with pytest.raises(ValueError, match="Unknown handler"):
+            handler({"handler": "not_a_handler"})
+
+
+# ── conditional responses ───────────────────────────────────────────
+
+
+def _url_event(payload: dict, **headers) -> dict:
+    return {"headers": headers, "body": json.dumps(payload)}
+
+
+class TestConditionalResponses:
+    @pytest.fixture
+    def seeded(self, local_s3):
+        lists = [{
+            "list_curator": "kinologue", "list_name": "Picks", "list_caption": "",
+            "start_date": "2026-01-01", "end_date": "2026-12-31", "list_films": [],
+        }]
+        local_s3.put_bytes(S3_BUCKET, curator_lists_key("kinologue"), json.dumps(lists).encode())
+        return local_s3
+
+    def test_matching_if_none_match_returns_304_without_reading_lists(self, seeded):
+        payload = {"handler": "get_custom_lists", "curator": "kinologue"}
+        etag = handler(_url_event(payload))["headers"]["ETag"]
+        seeded.calls.clear()
+
+        response = handler(_url_event(payload, **{"If-None-Match": etag}))
+
+        assert response["statusCode"] == 304
+        assert response["body"] == ""
+        assert response["headers"]["ETag"] == etag
+        assert seeded.count("get_object") == 0
+
+    def test_changed_lists_or_params_change_the_etag(self, seeded):
+        payload = {"handler": "get_custom_lists", "curator": "kinologue"}
+        etag = handler(_url_event(payload))["headers"]["ETag"]
+
+        summary = handler(_url_event({**payload, "view": "summary"}, **{"if-none-match": etag}))
+        assert summary["statusCode"] == 200
+        assert summary["headers"]["ETag"] != etag
+
+        seeded.put_bytes(S3_BUCKET, curator_lists_key("kinologue"), b"[]")
+        response = handler(_url_event(payload, **{"if-none-match": etag}))
+        assert response["statusCode"] == 200
+        assert json.loads(response["body"])["lists_count"] == 0
+
+    def test_compressed_tag_names_encoding_and_still_matches(self, seeded):
+        payload = {"handler": "get_custom_lists", "curator": "kinologue"}
+        identity = handler(_url_event(payload))["headers"]["ETag"]
+
+        with patch("core.compression.RESPONSE_COMPRESSION_MIN_BYTES", 0):
+            gzipped = handler(_url_event(payload, **{"Accept-Encoding": "gzip"}))["headers"]["ETag"]
+        assert gzipped == f'{identity[:-1]}-gzip"'
+
+        response = handler(_url_event(payload, **{"If-None-Match": f'"other", W/{gzipped}'}))
+        assert response["statusCode"] == 304
+
+    def test_direct_invocation_has_no_etag(self, seeded):
+        response = handler({"handler": "get_custom_lists", "curator": "kinologue"})
+        assert "ETag" not in response["headers"]
+        assert seeded.count("head_object") == 0
+
+    def test_write_handlers_have_no_etag(self, seeded):
+        payload = {"handler": "update_list", "curator": "kinologue", "list_name": "Picks", "updates": {"list_caption": "x"}}
+        assert "ETag" not in handler(_url_event(payload))["headers"]
@@ -0,0 +1,166 @@
+"""
+Unit tests for the precomputed film catalogue (core.film_catalogue) and
+the S3 event routing that triggers build_film_catalogue.
+
+All S3 calls are mocked.
+"""
+
+import json
+import pathlib
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+from core import film_catalogue
+from core.film_catalogue import build_film_catalogue, load_film_catalogue, summarise_film
+from handlers.custom_lists.build_film_catalogue_handler import build_film_catalogue_handler
+from handlers.custom_lists.entrypoint import _normalize_event
+from config import FILM_CATALOGUE_KEY
+
+FIXTURES = pathlib.Path(__file__).parent.parent / "fixtures" / "film_catalogue"
+EVENTS = pathlib.Path(__file__).parent.parent.parent / "local_testing" / "events"
+
+
+def _load_fixture(name: str) -> dict:
+    return json.loads((FIXTURES / name).read_text())
+
+
+@pytest.fixture(autouse=True)
+def _no_fallback_catalogue():
+    film_catalogue._fallback_catalogue = None
+    yield
+    film_catalogue._fallback_catalogue = None
+
+
+# ── building ────────────────────────────────────────────────────────
+
+
+class TestBuildCatalogue:
+    def test_summary_has_showings_per_cinema(self):
+        pan = _load_fixture("pan_cinema_listings_small.json")
+        summary = summarise_film(pan["6114"])
+
+        assert summary["title"] == "Bram Stoker's Dracula"
+        assert summary["directors"] == ["Francis Ford Coppola"]
+        assert summary["cinema_count"] == 2
+        assert summary["cinema_showings"]["prince_charles"][0]["showtimes"] == ["14:00", "19:30"]
+        assert summary["cinema_showings"]["bfi_southbank"] == []
+
+    def test_string_director_becomes_list(self):
+        pan = _load_fixture("pan_cinema_listings_small.json")
+        assert summarise_film(pan["7001"])["directors"] == ["Yasujirō Ozu"]
+
+    def test_films_without_title_are_skipped(self):
+        pan = _load_fixture("pan_cinema_listings_small.json")
+        catalogue = build_film_catalogue(pan.items(), '"etag-1"')
+
+        assert catalogue["film_count"] == 2
+        assert catalogue["skipped_no_title"] == 1
+        assert "9999" not in catalogue["films"]
+        assert catalogue["source_etag"] == '"etag-1"'
+
+
+# ── serving ─────────────────────────────────────────────────────────
+
+
+class TestLoadCatalogue:
+    def test_fresh_artifact_is_served(self):
+        stored = {"source_etag": '"etag-1"', "film_count": 0, "films": {}}
+        with (
+            patch("core.film_catalogue.get_s3_object_etag", return_value='"etag-1"'),
+            patch("core.film_catalogue.download_json_from_s3", return_value=stored),
+            patch("core.film_catalogue.stream_json_items_from_s3") as mock_pan,
+        ):
+            assert load_film_catalogue(MagicMock()) is stored
+            mock_pan.assert_not_called()
+
+    def test_stale_artifact_falls_back_to_listings(self):
+        stored = {"source_etag": '"old"', "film_count": 0, "films": {}}
+        pan = _load_fixture("pan_cinema_listings_small.json")
+        with (
+            patch("core.film_catalogue.get_s3_object_etag", return_value='"new"'),
+            patch("core.film_catalogue.download_json_from_s3", return_value=stored),
+            patch("core.film_catalogue.stream_json_items_from_s3", return_value=(iter(pan.items()), '"new"')) as mock_pan,
+        ):
+            catalogue = load_film_catalogue(MagicMock())
+            assert catalogue["source_etag"] == '"new"'
+            assert catalogue["film_count"] == 2
+
+            # A second call reuses the fallback built for the same listings version
+            load_film_catalogue(MagicMock())
+            mock_pan.assert_called_once()
+
+    def test_missing_artifact_falls_back_to_listings(self):
+        pan = _load_fixture("pan_cinema_listings_small.json")
+        with (
+            patch("core.film_catalogue.get_s3_object_etag", return_value='"new"'),
+            patch("core.film_catalogue.download_json_from_s3", side_effect=FileNotFoundError),
+            patch("core.film_catalogue.stream_json_items_from_s3", return_value=(iter(pan.items()), '"new"')),
+        ):
+            assert load_film_catalogue(MagicMock())["film_count"] == 2
+
+
+# ── build handler ───────────────────────────────────────────────────
+
+
+class TestBuildHandler:
+    @pytest.fixture
+    def mocks(self):
+        pan = _load_fixture("pan_cinema_listings_small.json")
+        with (
+            patch("handlers.custom_lists.build_film_catalogue_handler.get_s3_client") as mock_client,
+            patch(
+                "handlers.custom_lists.build_film_catalogue_handler.get_s3_object_etag",
+                return_value='"etag-1"',
+            ),
+            patch(
+                "handlers.custom_lists.build_film_catalogue_handler.stream_json_items_from_s3",
+                return_value=(iter(pan.items()), '"etag-1"'),
+            ) as mock_stream,
+            patch("handlers.custom_lists.build_film_catalogue_handler.download_json_from_s3") as mock_download,
+            patch("handlers.custom_lists.build_film_catalogue_handler.upload_dict_to_s3") as mock_upload,
+        ):
+            mock_client.return_value = MagicMock()
+            mock_download.side_effect = FileNotFoundError
+            yield {"download": mock_download, "upload": mock_upload, "stream": mock_stream}
+
+    def test_writes_catalogue_tagged_with_source_etag(self, mocks):
+        result = build_film_catalogue_handler({})
+
+        assert result["rebuilt"] is True
+        key, catalogue = mocks["upload"].call_args[0][2:4]
+        assert key == FILM_CATALOGUE_KEY
+        assert catalogue["source_etag"] == '"etag-1"'
+        assert catalogue["film_count"] == 2
+
+    def test_up_to_date_catalogue_is_not_rebuilt(self, mocks):
+        mocks["download"].side_effect = None
+        mocks["download"].return_value = {"source_etag": '"etag-1"', "film_count": 2}
+
+        result = build_film_catalogue_handler({})
+
+        assert result["rebuilt"] is False
+        mocks["stream"].assert_not_called()
+        mocks["upload"].assert_not_called()
+
+    def test_force_rebuilds(self, mocks):
+        mocks["download"].side_effect = None
+        mocks["download"].return_value = {"source_etag": '"etag-1"', "film_count": 2}
+
+        assert build_film_catalogue_handler({"force": True})["rebuilt"] is True
+        mocks["upload"].assert_called_once()
+
+
+# ── S3 event routing ────────────────────────────────────────────────
+
+
+class TestS3EventRouting:
+    def test_pan_listings_put_routes_to_build_film_catalogue(self):
+        event = json.loads((EVENTS / "pan_cinema_listings_put.json").read_text())
+        assert _normalize_event(event)["handler"] == "build_film_catalogue"
+
+    def test_unrelated_key_is_rejected(self):
+        event = json.loads((EVENTS / "pan_cinema_listings_put.json").read_text())
+        event["Records"][0]["s3"]["object"]["key"] = "london/other.json"
+        with pytest.raises(ValueError, match="does not match"):
+            _normalize_event(event)
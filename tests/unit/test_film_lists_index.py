@@ -0,0 +1,163 @@
+"""
+Unit tests for the reverse film index (core.film_lists_index) and the
+get_lists_for_film / rebuild_film_index handlers.
+
+List handlers run against LocalS3Client and the index is read back
+through get_lists_for_film.
+"""
+
+import json
+
+import pytest
+
+from core import curator_store, film_lists_index
+from core.curator_store import curator_lists_key, update_curator_film_lists
+from core.film_lists_index import list_memberships, membership_changes
+from handlers.custom_lists.delete_list_handler import delete_list_handler
+from handlers.custom_lists.get_lists_for_film_handler import get_lists_for_film_handler
+from handlers.custom_lists.rebuild_film_index_handler import rebuild_film_index_handler
+from handlers.custom_lists.remove_film_from_list_handler import remove_film_from_list_handler
+from handlers.custom_lists.update_list_film_caption_handler import update_list_film_caption_handler
+from handlers.custom_lists.update_list_handler import update_list_handler
+from config import S3_BUCKET, FILM_LISTS_INDEX_PREFIX
+
+
+def _film(db_id: int) -> dict:
+    return {"db_id": db_id, "cinema_listings": {}, "list_film_caption": ""}
+
+
+def _list(curator: str, name: str, db_ids) -> dict:
+    return {
+        "list_curator": curator,
+        "list_name": name,
+        "list_caption": "",
+        "start_date": "2026-01-01",
+        "end_date": "2026-12-31",
+        "list_films": [_film(i) for i in db_ids],
+    }
+
+
+def _lists_for(db_id: int) -> list:
+    return [(ref["curator"], ref["list_name"]) for ref in get_lists_for_film_handler({"db_id": db_id})["lists"]]
+
+
+def _index_puts(s3) -> int:
+    return s3.count("put_object", prefix=f"{FILM_LISTS_INDEX_PREFIX}/")
+
+
+@pytest.fixture
+def seeded(local_s3):
+    """kinologue has A (1, 2) and B (2, 3), bfi has C (3); the index is built from them."""
+    local_s3.put_bytes(S3_BUCKET, curator_lists_key("kinologue"), json.dumps([
+        _list("kinologue", "A", [1, 2]), _list("kinologue", "B", [2, 3]),
+    ]).encode())
+    local_s3.put_bytes(S3_BUCKET, curator_lists_key("bfi"), json.dumps([_list("bfi", "C", [3])]).encode())
+    rebuild_film_index_handler({})
+    local_s3.calls.clear()
+    return local_s3
+
+
+class TestMembershipChanges:
+    def test_added_and_removed_films(self):
+        before = {"A": frozenset({1, 2})}
+        after = {"A": frozenset({2, 3})}
+
+        assert membership_changes("k", before, after) == {3: ({"A"}, set()), 1: (set(), {"A"})}
+
+    def test_rename_moves_every_film(self):
+        before = list_memberships([_list("k", "A", [1, 2])])
+        after = list_memberships([_list("k", "A2", [1, 2])])
+
+        assert membership_changes("k", before, after) == {1: ({"A2"}, {"A"}), 2: ({"A2"}, {"A"})}
+
+    def test_lists_not_loaded_are_unchanged(self):
+        before = {"A": None, "B": None}
+        after = {"A": None}
+
+        assert membership_changes("k", before, after) == {}
+
+
+class TestIncrementalUpdates:
+    def test_rebuild_seeds_every_film(self, seeded):
+        assert _lists_for(2) == [("kinologue", "A"), ("kinologue", "B")]
+        assert _lists_for(3) == [("bfi", "C"), ("kinologue", "B")]
+        assert _lists_for(99) == []
+
+    def test_remove_film(self, seeded):
+        remove_film_from_list_handler({"curator": "kinologue", "list_name": "A", "db_id": 2})
+
+        assert _lists_for(2) == [("kinologue", "B")]
+        assert _index_puts(seeded) == 1
+
+    def test_assign_films(self, seeded):
+        def _assign(film_lists):
+            film_lists[0]["list_films"].extend([_film(3), _film(7)])
+
+        update_curator_film_lists(seeded, "kinologue", _assign)
+
+        assert _lists_for(3) == [("bfi", "C"), ("kinologue", "A"), ("kinologue", "B")]
+        assert _lists_for(7) == [("kinologue", "A")]
+
+    def test_rename_list(self, seeded):
+        update_list_handler({"curator": "kinologue", "list_name": "B", "updates": {"list_name": "B2"}})
+
+        assert _lists_for(2) == [("kinologue", "A"), ("kinologue", "B2")]
+        assert _lists_for(3) == [("bfi", "C"), ("kinologue", "B2")]
+
+    def test_delete_list(self, seeded):
+        delete_list_handler({"curator": "kinologue", "list_name": "B"})
+
+        assert _lists_for(2) == [("kinologue", "A")]
+        assert _lists_for(3) == [("bfi", "C")]
+
+    def test_edit_without_membership_change_writes_no_index(self, seeded):
+        update_list_film_caption_handler({"curator": "kinologue", "list_name": "A", "db_id": 1, "new_caption": "x"})
+
+        assert _index_puts(seeded) == 0
+
+    def test_index_failure_does_not_fail_the_write(self, seeded, monkeypatch):
+        def _fail(*args):
+            raise RuntimeError("index down")
+
+        monkeypatch.setattr(film_lists_index, "update_film_index_entry", _fail)
+        result = remove_film_from_list_handler({"curator": "kinologue", "list_name": "A", "db_id": 2})
+
+        assert result["status"] == "ok"
+        assert _lists_for(2) == [("kinologue", "A"), ("kinologue", "B")]  # stale until rebuilt
+
+
+class TestRebuild:
+    def test_unchanged_index_is_not_rewritten(self, seeded):
+        result = rebuild_film_index_handler({})
+
+        assert (result["films_indexed"], result["written"], result["unchanged"]) == (3, 0, 3)
+        assert _index_puts(seeded) == 0
+
+    def test_repairs_stale_and_deletes_orphans(self, seeded, monkeypatch):
+        monkeypatch.setattr(curator_store, "_record_memberships_quietly", lambda *args: None)
+        delete_list_handler({"curator": "bfi", "list_name": "C"})
+        remove_film_from_list_handler({"curator": "kinologue", "list_name": "A", "db_id": 1})
+
+        result = rebuild_film_index_handler({})
+
+        assert result["deleted"] == 1
+        assert _lists_for(1) == []
+        assert _lists_for(3) == [("kinologue", "B")]
+
+    def test_unreadable_curator_writes_nothing(self, seeded):
+        seeded.put_bytes(S3_BUCKET, curator_lists_key("broken"), b'[{"list_name": 1}]')
+
+        result = rebuild_film_index_handler({})
+
+        assert result["status"] == "error"
+        assert list(result["errors"]) == ["broken"]
+        assert _index_puts(seeded) == 0
+
+
+class TestGetListsForFilm:
+    def test_string_db_id(self, seeded):
+        assert get_lists_for_film_handler({"db_id": "1"})["lists"] == [{"curator": "kinologue", "list_name": "A"}]
+
+    def test_invalid_db_id(self, seeded):
+        with pytest.raises(ValueError, match="db_id"):
+            get_lists_for_film_handler({"db_id": "abc"})
@@ -0,0 +1,132 @@
+"""
+Unit tests for the search_films index (core.film_search) and handler.
+
+The catalogue is built from fixtures and load_film_catalogue is mocked,
+so no S3 calls are made.
+"""
+
+import json
+import math
+import pathlib
+import random
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+from core.film_catalogue import build_film_catalogue, original_titles
+from core.film_index import trigrams
+from core.film_search import (
+    FilmSearchIndex,
+    get_film_search_index,
+    normalise,
+    query_trigrams,
+)
+from handlers.custom_lists.search_films_handler import search_films_handler
+from config import FILM_SEARCH_MIN_MATCH
+
+FIXTURES = pathlib.Path(__file__).parent.parent / "fixtures" / "film_catalogue"
+
+
+def _catalogue(titles, etag='"etag-1"'):
+    pan = {
+        str(1000 + i): {"rio": {"when": [], "_additional_info": {"title": title, "directors": [f"Director {i}"]}}}
+        for i, title in enumerate(titles)
+    }
+    return build_film_catalogue(pan.items(), etag)
+
+
+@pytest.fixture
+def catalogue():
+    pan = json.loads((FIXTURES / "pan_cinema_listings_small.json").read_text())
+    return build_film_catalogue(pan.items(), '"etag-1"')
+
+
+@pytest.fixture
+def serve(catalogue):
+    with patch("handlers.custom_lists.search_films_handler.get_s3_client", return_value=MagicMock()):
+        with patch("handlers.custom_lists.search_films_handler.load_film_catalogue", return_value=catalogue):
+            yield
+
+
+def _top(event) -> tuple:
+    result = search_films_handler(event)["results"][0]
+    return result["db_id"], result["matched"]
+
+
+class TestSearch:
+    @pytest.mark.parametrize("query, expected", [
+        ("tokyo story", ("7001", "title")),
+        ("tokio story", ("7001", "title")),      # misspelt
+        ("toky", ("7001", "title")),             # partly typed
+        ("monogatari", ("7001", "original_title")),
+        ("drakula", ("6114", "title")),
+        ("copola", ("6114", "director")),
+        ("OZU", ("7001", "director")),
+    ])
+    def test_finds_film(self, serve, query, expected):
+        assert _top({"query": query}) == expected
+
+    def test_unrelated_query_finds_nothing(self, serve):
+        assert search_films_handler({"query": "zzzz qqqq"})["results"] == []
+
+    def test_closer_title_ranks_first(self):
+        index = FilmSearchIndex(_catalogue(["Alien Resurrection", "Aliens", "Alien"]))
+
+        assert [r["title"] for r in index.search("alien", 10)] == ["Alien", "Aliens", "Alien Resurrection"]
+
+    def test_limit(self):
+        index = FilmSearchIndex(_catalogue([f"Film {i}" for i in range(30)]))
+
+        assert len(index.search("film", 5)) == 5
+
+    def test_rare_trigram_candidates_miss_nothing(self):
+        rng = random.Random(0)
+        words = ["night", "city", "love", "story", "dead", "river", "house", "summer", "blue", "king"]
+        titles = [" ".join(rng.sample(words, 3)) for _ in range(200)]
+        index = FilmSearchIndex(_catalogue(titles))
+
+        for title in titles[:20]:
+            # Drop one letter: a typo
+            cut = rng.randrange(len(title))
+            query = title[:cut] + title[cut + 1:]
+            grams = query_trigrams(normalise(query))
+            needed = max(1, math.ceil(FILM_SEARCH_MIN_MATCH * len(grams)))
+            brute = {
+                str(1000 + i) for i, t in enumerate(titles)
+                if len(grams & trigrams(f" {normalise(t)} ")) >= needed
+            }
+            found = {r["db_id"] for r in index.search(query, len(titles)) if r["matched"] == "title"}
+            assert found == brute
+
+
+class TestHandler:
+    def test_short_query_rejected(self, serve):
+        with pytest.raises(ValueError, match="query"):
+            search_films_handler({"query": " a "})
+
+    def test_limit_out_of_range(self, serve):
+        with pytest.raises(ValueError, match="limit"):
+            search_films_handler({"query": "tokyo", "limit": 0})
+
+    def test_index_reused_until_catalogue_changes(self):
+        first = _catalogue(["Alien"], etag='"v1"')
+
+        assert get_film_search_index(first) is get_film_search_index(first)
+        assert get_film_search_index(_catalogue(["Alien"], etag='"v2"')) is not get_film_search_index(first)
+
+
+class TestNormalise:
+    def test_accents_case_and_punctuation(self):
+        assert normalise("Yasujirō  OZU's (35mm)") == "yasujiro ozu s 35mm"
+
+    def test_catalogue_keeps_original_titles_out_of_film_summaries(self, catalogue):
+        assert catalogue["original_titles"]["7001"] == ["Tokyo Monogatari"]
+        assert "original_titles" not in catalogue["films"]["7001"]
+
+    def test_empty_original_titles_are_dropped(self):
+        listings = {
+            "rio": {"_additional_info": {"original_raw_titles": ""}},
+            "bfi": {"_additional_info": {"original_raw_titles": ["", "Alien", "Alien 1979"]}},
+        }
+
+        assert original_titles(listings, "Alien") == ["Alien 1979"]
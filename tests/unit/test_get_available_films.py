@@ -0,0 +1,144 @@
+"""
+Unit tests for get_available_films_handler filtering and pagination.
+
+The catalogue is built from fixtures and load_film_catalogue is mocked,
+so no S3 calls are made.
+"""
+
+import json
+import pathlib
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+from core.film_catalogue import build_film_catalogue
+from core.film_index import FilmCatalogueIndex
+from handlers.custom_lists.get_available_films_handler import get_available_films_handler
+
+FIXTURES = pathlib.Path(__file__).parent.parent / "fixtures" / "film_catalogue"
+
+
+def _load_fixture(name: str) -> dict:
+    return json.loads((FIXTURES / name).read_text())
+
+
+def _synthetic_catalogue(count: int):
+    pan = {}
+    for i in range(count):
+        pan[str(1000 + i)] = {
+            f"cinema_{i % 3}": {
+                "when": [{"date": f"2026-03-{1 + i % 28:02d}", "showtimes": ["20:00"]}],
+                "_additional_info": {"title": f"Film {i:03d}", "directors": [f"Director {i % 5}"], "year": 1950 + i},
+            }
+        }
+    return build_film_catalogue(pan.items(), '"synthetic"')
+
+
+@pytest.fixture
+def catalogue():
+    return build_film_catalogue(_load_fixture("pan_cinema_listings_small.json").items(), '"etag-1"')
+
+
+@pytest.fixture
+def serve():
+    with (
+        patch("handlers.custom_lists.get_available_films_handler.get_s3_client", return_value=MagicMock()),
+        patch("handlers.custom_lists.get_available_films_handler.load_film_catalogue") as mock_load,
+    ):
+        yield mock_load
+
+
+# ── unfiltered ──────────────────────────────────────────────────────
+
+
+class TestUnfiltered:
+    def test_returns_every_film_without_params(self, serve, catalogue):
+        serve.return_value = catalogue
+        result = get_available_films_handler({})
+
+        assert result["status"] == "ok"
+        assert result["film_count"] == 2
+        assert list(result["films"]) == ["6114", "7001"]  # ordered by title
+        assert result["next_cursor"] is None
+
+
+# ── filters ─────────────────────────────────────────────────────────
+
+
+class TestFilters:
+    @pytest.mark.parametrize("event, expected", [
+        ({"title": "drac"}, ["6114"]),
+        ({"title": "STORY"}, ["7001"]),
+        ({"title": "zz"}, []),
+        ({"director": "ozu"}, ["7001"]),
+        ({"year_from": 1960}, ["6114"]),
+        ({"year_to": 1960}, ["7001"]),
+        ({"cinema": "bfi_southbank"}, ["6114"]),
+        ({"date_from": "2026-03-15", "date_to": "2026-03-31"}, ["7001"]),
+        ({"cinema": "rio", "director": "coppola"}, []),
+    ])
+    def test_filter(self, serve, catalogue, event, expected):
+        serve.return_value = catalogue
+        assert list(get_available_films_handler(event)["films"]) == expected
+
+    def test_bad_date_rejected(self, serve, catalogue):
+        serve.return_value = catalogue
+        with pytest.raises(ValueError, match="date_from"):
+            get_available_films_handler({"date_from": "March"})
+
+    def test_bad_year_rejected(self, serve, catalogue):
+        serve.return_value = catalogue
+        with pytest.raises(ValueError, match="year_from"):
+            get_available_films_handler({"year_from": "nineteen"})
+
+
+# ── pagination ──────────────────────────────────────────────────────
+
+
+class TestPagination:
+    def test_pages_cover_all_films_once(self, serve):
+        serve.return_value = _synthetic_catalogue(120)
+
+        seen, cursor = [], None
+        while True:
+            result = get_available_films_handler({"limit": 50, "cursor": cursor})
+            seen.extend(result["films"])
+            cursor = result["next_cursor"]
+            if cursor is None:
+                break
+
+        assert len(seen) == 120
+        assert len(set(seen)) == 120
+        assert seen == sorted(seen, key=lambda i: int(i))
+
+    def test_cursor_alone_uses_default_page_size(self, serve):
+        serve.return_value = _synthetic_catalogue(120)
+        first = get_available_films_handler({"limit": 10})
+        second = get_available_films_handler({"cursor": first["next_cursor"]})
+
+        assert second["returned_count"] == 50
+        assert second["film_count"] == 120
+
+    def test_pagination_applies_after_filters(self, serve):
+        serve.return_value = _synthetic_catalogue(120)
+        result = get_available_films_handler({"director": "director 1", "limit": 5})
+
+        assert result["film_count"] == 24
+        assert result["returned_count"] == 5
+        assert result["next_cursor"] is not None
+
+    def test_limit_out_of_range(self, serve, catalogue):
+        serve.return_value = catalogue
+        with pytest.raises(ValueError, match="limit"):
+            get_available_films_handler({"limit": 0})
+
+    def test_invalid_cursor(self, serve, catalogue):
+        serve.return_value = catalogue
+        with pytest.raises(ValueError, match="cursor"):
+            get_available_films_handler({"cursor": "not-a-cursor"})
+
+
+class TestIndex:
+    def test_index_orders_by_title(self):
+        index = FilmCatalogueIndex(_synthetic_catalogue(12))
+        assert index.order[:3] == ["1000", "1001", "1002"]
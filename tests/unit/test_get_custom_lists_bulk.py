@@ -0,0 +1,88 @@
+"""
+Unit tests for get_custom_lists_bulk_handler.
+
+Runs against LocalS3Client; a delayed variant checks that fetches across
+curators overlap.
+"""
+
+import json
+import time
+
+import pytest
+
+from core.curator_store import curator_lists_key
+from handlers.custom_lists.get_custom_lists_bulk_handler import get_custom_lists_bulk_handler
+from tests.local_s3 import LocalS3Client
+from config import S3_BUCKET
+
+
+def _seed(s3, curator: str, list_names: list) -> None:
+    lists = [
+        {
+            "list_curator": curator, "list_name": name, "list_caption": "",
+            "start_date": "2026-01-01", "end_date": "2026-12-31", "list_films": [],
+        }
+        for name in list_names
+    ]
+    s3.put_bytes(S3_BUCKET, curator_lists_key(curator), json.dumps(lists).encode())
+
+
+class _SlowS3(LocalS3Client):
+    DELAY_SECONDS = 0.1
+
+    def get_object(self, **kwargs):
+        time.sleep(self.DELAY_SECONDS)
+        return super().get_object(**kwargs)
+
+
+class TestBulkHandler:
+    def test_returns_lists_per_curator(self, local_s3):
+        _seed(local_s3, "kinologue", ["A", "B"])
+        _seed(local_s3, "bfi", ["C"])
+
+        result = get_custom_lists_bulk_handler({"curators": ["kinologue", "bfi"]})
+
+        assert result["status"] == "ok"
+        assert result["results"]["kinologue"]["lists_count"] == 2
+        assert [fl["list_name"] for fl in result["results"]["bfi"]["film_lists"]] == ["C"]
+        assert result["errors"] == {}
+
+    def test_failing_curator_gives_partial_result(self, local_s3):
+        _seed(local_s3, "kinologue", ["A"])
+        local_s3.put_bytes(S3_BUCKET, curator_lists_key("broken"), b'{"not": "a list"}')
+
+        result = get_custom_lists_bulk_handler({"curators": ["kinologue", "broken"]})
+
+        assert result["status"] == "partial"
+        assert list(result["results"]) == ["kinologue"]
+        assert "Corrupt filmLists.json" in result["errors"]["broken"]
+
+    def test_all_uses_the_curators_registry(self, local_s3):
+        _seed(local_s3, "kinologue", ["A"])
+        _seed(local_s3, "bfi", [])
+
+        result = get_custom_lists_bulk_handler({"curators": "all"})
+
+        assert sorted(result["results"]) == ["bfi", "kinologue"]
+
+    def test_missing_curators_field_raises(self, local_s3):
+        with pytest.raises(ValueError, match="curators"):
+            get_custom_lists_bulk_handler({})
+
+    def test_fetches_run_concurrently(self, monkeypatch):
+        from core import s3 as core_s3
+
+        slow = _SlowS3()
+        monkeypatch.setattr(core_s3, "_s3_client", slow)
+        curators = [f"curator{i}" for i in range(8)]
+        for curator in curators:
+            _seed(slow, curator, ["A"])
+
+        start = time.perf_counter()
+        result = get_custom_lists_bulk_handler({"curators": curators})
+        elapsed = time.perf_counter() - start
+
+        assert result["curator_count"] == 8
+        # Sequential would take 8 x DELAY_SECONDS
+        assert elapsed < 4 * _SlowS3.DELAY_SECONDS
+
@@ -0,0 +1,113 @@
+"""
+Unit tests for embedded vs normalized ListFilm storage (core.list_films)
+and read-time hydration in get_custom_lists_handler.
+"""
+
+import copy
+import json
+import pathlib
+
+import pytest
+
+from core.list_films import (
+    hydrate_film_lists,
+    listing_hash,
+    make_list_film,
+    needs_hydration,
+    prepare_film_lists_for_storage,
+)
+from core.curator_store import curator_lists_key
+from handlers.custom_lists.get_custom_lists_handler import get_custom_lists_handler
+from config import S3_BUCKET, PAN_CINEMA_LISTINGS_KEY
+
+FIXTURES = pathlib.Path(__file__).parent.parent / "fixtures" / "film_catalogue"
+
+
+def _load_fixture(name: str) -> dict:
+    return json.loads((FIXTURES / name).read_text())
+
+
+@pytest.fixture
+def pan():
+    return _load_fixture("pan_cinema_listings_small.json")
+
+
+def _one_list(films):
+    return [{
+        "list_curator": "kinologue",
+        "list_name": "March Picks",
+        "list_caption": "",
+        "start_date": "2026-03-01",
+        "end_date": "2026-03-31",
+        "list_films": films,
+    }]
+
+
+# ── hashing ─────────────────────────────────────────────────────────
+
+
+class TestListingHash:
+    def test_hash_ignores_key_order(self, pan):
+        reordered = dict(reversed(list(pan["6114"].items())))
+        assert listing_hash(reordered) == listing_hash(pan["6114"])
+
+    def test_hash_changes_with_content(self, pan):
+        changed = copy.deepcopy(pan["6114"])
+        changed["prince_charles"]["when"][0]["showtimes"].append("22:00")
+        assert listing_hash(changed) != listing_hash(pan["6114"])
+
+
+# ── storage forms ───────────────────────────────────────────────────
+
+
+class TestStorageForms:
+    def test_embedded_film_carries_listings(self, pan):
+        film = make_list_film(6114, pan["6114"], mode="embedded")
+        assert film["cinema_listings"] is pan["6114"]
+
+    def test_normalized_film_is_a_ref(self, pan):
+        film = make_list_film(6114, pan["6114"], mode="normalized")
+        assert film == {"db_id": 6114, "list_film_caption": "", "listing_hash": listing_hash(pan["6114"])}
+
+    def test_prepare_normalizes_embedded_films(self, pan):
+        film_lists = _one_list([make_list_film(6114, pan["6114"], "Great", mode="embedded")])
+        prepare_film_lists_for_storage(film_lists, mode="normalized")
+
+        stored = film_lists[0]["list_films"][0]
+        assert "cinema_listings" not in stored
+        assert stored["list_film_caption"] == "Great"
+
+    def test_prepare_leaves_embedded_mode_untouched(self, pan):
+        film_lists = _one_list([make_list_film(6114, pan["6114"], mode="embedded")])
+        prepare_film_lists_for_storage(film_lists, mode="embedded")
+        assert "cinema_listings" in film_lists[0]["list_films"][0]
+
+
+# ── hydration ───────────────────────────────────────────────────────
+
+
+class TestHydration:
+    def test_refs_are_hydrated_from_pan_listings(self, pan):
+        film_lists = _one_list([make_list_film(7001, pan["7001"], mode="normalized")])
+        assert needs_hydration(film_lists)
+
+        hydrate_film_lists(film_lists, pan)
+        assert film_lists[0]["list_films"][0]["cinema_listings"] is pan["7001"]
+        assert not needs_hydration(film_lists)
+
+    def test_film_missing_upstream_gets_empty_listings(self, pan):
+        film_lists = _one_list([{"db_id": 1, "list_film_caption": "", "listing_hash": "x"}])
+        hydrate_film_lists(film_lists, pan)
+        assert film_lists[0]["list_films"][0]["cinema_listings"] == {}
+
+    def test_get_custom_lists_hydrates_mixed_file(self, pan, local_s3):
+        stored = _one_list([
+            make_list_film(6114, pan["6114"], mode="embedded"),
+            make_list_film(7001, pan["7001"], mode="normalized"),
+        ])
+        local_s3.put_bytes(S3_BUCKET, PAN_CINEMA_LISTINGS_KEY, json.dumps(pan).encode("utf-8"))
+        local_s3.put_bytes(S3_BUCKET, curator_lists_key("kinologue"), json.dumps(stored).encode("utf-8"))
+        result = get_custom_lists_handler({"curator": "kinologue"})
+
+        films = result["film_lists"][0]["list_films"]
+        assert [f["cinema_listings"] for f in films] == [pan["6114"], pan["7001"]]
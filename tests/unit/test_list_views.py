@@ -0,0 +1,107 @@
+"""
+Unit tests for the get_custom_lists views and field projections
+(core.list_views), against LocalS3Client.
+"""
+
+import json
+import pathlib
+
+import pytest
+
+from core import film_catalogue
+from core.curator_store import curator_lists_key
+from core.list_films import make_list_film
+from core.list_views import parse_view
+from handlers.custom_lists.get_custom_lists_handler import get_custom_lists_handler
+from config import S3_BUCKET, PAN_CINEMA_LISTINGS_KEY
+
+FIXTURES = pathlib.Path(__file__).parent.parent / "fixtures" / "film_catalogue"
+CURATOR = "kinologue"
+
+
+@pytest.fixture(autouse=True)
+def _no_fallback_catalogue():
+    film_catalogue._fallback_catalogue = None
+    yield
+    film_catalogue._fallback_catalogue = None
+
+
+@pytest.fixture
+def seeded(local_s3):
+    """"Picks" holds Dracula embedded and Tokyo Story normalized; "Empty" has no films."""
+    pan = json.loads((FIXTURES / "pan_cinema_listings_small.json").read_text())
+    local_s3.put_bytes(S3_BUCKET, PAN_CINEMA_LISTINGS_KEY, json.dumps(pan).encode())
+    lists = [
+        {
+            "list_curator": CURATOR, "list_name": "Picks", "list_caption": "Ours",
+            "start_date": "2026-03-01", "end_date": "2026-03-31",
+            "list_films": [
+                make_list_film(6114, pan["6114"], "Gothic", mode="embedded"),
+                make_list_film(7001, pan["7001"], mode="normalized"),
+            ],
+        },
+        {
+            "list_curator": CURATOR, "list_name": "Empty", "list_caption": "",
+            "start_date": "2026-04-01", "end_date": "2026-04-30", "list_films": [],
+        },
+    ]
+    local_s3.put_bytes(S3_BUCKET, curator_lists_key(CURATOR), json.dumps(lists).encode())
+    local_s3.calls.clear()
+    return local_s3
+
+
+class TestParseView:
+    def test_defaults_to_every_full_field(self):
+        view, fields = parse_view({})
+        assert view == "full"
+        assert "list_films" in fields
+
+    def test_fields_follow_view_order(self):
+        assert parse_view({"view": "summary", "fields": ["films", "list_name"]}) == ("summary", ["list_name", "films"])
+
+    @pytest.mark.parametrize("event, match", [
+        ({"view": "compact"}, "Invalid view"),
+        ({"fields": []}, "non-empty list"),
+        ({"fields": ["films"]}, "Unknown field"),
+    ])
+    def test_invalid_requests_raise(self, event, match):
+        with pytest.raises(ValueError, match=match):
+            parse_view(event)
+
+
+class TestGetCustomListsViews:
+    def test_summary_has_titles_counts_and_no_listings(self, seeded):
+        result = get_custom_lists_handler({"curator": CURATOR, "view": "summary"})
+
+        picks, empty = result["film_lists"]
+        assert result["view"] == "summary"
+        assert picks["film_count"] == 2 and empty["film_count"] == 0
+        assert picks["films"] == [
+            {"db_id": 6114, "title": "Bram Stoker's Dracula", "list_film_caption": "Gothic"},
+            {"db_id": 7001, "title": "Tokyo Story", "list_film_caption": ""},
+        ]
+        assert "cinema_listings" not in json.dumps(result)
+
+    def test_full_view_without_films_skips_hydration(self, seeded):
+        result = get_custom_lists_handler({"curator": CURATOR, "fields": ["list_name", "end_date"]})
+
+        assert result["film_lists"] == [
+            {"list_name": "Picks", "end_date": "2026-03-31"},
+            {"list_name": "Empty", "end_date": "2026-04-30"},
+        ]
+        assert seeded.count("get_object", prefix=PAN_CINEMA_LISTINGS_KEY) == 0
+
+    def test_list_name_filter_applies_to_summary(self, seeded):
+        result = get_custom_lists_handler({"curator": CURATOR, "list_name": "Empty", "view": "summary"})
+
+        assert [fl["list_name"] for fl in result["film_lists"]] == ["Empty"]
+
+    def test_unknown_list_in_summary_raises(self, seeded):
+        with pytest.raises(ValueError, match="not found"):
+            get_custom_lists_handler({"curator": CURATOR, "list_name": "Z", "view": "summary", "fields": ["list_name"]})
+
+    def test_default_response_is_unchanged(self, seeded):
+        picks = get_custom_lists_handler({"curator": CURATOR})["film_lists"][0]
+
+        assert set(picks) == {"list_curator", "list_name", "list_caption", "start_date", "end_date", "list_films"}
+        assert all("cinema_listings" in f for f in picks["list_films"])
@@ -0,0 +1,81 @@
+"""
+Unit tests for per-invocation metrics (core.metrics) as emitted by the
+entrypoint, against LocalS3Client.
+"""
+
+import json
+
+import pytest
+
+from core import metrics
+from core.curator_store import curator_lists_key
+from handlers.custom_lists.entrypoint import handler
+from config import S3_BUCKET
+
+
+@pytest.fixture
+def seeded(local_s3, monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_ENABLED", True)
+    monkeypatch.setattr(metrics, "_invocation_count", 0)
+    lists = [{
+        "list_curator": "kinologue", "list_name": "Picks", "list_caption": "",
+        "start_date": "2026-01-01", "end_date": "2026-12-31", "list_films": [],
+    }]
+    local_s3.put_bytes(S3_BUCKET, curator_lists_key("kinologue"), json.dumps(lists).encode())
+    return local_s3
+
+
+def _records(capsys) -> list:
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines() if line.startswith('{"_aws"')]
+
+
+class TestInvocationMetrics:
+    def test_read_emits_one_emf_line_with_phases_and_bytes(self, seeded, capsys):
+        handler({"handler": "get_custom_lists", "curator": "kinologue"})
+
+        [record] = _records(capsys)
+        assert record["handler"] == "get_custom_lists"
+        assert record["cold_start"] is True
+        assert record["status_code"] == 200
+        for field in ("s3_get_ms", "json_decode_ms", "validate_ms", "handler_ms", "response_encode_ms"):
+            assert record[field] >= 0
+        assert record["s3_gets"] == 1
+        assert record["s3_read_bytes"] == len(seeded.get_bytes(S3_BUCKET, curator_lists_key("kinologue")))
+
+        emf = record["_aws"]["CloudWatchMetrics"][0]
+        assert emf["Dimensions"] == [["handler"]]
+        units = {m["Name"]: m["Unit"] for m in emf["Metrics"]}
+        assert units["s3_get_ms"] == "Milliseconds"
+        assert units["s3_read_bytes"] == "Bytes"
+        assert units["s3_gets"] == "Count"
+
+    def test_write_records_mutation_and_upload(self, seeded, capsys):
+        handler({"handler": "update_list", "curator": "kinologue", "list_name": "Picks",
+                 "updates": {"list_caption": "New"}})
+
+        record = _records(capsys)[0]
+        assert record["mutate_ms"] >= 0
+        assert record["s3_puts"] >= 1
+        assert record["s3_written_bytes"] > 0
+
+    def test_only_the_first_invocation_is_cold(self, seeded, capsys):
+        handler({"handler": "get_custom_lists", "curator": "kinologue"})
+        handler({"handler": "get_custom_lists", "curator": "kinologue"})
+
+        assert [r["cold_start"] for r in _records(capsys)] == [True, False]
+
+    def test_failed_invocation_still_emits_with_error(self, seeded, capsys):
+        with pytest.raises(ValueError):
+            handler({"handler": "get_custom_lists", "curator": "kinologue", "view": "bogus"})
+
+        [record] = _records(capsys)
+        assert record["error"] == "ValueError"
+        assert "status_code" not in record
+
+    def test_disabled_metrics_emit_nothing(self, seeded, capsys, monkeypatch):
+        monkeypatch.setattr(metrics, "METRICS_ENABLED", False)
+
+        handler({"handler": "get_custom_lists", "curator": "kinologue"})
+
+        assert _records(capsys) == []
+        assert metrics.span("s3_get") is metrics.span("validate")
@@ -0,0 +1,127 @@
+"""
+Unit tests for refresh_lists_handler.
+
+Runs against LocalS3Client with the small pan listings fixture.
+"""
+
+import copy
+import json
+import pathlib
+
+import pytest
+
+from core.curator_store import curator_lists_key
+from core.list_films import listing_hash, make_list_film
+from handlers.custom_lists.refresh_lists_handler import refresh_lists_handler
+from config import S3_BUCKET, PAN_CINEMA_LISTINGS_KEY
+
+FIXTURES = pathlib.Path(__file__).parent.parent / "fixtures" / "film_catalogue"
+CURATOR = "kinologue"
+
+
+@pytest.fixture
+def pan():
+    return json.loads((FIXTURES / "pan_cinema_listings_small.json").read_text())
+
+
+def _put_pan(local_s3, pan) -> None:
+    local_s3.put_bytes(S3_BUCKET, PAN_CINEMA_LISTINGS_KEY, json.dumps(pan).encode())
+
+
+def _put_lists(local_s3, curator: str, films: list) -> None:
+    lists = [{
+        "list_curator": curator, "list_name": "Picks", "list_caption": "",
+        "start_date": "2026-01-01", "end_date": "2026-12-31", "list_films": films,
+    }]
+    local_s3.put_bytes(S3_BUCKET, curator_lists_key(curator), json.dumps(lists).encode())
+
+
+def _stored_films(local_s3, curator: str = CURATOR) -> list:
+    return json.loads(local_s3.get_bytes(S3_BUCKET, curator_lists_key(curator)))[0]["list_films"]
+
+
+@pytest.fixture
+def seeded(local_s3, pan):
+    """Curator with Dracula and Tokyo Story embedded as of the fixture listings."""
+    _put_pan(local_s3, pan)
+    _put_lists(local_s3, CURATOR, [
+        make_list_film(6114, pan["6114"], mode="embedded"),
+        make_list_film(7001, pan["7001"], mode="embedded"),
+    ])
+    local_s3.calls.clear()
+    return local_s3
+
+
+class TestRefreshLists:
+    def test_unchanged_listings_are_not_written(self, seeded):
+        result = refresh_lists_handler({"curator": CURATOR})
+
+        report = result["results"][0]
+        assert (report["written"], report["films_checked"], report["films_refreshed"]) == (False, 2, [])
+        assert seeded.count("put_object", prefix=curator_lists_key(CURATOR)) == 0
+
+    def test_changed_film_is_rewritten_with_cinema_diff(self, seeded, pan):
+        updated = copy.deepcopy(pan)
+        updated["6114"]["rio"] = updated["6114"].pop("bfi_southbank")
+        _put_pan(seeded, updated)
+
+        result = refresh_lists_handler({"curator": CURATOR})
+
+        assert result["results"][0]["films_refreshed"] == [{
+            "list_name": "Picks", "db_id": 6114, "cinemas_added": ["rio"], "cinemas_removed": ["bfi_southbank"],
+        }]
+        dracula, tokyo = _stored_films(seeded)
+        assert set(dracula["cinema_listings"]) == {"prince_charles", "rio"}
+        assert dracula["listing_hash"] == listing_hash(updated["6114"])
+        assert tokyo["listing_hash"] == listing_hash(pan["7001"])
+
+    def test_films_missing_upstream_are_kept_and_reported(self, seeded, pan):
+        del pan["7001"]
+        _put_pan(seeded, pan)
+
+        result = refresh_lists_handler({"curator": CURATOR})
+
+        assert result["results"][0]["films_dropped"] == [{"list_name": "Picks", "db_id": 7001}]
+        assert result["results"][0]["written"] is False
+        assert [f["db_id"] for f in _stored_films(seeded)] == [6114, 7001]
+
+    def test_legacy_films_without_hash_are_compared_by_content(self, local_s3, pan):
+        _put_pan(local_s3, pan)
+        _put_lists(local_s3, CURATOR, [{"db_id": 6114, "cinema_listings": pan["6114"], "list_film_caption": ""}])
+
+        result = refresh_lists_handler({"curator": CURATOR})
+
+        assert result["results"][0]["written"] is False
+
+    def test_dry_run_reports_without_writing(self, seeded, pan):
+        pan["6114"]["prince_charles"]["when"] = []
+        _put_pan(seeded, pan)
+
+        result = refresh_lists_handler({"curator": CURATOR, "dry_run": True})
+
+        assert len(result["results"][0]["films_refreshed"]) == 1
+        assert result["curators_written"] == 0
+        assert seeded.count("put_object", prefix=curator_lists_key(CURATOR)) == 0
+
+    def test_normalized_films_are_skipped(self, local_s3, pan):
+        _put_pan(local_s3, pan)
+        _put_lists(local_s3, CURATOR, [make_list_film(6114, pan["6114"], mode="normalized")])
+
+        assert refresh_lists_handler({"curator": CURATOR})["results"][0]["films_checked"] == 0
+
+    def test_all_curators_by_default(self, seeded, pan):
+        _put_lists(seeded, "bfi", [make_list_film(6114, pan["6114"], mode="embedded")])
+
+        result = refresh_lists_handler({})
+
+        assert result["status"] == "ok"
+        assert sorted(r["curator"] for r in result["results"]) == ["bfi", CURATOR]
+
+    def test_one_broken_curator_is_a_partial_result(self, seeded):
+        seeded.put_bytes(S3_BUCKET, curator_lists_key("broken"), b'"corrupt"')
+
+        result = refresh_lists_handler({"curators": [CURATOR, "broken"]})
+
+        assert result["status"] == "partial"
+        assert [r["curator"] for r in result["results"]] == [CURATOR]
+        assert list(result["errors"]) == ["broken"]
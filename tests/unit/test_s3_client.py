@@ -0,0 +1,86 @@
+"""
+Unit tests for the shared S3 client factory in core.s3.
+
+boto3.Session is mocked — these tests check that one client is built per
+process (even under concurrent first use), that it carries the tuned
+botocore config, and that the STS probe is skipped for valid credentials.
+"""
+
+import threading
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+from core.s3 import get_aws_session, get_s3_client, get_s3_client_config, reset_s3_client
+from config import S3_MAX_POOL_CONNECTIONS, S3_RETRY_MODE
+
+
+@pytest.fixture(autouse=True)
+def _fresh_client():
+    reset_s3_client()
+    yield
+    reset_s3_client()
+
+
+@pytest.fixture
+def mock_session(monkeypatch):
+    monkeypatch.setenv("AWS_EXECUTION_ENV", "AWS_Lambda_python3.11")
+    with patch("boto3.Session") as session_cls:
+        session_cls.return_value.client.side_effect = lambda *a, **kw: MagicMock()
+        yield session_cls
+
+
+class TestSharedClient:
+    def test_client_is_reused(self, mock_session):
+        assert get_s3_client() is get_s3_client()
+        mock_session.assert_called_once()
+
+    def test_concurrent_first_use_builds_one_client(self, mock_session):
+        clients = []
+        threads = [threading.Thread(target=lambda: clients.append(get_s3_client())) for _ in range(16)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len({id(c) for c in clients}) == 1
+        mock_session.return_value.client.assert_called_once()
+
+    def test_client_uses_tuned_config(self, mock_session):
+        get_s3_client()
+
+        config = mock_session.return_value.client.call_args.kwargs["config"]
+        assert config.max_pool_connections == S3_MAX_POOL_CONNECTIONS
+        assert config.retries["mode"] == S3_RETRY_MODE
+
+    def test_reset_builds_a_new_client(self, mock_session):
+        first = get_s3_client()
+        reset_s3_client()
+        assert get_s3_client() is not first
+
+
+class TestClientConfig:
+    def test_config_has_timeouts(self):
+        config = get_s3_client_config()
+        assert config.connect_timeout > 0
+        assert config.read_timeout > 0
+
+
+class TestLocalSession:
+    def test_sts_probe_skipped_when_credentials_valid(self, monkeypatch):
+        monkeypatch.delenv("GITHUB_ACTIONS", raising=False)
+        with patch("boto3.Session") as session_cls:
+            session = session_cls.return_value
+            session.get_credentials.return_value.get_frozen_credentials.return_value.access_key = "AKIA"
+
+            assert get_aws_session() is session
+            session.client.assert_not_called()
+
+    def test_sts_probe_used_when_credentials_unresolved(self, monkeypatch):
+        monkeypatch.delenv("GITHUB_ACTIONS", raising=False)
+        with patch("boto3.Session") as session_cls:
+            session = session_cls.return_value
+            session.get_credentials.return_value = None
+
+            get_aws_session()
+            session.client.assert_called_once_with("sts")
@@ -0,0 +1,129 @@
+"""
+Unit tests for the ETag-revalidated JSON cache in core.s3.
+
+Uses a small in-process stand-in for the S3 client that answers
+conditional GETs the way S3 does (304 NotModified via ClientError).
+"""
+
+import io
+import json
+
+import pytest
+from botocore.exceptions import ClientError
+
+from core import s3 as core_s3
+from core.s3 import clear_json_cache, download_json_from_s3, get_json_cache_stats
+
+
+class _NoSuchKey(ClientError):
+    pass
+
+
+class _FakeS3:
+    class exceptions:
+        NoSuchKey = _NoSuchKey
+
+    def __init__(self):
+        self.objects = {}
+        self.get_calls = []
+
+    def put(self, key: str, data, etag: str) -> None:
+        self.objects[key] = (json.dumps(data).encode("utf-8"), etag)
+
+    def get_object(self, Bucket, Key, IfNoneMatch=None):
+        self.get_calls.append((Key, IfNoneMatch))
+        if Key not in self.objects:
+            raise _NoSuchKey({"Error": {"Code": "NoSuchKey"}}, "GetObject")
+        body, etag = self.objects[Key]
+        if IfNoneMatch == etag:
+            raise ClientError(
+                {"Error": {"Code": "304"}, "ResponseMetadata": {"HTTPStatusCode": 304}},
+                "GetObject",
+            )
+        return {"Body": io.BytesIO(body), "ETag": etag}
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    clear_json_cache()
+    yield
+    clear_json_cache()
+
+
+class TestJsonCache:
+    def test_first_download_is_a_miss(self):
+        s3 = _FakeS3()
+        s3.put("a.json", {"x": 1}, '"e1"')
+
+        assert download_json_from_s3(s3, "b", "a.json", cached=True) == {"x": 1}
+        stats = get_json_cache_stats()
+        assert stats["misses"] == 1
+        assert stats["hits"] == 0
+        assert stats["entries"] == 1
+
+    def test_unchanged_object_is_served_from_cache(self):
+        s3 = _FakeS3()
+        s3.put("a.json", {"x": 1}, '"e1"')
+
+        first = download_json_from_s3(s3, "b", "a.json", cached=True)
+        second = download_json_from_s3(s3, "b", "a.json", cached=True)
+
+        assert second is first
+        assert s3.get_calls[-1] == ("a.json", '"e1"')
+        stats = get_json_cache_stats()
+        assert stats["hits"] == 1
+        assert stats["revalidations"] == 1
+
+    def test_changed_object_is_reparsed(self):
+        s3 = _FakeS3()
+        s3.put("a.json", {"x": 1}, '"e1"')
+        download_json_from_s3(s3, "b", "a.json", cached=True)
+
+        s3.put("a.json", {"x": 2}, '"e2"')
+        assert download_json_from_s3(s3, "b", "a.json", cached=True) == {"x": 2}
+        stats = get_json_cache_stats()
+        assert stats["misses"] == 2
+        assert stats["revalidations"] == 1
+        assert stats["entries"] == 1
+
+    def test_least_recently_used_entry_is_evicted(self, monkeypatch):
+        monkeypatch.setattr(core_s3, "S3_JSON_CACHE_MAX_ENTRIES", 2)
+        s3 = _FakeS3()
+        for name in ("a", "b", "c"):
+            s3.put(f"{name}.json", {"name": name}, f'"{name}"')
+
+        download_json_from_s3(s3, "b", "a.json", cached=True)
+        download_json_from_s3(s3, "b", "b.json", cached=True)
+        download_json_from_s3(s3, "b", "a.json", cached=True)  # a is now most recent
+        download_json_from_s3(s3, "b", "c.json", cached=True)  # evicts b
+
+        stats = get_json_cache_stats()
+        assert stats["entries"] == 2
+        assert stats["evictions"] == 1
+        assert ("b", "b.json") not in core_s3._json_cache
+
+    def test_budget_counts_estimated_parsed_size(self, monkeypatch):
+        s3 = _FakeS3()
+        s3.put("a.json", {"x": "y" * 100}, '"a"')
+        body_size = len(s3.objects["a.json"][0])
+        monkeypatch.setattr(core_s3, "S3_JSON_CACHE_PARSED_SIZE_RATIO", 6)
+        # Room for the body, but not for what it parses to
+        monkeypatch.setattr(core_s3, "S3_JSON_CACHE_MAX_BYTES", body_size * 5)
+
+        download_json_from_s3(s3, "b", "a.json", cached=True)
+        assert get_json_cache_stats()["entries"] == 0
+
+        monkeypatch.setattr(core_s3, "S3_JSON_CACHE_MAX_BYTES", body_size * 6)
+        download_json_from_s3(s3, "b", "a.json", cached=True)
+        assert get_json_cache_stats()["bytes"] == body_size * 6
+
+    def test_missing_key_raises_file_not_found(self):
+        with pytest.raises(FileNotFoundError):
+            download_json_from_s3(_FakeS3(), "b", "missing.json", cached=True)
+
+    def test_uncached_download_bypasses_cache(self):
+        s3 = _FakeS3()
+        s3.put("a.json", [1, 2], '"e1"')
+
+        assert download_json_from_s3(s3, "b", "a.json") == [1, 2]
+        assert get_json_cache_stats()["entries"] == 0
@@ -0,0 +1,97 @@
+"""
+Unit tests for streaming top-level JSON object members out of S3
+(core.s3.iter_json_object_items / stream_json_items_from_s3).
+"""
+
+import json
+import tracemalloc
+
+import pytest
+
+from benchmarks.synthetic import synthetic_pan_listings
+from core.s3 import iter_json_object_items, stream_json_items_from_s3
+
+BUCKET = "test-bucket"
+KEY = "london/pan_cinema_listings.json"
+
+DOC = {
+    "6114": {"prince_charles": {"when": [{"date": "2026-03-20"}], "_additional_info": {"title": "Dracula"}}},
+    "7001": {"rio": {"_additional_info": {"title": "Tokyo Story", "directors": "Yasujirō Ozu"}}},
+    "n": 1234567,
+    "x": [1.5e3, None, True, "}\"{"],
+}
+
+
+def _chunks(data: bytes, size: int):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class TestIterJsonObjectItems:
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 1 << 20])
+    def test_any_chunking_yields_the_same_items(self, chunk_size):
+        data = json.dumps(DOC, ensure_ascii=False, indent=2).encode("utf-8")
+        assert list(iter_json_object_items(_chunks(data, chunk_size))) == list(DOC.items())
+
+    @pytest.mark.parametrize("chunk_size", range(1, 9))
+    def test_top_level_numbers_split_across_chunks(self, chunk_size):
+        data = b'{"a": 1.5, "b": 2e3, "c": -0.25E-2, "d": 10}'
+        assert dict(iter_json_object_items(_chunks(data, chunk_size))) == {"a": 1.5, "b": 2e3, "c": -0.25e-2, "d": 10}
+
+    def test_empty_object(self):
+        assert list(iter_json_object_items([b" {\n} "])) == []
+
+    def test_items_are_yielded_before_the_input_ends(self):
+        def chunks():
+            yield b'{"a": {"b": 1}, '
+            raise AssertionError("read past the first member")
+
+        assert next(iter_json_object_items(chunks())) == ("a", {"b": 1})
+
+    @pytest.mark.parametrize(
+        "data, message",
+        [
+            (b"[1, 2]", "Expected '{'"),
+            (b'{"a": 1', "Expected ',' or '}'"),
+            (b'{"a": 1,}', "Expected object key"),
+            (b'{"a" 1}', "Expected ':'"),
+            (b'{"a": 1} trailing', "Unexpected data"),
+            (b'{"a": [1, 2}', "Expecting ','"),
+        ],
+    )
+    def test_malformed_input_raises(self, data, message):
+        with pytest.raises(ValueError, match=message):
+            list(iter_json_object_items(_chunks(data, 3)))
+
+
+class TestStreamFromS3:
+    def test_streams_items_with_etag(self, local_s3):
+        etag = local_s3.put_bytes(BUCKET, KEY, json.dumps(DOC).encode())
+        items, streamed_etag = stream_json_items_from_s3(local_s3, BUCKET, KEY, chunk_size=16)
+
+        assert streamed_etag == etag
+        assert dict(items) == DOC
+
+    def test_missing_key_raises_file_not_found(self, local_s3):
+        with pytest.raises(FileNotFoundError):
+            stream_json_items_from_s3(local_s3, BUCKET, KEY)
+
+    def test_malformed_body_raises_runtime_error(self, local_s3):
+        local_s3.put_bytes(BUCKET, KEY, b'{"a": 1')
+        items, _ = stream_json_items_from_s3(local_s3, BUCKET, KEY)
+        with pytest.raises(RuntimeError, match="Failed to parse"):
+            list(items)
+
+    def test_peak_memory_is_bounded_by_one_film(self, local_s3):
+        data = json.dumps(synthetic_pan_listings(2000)).encode()
+        local_s3.put_bytes(BUCKET, KEY, data)
+
+        items, _ = stream_json_items_from_s3(local_s3, BUCKET, KEY, chunk_size=16 * 1024)
+        tracemalloc.start()
+        try:
+            count = sum(1 for _ in items)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        assert count == 2000
+        assert peak < len(data) / 10
@@ -0,0 +1,142 @@
+"""
+Unit tests for the local storage backends (core.storage) and their
+selection through get_s3_client.
+"""
+
+import pytest
+
+from core import s3 as core_s3
+from core.s3 import (
+    PreconditionFailedError,
+    download_json_with_etag_from_s3,
+    download_json_with_metadata_from_s3,
+    upload_dict_to_s3,
+)
+from core.storage import DirectoryStorage, MemoryStorage, ObjectStore
+from handlers.custom_lists.create_curator_handler import create_curator_handler
+from handlers.custom_lists.create_custom_list_handler import create_custom_list_handler
+from handlers.custom_lists.get_custom_lists_handler import get_custom_lists_handler
+
+BUCKET = "bucket"
+
+
+@pytest.fixture(params=["memory", "directory"])
+def store(request, tmp_path):
+    return MemoryStorage() if request.param == "memory" else DirectoryStorage(str(tmp_path))
+
+
+class TestConditionalSemantics:
+    def test_round_trip_keeps_etag(self, store):
+        etag = upload_dict_to_s3(store, BUCKET, "a/b.json", {"x": 1})
+
+        assert download_json_with_etag_from_s3(store, BUCKET, "a/b.json") == ({"x": 1}, etag)
+        assert store.head_object(Bucket=BUCKET, Key="a/b.json")["ETag"] == etag
+
+    def test_metadata_round_trip_and_listing(self, store):
+        upload_dict_to_s3(store, BUCKET, "k.json", [1], metadata={"Journal-Seq": "7"})
+
+        assert download_json_with_metadata_from_s3(store, BUCKET, "k.json")[2] == {"journal-seq": "7"}
+        assert store.head_object(Bucket=BUCKET, Key="k.json")["Metadata"] == {"journal-seq": "7"}
+        assert [o["Key"] for o in store.list_objects_v2(Bucket=BUCKET)["Contents"]] == ["k.json"]
+        upload_dict_to_s3(store, BUCKET, "k.json", [2])
+        assert store.head_object(Bucket=BUCKET, Key="k.json")["Metadata"] == {}
+
+    def test_if_match_and_if_none_match_on_put(self, store):
+        etag = upload_dict_to_s3(store, BUCKET, "k.json", [1], if_none_match="*")
+
+        with pytest.raises(PreconditionFailedError):
+            upload_dict_to_s3(store, BUCKET, "k.json", [2], if_none_match="*")
+        upload_dict_to_s3(store, BUCKET, "k.json", [3], if_match=etag)
+        with pytest.raises(PreconditionFailedError):
+            upload_dict_to_s3(store, BUCKET, "k.json", [4], if_match=etag)
+
+    def test_missing_key_raises_file_not_found(self, store):
+        with pytest.raises(FileNotFoundError):
+            download_json_with_etag_from_s3(store, BUCKET, "missing.json")
+
+    def test_cached_read_revalidates_with_304(self, store):
+        upload_dict_to_s3(store, BUCKET, "k.json", {"v": 1})
+        core_s3.clear_json_cache()
+        try:
+            first = core_s3.download_json_from_s3(store, BUCKET, "k.json", cached=True)
+            assert core_s3.download_json_from_s3(store, BUCKET, "k.json", cached=True) is first
+            assert core_s3.get_json_cache_stats()["hits"] == 1
+        finally:
+            core_s3.clear_json_cache()
+
+    def test_list_with_delimiter_and_pages(self, store):
+        for key in ("p/a/1.json", "p/a/2.json", "p/b/1.json", "p/c.json", "q/d.json"):
+            store.put_bytes(BUCKET, key, b"{}")
+
+        page = store.list_objects_v2(Bucket=BUCKET, Prefix="p/", Delimiter="/")
+        assert [cp["Prefix"] for cp in page["CommonPrefixes"]] == ["p/a/", "p/b/"]
+        assert [o["Key"] for o in page["Contents"]] == ["p/c.json"]
+
+        pages = list(store.get_paginator("list_objects_v2").paginate(Bucket=BUCKET, Prefix="p/", MaxKeys=2))
+        assert [o["Key"] for p in pages for o in p["Contents"]] == ["p/a/1.json", "p/a/2.json", "p/b/1.json", "p/c.json"]
+
+    def test_delete(self, store):
+        store.put_bytes(BUCKET, "k.json", b"{}")
+        store.delete_object(Bucket=BUCKET, Key="k.json")
+        assert store.get_bytes(BUCKET, "k.json") is None
+
+
+class TestObjectStore:
+    def test_incomplete_backend_fails_on_construction(self):
+        class Incomplete(ObjectStore):
+            def _load(self, bucket, key):
+                return None
+
+        with pytest.raises(TypeError, match="abstract"):
+            Incomplete()
+
+    def test_calls_are_recorded_only_when_asked(self, store):
+        store.put_object(Bucket=BUCKET, Key="k.json", Body=b"[]")
+        assert store.calls == []
+
+        recording = MemoryStorage(record_calls=True)
+        recording.put_object(Bucket=BUCKET, Key="k.json", Body=b"[]")
+        assert recording.calls == [("put_object", "k.json")]
+
+
+class TestDirectoryStorage:
+    def test_objects_persist_across_instances(self, tmp_path):
+        etag = DirectoryStorage(str(tmp_path)).put_bytes(BUCKET, "a/b.json", b"[]")
+
+        assert (tmp_path / BUCKET / "a" / "b.json").read_bytes() == b"[]"
+        assert DirectoryStorage(str(tmp_path)).head_object(Bucket=BUCKET, Key="a/b.json")["ETag"] == etag
+
+    def test_keys_cannot_escape_the_bucket(self, tmp_path):
+        with pytest.raises(ValueError, match="Invalid object key"):
+            DirectoryStorage(str(tmp_path)).put_bytes(BUCKET, "../outside.json", b"{}")
+
+
+class TestBackendSelection:
+    @pytest.fixture
+    def directory_backend(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("KL_STORAGE_BACKEND", "directory")
+        monkeypatch.setenv("KL_STORAGE_DIRECTORY", str(tmp_path))
+        core_s3.reset_s3_client()
+        yield tmp_path
+        core_s3.reset_s3_client()
+
+    def test_env_selects_directory_backend_for_handlers(self, directory_backend):
+        assert isinstance(core_s3.get_s3_client(), DirectoryStorage)
+
+        create_curator_handler({"curator": "kinologue"})
+        create_custom_list_handler({
+            "curator": "kinologue", "list_name": "Picks", "list_caption": "Ours",
+            "start_date": "2026-01-01", "end_date": "2026-12-31",
+        })
+
+        result = get_custom_lists_handler({"curator": "kinologue", "view": "summary"})
+        assert [fl["list_name"] for fl in result["film_lists"]] == ["Picks"]
+
+    def test_unknown_backend_is_rejected(self, monkeypatch):
+        monkeypatch.setenv("KL_STORAGE_BACKEND", "ftp")
+        core_s3.reset_s3_client()
+        try:
+            with pytest.raises(ValueError, match="Invalid storage backend"):
+                core_s3.get_s3_client()
+        finally:
+            core_s3.reset_s3_client()